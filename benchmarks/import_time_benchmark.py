@@ -0,0 +1,77 @@
+"""
+Regression benchmark of the ldap3 import time, measured with python -X importtime (Python 3.7+).
+Each round imports Server and Connection and creates a SYNC connection in a new interpreter, as a CLI tool
+or a serverless function does at every cold start. Strategies, SASL mechanisms and extended operations other
+than the ones used by a SYNC connection must not be imported: the benchmark exits with status 1 if any of them
+is imported, or if the median import time exceeds the milliseconds given as first argument.
+The ldap3 package of the repository is imported, the script can be run from any directory.
+"""
+
+from __future__ import print_function
+import subprocess
+import sys
+from os import path
+
+ROUNDS = 20
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))  # root of the repository, ldap3 is imported from here
+STATEMENT = "from ldap3 import Server, Connection; Connection(Server('localhost'))"
+DEFERRED_MODULES = ['ldap3.strategy.asynchronous',
+                    'ldap3.strategy.asyncStream',
+                    'ldap3.strategy.ldifProducer',
+                    'ldap3.strategy.mockAsync',
+                    'ldap3.strategy.mockBase',
+                    'ldap3.strategy.mockSync',
+                    'ldap3.strategy.restartable',
+                    'ldap3.strategy.reusable',
+                    'ldap3.strategy.safeRestartable',
+                    'ldap3.strategy.safeSync',
+                    'ldap3.protocol.sasl.digestMd5',
+                    'ldap3.protocol.sasl.external',
+                    'ldap3.protocol.sasl.kerberos',
+                    'ldap3.protocol.sasl.plain',
+                    'ldap3.protocol.microsoft',
+                    'ldap3.protocol.novell',
+                    'ldap3.extend.microsoft',
+                    'ldap3.extend.novell',
+                    'ldap3.extend.standard',
+                    'Cryptodome',
+                    'pprint']
+
+
+def import_times():
+    """
+    Returns a dict module -> (self time, cumulative time) in microseconds, for a single import in a new interpreter
+    """
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', STATEMENT], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    _, errors = process.communicate()
+    if process.returncode:
+        raise RuntimeError(errors)
+    times = dict()
+    for line in errors.splitlines():
+        if line.startswith('import time:') and 'cumulative' not in line:
+            self_time, cumulative_time, module = line[len('import time:'):].split('|')
+            times[module.strip()] = (int(self_time), int(cumulative_time))
+    return times
+
+
+if __name__ == '__main__':
+    max_time = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    rounds = [import_times() for _ in range(ROUNDS)]
+    ldap3_times = sorted(times['ldap3'][1] / 1000.0 for times in rounds)
+    median = ldap3_times[len(ldap3_times) // 2]
+    print('import ldap3: median %.1f ms, min %.1f ms, max %.1f ms over %d rounds' % (median, ldap3_times[0], ldap3_times[-1], ROUNDS))
+    print('modules imported: %d (%d from ldap3)' % (len(rounds[0]), len([module for module in rounds[0] if module.startswith('ldap3')])))
+    print('slowest modules (median self time):')
+    self_times = dict((module, sorted(times[module][0] for times in rounds if module in times)) for module in rounds[0])
+    for module in sorted(self_times, key=lambda module: self_times[module][len(self_times[module]) // 2], reverse=True)[:15]:
+        print('  %-45s %7.2f ms' % (module, self_times[module][len(self_times[module]) // 2] / 1000.0))
+
+    failed = False
+    loaded = [module for module in rounds[0] for deferred in DEFERRED_MODULES if module == deferred or module.startswith(deferred + '.')]
+    if loaded:
+        print('deferred modules imported: ' + ', '.join(sorted(loaded)))
+        failed = True
+    if max_time and median > max_time:
+        print('median import time %.1f ms exceeds %.1f ms' % (median, max_time))
+        failed = True
+    sys.exit(1 if failed else 0)
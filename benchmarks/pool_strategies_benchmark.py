@@ -0,0 +1,110 @@
+"""
+Local benchmark of the ServerPool strategies with simulated replicas of different speed.
+Each simulated server answers search requests after a fixed delay and handles at most CAPACITY requests at the same time,
+so a loaded server queues the requests. Client threads open a connection from the pool, send some searches and unbind.
+Run it from the root of the repository with: python -m benchmarks.pool_strategies_benchmark
+"""
+
+from __future__ import print_function
+import socket
+from threading import Thread, Semaphore
+from time import sleep, time
+
+from pyasn1.codec.ber import encoder
+
+from ldap3 import Server, ServerPool, Connection, ROUND_ROBIN, RANDOM, FASTEST, LEAST_OUTSTANDING, BASE, NONE
+from ldap3.protocol.rfc4511 import LDAPMessage, ProtocolOp, MessageID, BindResponse, SearchResultDone, ResultCode, LDAPDN, LDAPString
+from ldap3.strategy.base import BaseStrategy
+from ldap3.utils.asn1 import decoder
+
+SERVER_DELAYS = [0.002, 0.010, 0.040]  # response time of each simulated server in seconds
+CAPACITY = 2  # requests handled at the same time by each simulated server
+CLIENTS = 8
+CONNECTIONS_PER_CLIENT = 15
+SEARCHES_PER_CONNECTION = 10
+
+
+def encode_response(message_id, name, response_class):
+    response = response_class()
+    response['resultCode'] = ResultCode(0)
+    response['matchedDN'] = LDAPDN('')
+    response['diagnosticMessage'] = LDAPString('')
+    message = LDAPMessage()
+    message['messageID'] = MessageID(message_id)
+    message['protocolOp'] = ProtocolOp().setComponentByName(name, response)
+    return encoder.encode(message)
+
+
+def handle_client(client_socket, delay, capacity):
+    data = b''
+    while True:
+        received = client_socket.recv(4096)
+        if not received:
+            break
+        data += received
+        while True:
+            length = BaseStrategy.compute_ldap_message_size(data)
+            if length == -1 or len(data) < length:
+                break
+            message, _ = decoder.decode(data[:length], asn1Spec=LDAPMessage())
+            data = data[length:]
+            message_id = int(message['messageID'])
+            operation = message['protocolOp'].getName()
+            if operation == 'bindRequest':
+                client_socket.sendall(encode_response(message_id, 'bindResponse', BindResponse))
+            elif operation == 'searchRequest':
+                with capacity:
+                    sleep(delay)
+                client_socket.sendall(encode_response(message_id, 'searchResDone', SearchResultDone))
+            elif operation == 'unbindRequest':
+                client_socket.close()
+                return
+
+
+def start_server(delay):
+    listening_socket = socket.socket()
+    listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listening_socket.bind(('127.0.0.1', 0))
+    listening_socket.listen(50)
+    capacity = Semaphore(CAPACITY)
+
+    def accept():
+        while True:
+            client_socket, _ = listening_socket.accept()
+            thread = Thread(target=handle_client, args=(client_socket, delay, capacity))
+            thread.daemon = True
+            thread.start()
+
+    thread = Thread(target=accept)
+    thread.daemon = True
+    thread.start()
+    return listening_socket.getsockname()[1]
+
+
+def client(server_pool):
+    for _ in range(CONNECTIONS_PER_CLIENT):
+        connection = Connection(server_pool, user='cn=user', password='password', auto_bind=True)
+        for _ in range(SEARCHES_PER_CONNECTION):
+            connection.search('o=test', '(objectClass=*)', BASE)
+        connection.unbind()
+
+
+def benchmark(ports, pool_strategy):
+    servers = [Server('127.0.0.1', port=port, get_info=NONE) for port in ports]
+    server_pool = ServerPool(servers, pool_strategy, active=False)
+    start = time()
+    threads = [Thread(target=client, args=(server_pool, )) for _ in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time() - start
+    print('%-18s %6.2f s  %7.1f searches/s' % (pool_strategy, elapsed, CLIENTS * CONNECTIONS_PER_CLIENT * SEARCHES_PER_CONNECTION / elapsed))
+    for server_state in server_pool._pool_state.server_states:
+        print('    ' + str(server_state))
+
+
+if __name__ == '__main__':
+    server_ports = [start_server(delay) for delay in SERVER_DELAYS]
+    for strategy in (ROUND_ROBIN, RANDOM, FASTEST, LEAST_OUTSTANDING):
+        benchmark(server_ports, strategy)
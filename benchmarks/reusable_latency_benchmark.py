@@ -0,0 +1,111 @@
+"""
+Local benchmark of the latency of the REUSABLE strategy against a simulated server.
+The simulated server answers search requests after a fixed delay, client threads send searches on a shared
+REUSABLE connection and the time between the request and the returned response is measured for each search.
+Run it from the root of the repository with: python -m benchmarks.reusable_latency_benchmark
+"""
+
+from __future__ import print_function
+import socket
+from threading import Thread
+from time import sleep, time
+
+from pyasn1.codec.ber import encoder
+
+from ldap3 import Server, Connection, REUSABLE, BASE, NONE
+from ldap3.protocol.rfc4511 import LDAPMessage, ProtocolOp, MessageID, BindResponse, SearchResultDone, ResultCode, LDAPDN, LDAPString
+from ldap3.strategy.base import BaseStrategy
+from ldap3.utils.asn1 import decoder
+
+SERVER_DELAY = 0.002  # response time of the simulated server in seconds
+CLIENTS = 4
+SEARCHES_PER_CLIENT = 100
+
+
+def encode_response(message_id, name, response_class):
+    response = response_class()
+    response['resultCode'] = ResultCode(0)
+    response['matchedDN'] = LDAPDN('')
+    response['diagnosticMessage'] = LDAPString('')
+    message = LDAPMessage()
+    message['messageID'] = MessageID(message_id)
+    message['protocolOp'] = ProtocolOp().setComponentByName(name, response)
+    return encoder.encode(message)
+
+
+def handle_client(client_socket, delay):
+    data = b''
+    while True:
+        received = client_socket.recv(4096)
+        if not received:
+            break
+        data += received
+        while True:
+            length = BaseStrategy.compute_ldap_message_size(data)
+            if length == -1 or len(data) < length:
+                break
+            message, _ = decoder.decode(data[:length], asn1Spec=LDAPMessage())
+            data = data[length:]
+            message_id = int(message['messageID'])
+            operation = message['protocolOp'].getName()
+            if operation == 'bindRequest':
+                client_socket.sendall(encode_response(message_id, 'bindResponse', BindResponse))
+            elif operation == 'searchRequest':
+                sleep(delay)
+                client_socket.sendall(encode_response(message_id, 'searchResDone', SearchResultDone))
+            elif operation == 'unbindRequest':
+                client_socket.close()
+                return
+
+
+def start_server(delay):
+    """
+    Starts the simulated server, each connection of the pool is served by its own thread
+    """
+    listening_socket = socket.socket()
+    listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listening_socket.bind(('127.0.0.1', 0))
+    listening_socket.listen(50)
+
+    def accept():
+        while True:
+            client_socket, _ = listening_socket.accept()
+            thread = Thread(target=handle_client, args=(client_socket, delay))
+            thread.daemon = True
+            thread.start()
+
+    thread = Thread(target=accept)
+    thread.daemon = True
+    thread.start()
+    return listening_socket.getsockname()[1]
+
+
+def client(connection, latencies):
+    for _ in range(SEARCHES_PER_CLIENT):
+        start = time()
+        message_id = connection.search('o=test', '(objectClass=*)', BASE)
+        connection.get_response(message_id)
+        latencies.append(time() - start)
+
+
+def benchmark(port):
+    server = Server('127.0.0.1', port=port, get_info=NONE)
+    connection = Connection(server, user='cn=user', password='password', client_strategy=REUSABLE, auto_bind=True)
+    latencies = []
+    start = time()
+    threads = [Thread(target=client, args=(connection, latencies)) for _ in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time() - start
+    connection.unbind()
+    latencies.sort()
+    print('%d searches in %.2f s  p50 %.1f ms  p99 %.1f ms' % (len(latencies),
+                                                              elapsed,
+                                                              latencies[len(latencies) // 2] * 1000,
+                                                              latencies[int(len(latencies) * 0.99)] * 1000))
+
+
+if __name__ == '__main__':
+    benchmark(start_server(SERVER_DELAY))
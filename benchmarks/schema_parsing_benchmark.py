@@ -0,0 +1,64 @@
+"""
+Benchmark of the RFC4512 definitions parsing over the bundled offline schemas.
+Each schema is parsed with the single pass tokenizer (parse_definition) and with the split on the keywords
+(split_definition) used before, the parsed objects must be the same.
+Run it from the root of the repository with: python -m benchmarks.schema_parsing_benchmark
+"""
+
+from __future__ import print_function
+import json
+from time import time
+
+from ldap3.protocol.rfc4512 import AttributeTypeInfo, ObjectClassInfo, MatchingRuleInfo, MatchingRuleUseInfo, DitContentRuleInfo, DitStructureRuleInfo, NameFormInfo, LdapSyntaxInfo
+from ldap3.protocol.schemas.ad2012R2 import ad_2012_r2_schema
+from ldap3.protocol.schemas.ds389 import ds389_1_3_3_schema
+from ldap3.protocol.schemas.edir888 import edir_8_8_8_schema
+from ldap3.protocol.schemas.edir914 import edir_9_1_4_schema
+from ldap3.protocol.schemas.slapd24 import slapd_2_4_schema
+from ldap3.utils.conv import json_hook
+
+SCHEMAS = [('AD 2012 R2', ad_2012_r2_schema),
+           ('DS389 1.3.3', ds389_1_3_3_schema),
+           ('eDirectory 8.8.8', edir_8_8_8_schema),
+           ('eDirectory 9.1.4', edir_9_1_4_schema),
+           ('OpenLDAP 2.4', slapd_2_4_schema)]
+
+DEFINITION_CLASSES = {'attributeTypes': AttributeTypeInfo,
+                      'objectClasses': ObjectClassInfo,
+                      'matchingRules': MatchingRuleInfo,
+                      'matchingRuleUse': MatchingRuleUseInfo,
+                      'dITContentRules': DitContentRuleInfo,
+                      'dITStructureRules': DitStructureRuleInfo,
+                      'nameForms': NameFormInfo,
+                      'ldapSyntaxes': LdapSyntaxInfo}
+ROUNDS = 10
+
+
+def definitions_of(schema):
+    raw = json.loads(schema, object_hook=json_hook)['raw']
+    definitions = []
+    for attribute in DEFINITION_CLASSES:
+        for definition in raw.get(attribute, []):
+            definitions.append((DEFINITION_CLASSES[attribute], definition.strip()[1:-1]))
+    return definitions
+
+
+def run(definitions, parse):
+    start = time()
+    for _ in range(ROUNDS):
+        for definition_class, definition in definitions:
+            getattr(definition_class, parse)(definition)
+    return (time() - start) / ROUNDS
+
+
+if __name__ == '__main__':
+    print('%-18s %11s %10s %10s %8s' % ('schema', 'definitions', 'split ms', 'tokens ms', 'speedup'))
+    for name, schema in SCHEMAS:
+        definitions = definitions_of(schema)
+        for definition_class, definition in definitions:
+            parsed = definition_class.parse_definition(definition)
+            if parsed is not None:  # definitions not understood by the tokenizer are split as before
+                assert vars(parsed) == vars(definition_class.split_definition(definition)), definition
+        split_time = run(definitions, 'split_definition')
+        tokens_time = run(definitions, 'parse_definition')
+        print('%-18s %11d %10.2f %10.2f %7.1fx' % (name, len(definitions), split_time * 1000, tokens_time * 1000, split_time / tokens_time))
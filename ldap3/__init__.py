@@ -89,6 +89,7 @@ REUSABLE = 'REUSABLE'
 MOCK_SYNC = 'MOCK_SYNC'
 MOCK_ASYNC = 'MOCK_ASYNC'
 ASYNC_STREAM = 'ASYNC_STREAM'
+ASYNCIO = 'ASYNCIO'
 
 # get rootDSE info
 NONE = 'NO_INFO'
@@ -106,6 +107,8 @@ OFFLINE_DS389_1_3_3 = 'DS389_1_3_3'
 FIRST = 'FIRST'
 ROUND_ROBIN = 'ROUND_ROBIN'
 RANDOM = 'RANDOM'
+FASTEST = 'FASTEST'
+LEAST_OUTSTANDING = 'LEAST_OUTSTANDING'
 
 # Hashed password
 HASHED_NONE = 'PLAIN'
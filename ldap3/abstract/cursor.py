@@ -23,7 +23,6 @@
 # along with ldap3 in the COPYING and COPYING.LESSER files.
 # If not, see <http://www.gnu.org/licenses/>.
 from collections import namedtuple
-from copy import deepcopy
 from datetime import datetime
 from os import linesep
 from time import sleep
@@ -44,6 +43,8 @@ from ..utils.config import get_config_parameter
 from ..utils.log import log, log_enabled, ERROR, BASIC, PROTOCOL, EXTENDED
 from ..protocol.oid import ATTRIBUTE_DIRECTORY_OPERATION, ATTRIBUTE_DISTRIBUTED_OPERATION, ATTRIBUTE_DSA_OPERATION, CLASS_AUXILIARY
 
+ATTRIBUTES_MAPS_SIZE = 256  # maximum number of attributes maps kept by a cursor
+
 Operation = namedtuple('Operation', ('request', 'result', 'response'))
 
 
@@ -66,6 +67,15 @@ def _create_query_dict(query_text):
     return query_dict
 
 
+def copy_raw_attributes(raw_attributes):
+    """Copy the raw attributes of a response, values are bytes and are shared with the response."""
+    raw_attributes = raw_attributes.copy()
+    for attribute_name, values in raw_attributes.items():
+        if isinstance(values, list):
+            raw_attributes[attribute_name] = values[:]
+    return raw_attributes
+
+
 class Cursor(object):
     # entry_class and attribute_class define the type of entry and attribute used by the cursor
     # entry_initial_status defines the initial status of a entry
@@ -107,6 +117,9 @@ class Cursor(object):
         self.schema = self.connection.server.schema
         self._do_not_reset = False  # used for refreshing entry in entry_refresh() without removing all entries from the Cursor
         self._operation_history = list()  # a list storing all the requests, results and responses for the last cursor operation
+        self._dereference_batch = None  # attributes with dn to dereference after reading all the entries of a query
+        self._attributes_maps = dict()  # attribute definitions to response attribute names, for each set of attributes returned by the server
+        self._operational_attributes = dict()  # attribute name -> True if the attribute is operational in the schema
 
     def __repr__(self):
         r = 'CURSOR : ' + self.__class__.__name__ + linesep
@@ -184,6 +197,26 @@ class Cursor(object):
         def __nonzero__(self):
             return True
 
+    def _get_attributes_map(self, response, attr_defs):
+        """Return a list of (attribute definition key, response attribute name or None) for the attribute definitions.
+
+        The list is computed once for each set of attribute names returned by the server and for each attribute definitions set.
+
+        """
+        signature = (tuple(attr_defs.keys()), frozenset(response['attributes'].keys()))
+        try:
+            return self._attributes_maps[signature]
+        except KeyError:
+            pass
+        response_names = dict()
+        for attr_name in response['attributes']:
+            response_names.setdefault(attr_name.lower(), attr_name)
+        attributes_map = [(attr, response_names.get(attr_defs[attr].name.lower())) for attr in attr_defs]
+        if len(self._attributes_maps) >= ATTRIBUTES_MAPS_SIZE:  # entries with very different attributes sets
+            self._attributes_maps.clear()
+        self._attributes_maps[signature] = attributes_map
+        return attributes_map
+
     def _get_attributes(self, response, attr_defs, entry):
         """Assign the result of the LDAP query to the Entry object dictionary.
 
@@ -197,14 +230,8 @@ class Cursor(object):
         conf_attributes_excluded_from_object_def = [v.lower() for v in get_config_parameter('ATTRIBUTES_EXCLUDED_FROM_OBJECT_DEF')]
         attributes = CaseInsensitiveWithAliasDict()
         used_attribute_names = set()
-        for attr in attr_defs:
+        for attr, attribute_name in self._get_attributes_map(response, attr_defs):
             attr_def = attr_defs[attr]
-            attribute_name = None
-            for attr_name in response['attributes']:
-                if attr_def.name.lower() == attr_name.lower():
-                    attribute_name = attr_name
-                    break
-
             if attribute_name or attr_def.default is not NotImplemented:  # attribute value found in result or default value present - NotImplemented allows use of None as default
                 attribute = self.attribute_class(attr_def, entry, self)
                 attribute.response = response
@@ -219,7 +246,14 @@ class Cursor(object):
                 if not isinstance(attribute.values, list):  # force attribute values to list (if attribute is single-valued)
                     attribute.values = [attribute.values]
                 if attr_def.dereference_dn:  # try to get object referenced in value
-                    if attribute.values:
+                    if attribute.values and self._dereference_batch is not None:  # referenced objects are searched after reading all the entries
+                        if entry.entry_dn in attribute.values:
+                            error_message = 'object %s is referencing itself in the \'%s\' attribute' % (entry.entry_dn, attribute.definition.name)
+                            if log_enabled(ERROR):
+                                log(ERROR, '%s for <%s>', error_message, self)
+                            raise LDAPObjectDereferenceError(error_message)
+                        self._dereference_batch.append(attribute)
+                    elif attribute.values:
                         temp_reader = Reader(self.connection, attr_def.dereference_dn, base='', get_operational_attributes=self.get_operational_attributes, controls=self.controls)
                         temp_values = []
                         for element in attribute.values:
@@ -244,13 +278,15 @@ class Cursor(object):
 
         for attribute_name in response['attributes']:
             if attribute_name not in used_attribute_names:
-                operational_attribute = False
-                # check if the type is an operational attribute
-                if attribute_name in self.schema.attribute_types:
-                    if self.schema.attribute_types[attribute_name].no_user_modification or self.schema.attribute_types[attribute_name].usage in [ATTRIBUTE_DIRECTORY_OPERATION, ATTRIBUTE_DISTRIBUTED_OPERATION, ATTRIBUTE_DSA_OPERATION]:
+                operational_attribute = self._operational_attributes.get(attribute_name)
+                if operational_attribute is None:  # check if the type is an operational attribute
+                    operational_attribute = False
+                    if attribute_name in self.schema.attribute_types:
+                        if self.schema.attribute_types[attribute_name].no_user_modification or self.schema.attribute_types[attribute_name].usage in [ATTRIBUTE_DIRECTORY_OPERATION, ATTRIBUTE_DISTRIBUTED_OPERATION, ATTRIBUTE_DSA_OPERATION]:
+                            operational_attribute = True
+                    else:
                         operational_attribute = True
-                else:
-                    operational_attribute = True
+                    self._operational_attributes[attribute_name] = operational_attribute
                 if not operational_attribute and attribute_name not in attr_defs and attribute_name.lower() not in conf_attributes_excluded_from_object_def:
                     error_message = 'attribute \'%s\' not in object class \'%s\' for entry %s' % (attribute_name, ', '.join(entry.entry_definition._object_class), entry.entry_dn)
                     if log_enabled(ERROR):
@@ -307,13 +343,64 @@ class Cursor(object):
                             break
         return matched
 
+    def _dereference_attributes(self, attributes, memo):
+        """Replace the dn values of the attributes with the referenced entries.
+
+        The referenced entries are searched in a pipeline when the strategy allows it. Each dn is searched only once in
+        a query, memo keeps the entries already found for each ObjectDef.
+
+        """
+        readers = dict()
+        dns = dict()
+        for attribute in attributes:
+            object_def = attribute.definition.dereference_dn
+            if id(object_def) not in readers:
+                readers[id(object_def)] = Reader(self.connection, object_def, base='', get_operational_attributes=self.get_operational_attributes, controls=self.controls)
+                dns[id(object_def)] = []
+            for dn in attribute.values:
+                if (id(object_def), dn) not in memo:
+                    memo[(id(object_def), dn)] = None  # not found, unless returned by the search
+                    dns[id(object_def)].append(dn)
+
+        for key, reader in readers.items():
+            if not dns[key]:
+                continue
+            if log_enabled(PROTOCOL):
+                log(PROTOCOL, 'dereferencing %d objects for <%s>', len(dns[key]), self)
+            strategy = self.connection.strategy
+            if strategy.sync and not strategy.no_real_dsa and not strategy.pooled:
+                with self.connection:
+                    with self.connection.pipeline() as pipeline:
+                        for dn in dns[key]:
+                            pipeline.search(dn,
+                                            '(objectclass=*)',
+                                            BASE,
+                                            dereference_aliases=reader.dereference_aliases,
+                                            attributes=list(reader.attributes),
+                                            get_operational_attributes=reader.get_operational_attributes,
+                                            controls=reader.controls)
+                reader._dereference_batch = []
+                try:
+                    for dn, (_, _, response, _) in zip(dns[key], pipeline.results):
+                        memo[(key, dn)] = reader._create_entry(response[0]) if response else None
+                    reader._dereference_attributes(reader._dereference_batch, memo)  # referenced entries can reference other entries
+                finally:
+                    reader._dereference_batch = None
+            else:
+                for dn in dns[key]:
+                    memo[(key, dn)] = reader.search_object(dn)
+
+        for attribute in attributes:
+            key = id(attribute.definition.dereference_dn)
+            attribute.values = [memo[(key, dn)] for dn in attribute.values]
+
     def _create_entry(self, response):
         if not response['type'] == 'searchResEntry':
             return None
 
         entry = self.entry_class(response['dn'], self)  # define an Entry (writable or readonly), as specified in the cursor definition
         entry._state.attributes = self._get_attributes(response, self.definition._attributes, entry)
-        entry._state.raw_attributes = deepcopy(response['raw_attributes'])
+        entry._state.raw_attributes = copy_raw_attributes(response['raw_attributes'])
 
         entry._state.response = response
         entry._state.read_time = datetime.now()
@@ -362,16 +449,21 @@ class Cursor(object):
             return self._create_entry(response[0])
 
         self.entries = []
-        for r in response:
-            entry = self._create_entry(r)
-            if entry is not None:
-                self.entries.append(entry)
-                if 'objectClass' in entry:
-                    for object_class in entry.objectClass:
-                        if self.schema and self.schema.object_classes[object_class].kind == CLASS_AUXILIARY and object_class not in self.definition._auxiliary_class:
-                            # add auxiliary class to object definition
-                            self.definition._auxiliary_class.append(object_class)
-                            self.definition._populate_attr_defs(object_class)
+        self._dereference_batch = []
+        try:
+            for r in response:
+                entry = self._create_entry(r)
+                if entry is not None:
+                    self.entries.append(entry)
+                    if 'objectClass' in entry:
+                        for object_class in entry.objectClass:
+                            if self.schema and self.schema.object_classes[object_class].kind == CLASS_AUXILIARY and object_class not in self.definition._auxiliary_class:
+                                # add auxiliary class to object definition
+                                self.definition._auxiliary_class.append(object_class)
+                                self.definition._populate_attr_defs(object_class)
+            self._dereference_attributes(self._dereference_batch, dict())
+        finally:
+            self._dereference_batch = None
         self.execution_time = datetime.now()
 
         if old_query_filter:  # requesting a single object so an always-valid filter is set
@@ -32,7 +32,7 @@ from .. import ANONYMOUS, SIMPLE, SASL, MODIFY_ADD, MODIFY_DELETE, MODIFY_REPLAC
     SUBTREE, ASYNC, SYNC, NO_ATTRIBUTES, ALL_ATTRIBUTES, ALL_OPERATIONAL_ATTRIBUTES, MODIFY_INCREMENT, LDIF, ASYNC_STREAM, \
     RESTARTABLE, ROUND_ROBIN, REUSABLE, AUTO_BIND_DEFAULT, AUTO_BIND_NONE, AUTO_BIND_TLS_BEFORE_BIND, SAFE_SYNC, SAFE_RESTARTABLE, \
     AUTO_BIND_TLS_AFTER_BIND, AUTO_BIND_NO_TLS, STRING_TYPES, SEQUENCE_TYPES, MOCK_SYNC, MOCK_ASYNC, NTLM, EXTERNAL,\
-    DIGEST_MD5, GSSAPI, PLAIN, DSA, SCHEMA, ALL, TLS_CHANNEL_BINDING, ENCRYPT
+    DIGEST_MD5, GSSAPI, PLAIN, DSA, SCHEMA, ALL, TLS_CHANNEL_BINDING, ENCRYPT, ASYNCIO
 from .results import RESULT_SUCCESS, RESULT_COMPARE_TRUE, RESULT_COMPARE_FALSE
 from ..extend import ExtendedOperationsRoot
 from .pooling import ServerPool
@@ -47,27 +47,16 @@ from ..operation.modify import modify_operation, modify_request_to_dict
 from ..operation.modifyDn import modify_dn_operation, modify_dn_request_to_dict
 from ..operation.search import search_operation, search_request_to_dict
 from ..protocol.rfc2849 import operation_to_ldif, add_ldif_header
-from ..protocol.sasl.digestMd5 import sasl_digest_md5
-from ..protocol.sasl.external import sasl_external
-from ..protocol.sasl.plain import sasl_plain
 from ..strategy.sync import SyncStrategy
-from ..strategy.safeSync import SafeSyncStrategy
-from ..strategy.safeRestartable import SafeRestartableStrategy
-from ..strategy.mockAsync import MockAsyncStrategy
-from ..strategy.asynchronous import AsyncStrategy
-from ..strategy.reusable import ReusableStrategy
-from ..strategy.restartable import RestartableStrategy
-from ..strategy.ldifProducer import LdifProducerStrategy
-from ..strategy.mockSync import MockSyncStrategy
-from ..strategy.asyncStream import AsyncStreamStrategy
 from ..operation.unbind import unbind_operation
 from ..protocol.rfc2696 import paged_search_control
 from .usage import ConnectionUsage
 from .tls import Tls
+from .pipeline import Pipeline
 from .exceptions import LDAPUnknownStrategyError, LDAPBindError, LDAPUnknownAuthenticationMethodError, \
     LDAPSASLMechanismNotSupportedError, LDAPObjectClassError, LDAPConnectionIsReadOnlyError, LDAPChangeError, LDAPExceptionError, \
     LDAPObjectError, LDAPSocketReceiveError, LDAPAttributeError, LDAPInvalidValueError, LDAPInvalidPortError, LDAPStartTLSError, \
-    LDAPPackageUnavailableError
+    LDAPPackageUnavailableError, LDAPConfigurationError
 
 from ..utils.conv import escape_bytes, prepare_for_stream, check_json_dict, format_json, to_unicode
 from ..utils.log import log, log_enabled, ERROR, BASIC, PROTOCOL, EXTENDED, get_library_log_hide_sensitive_data
@@ -89,7 +78,8 @@ CLIENT_STRATEGIES = [SYNC,
                      REUSABLE,
                      MOCK_SYNC,
                      MOCK_ASYNC,
-                     ASYNC_STREAM]
+                     ASYNC_STREAM,
+                     ASYNCIO]
 
 
 def _format_socket_endpoint(endpoint):
@@ -186,6 +176,14 @@ class Connection(object):
     :type source_port: int
     :param source_port_list: a list of source ports to choose from when opening the connection to the server. Cannot be specified with source_port
     :type source_port_list: list
+    :param socket_size: size of the chunks read from the socket, defaults to the SOCKET_SIZE config parameter
+    :type socket_size: int
+    :param pool_min_size: minimum number of connections of the pool for pooled strategies, defaults to pool_size
+    :type pool_min_size: int
+    :param pool_max_size: maximum number of connections of the pool for pooled strategies, defaults to pool_size
+    :type pool_max_size: int
+    :param tcp_keepalive: seconds of inactivity before TCP keepalive probes are sent on the connection socket, None to not use TCP keepalive
+    :type tcp_keepalive: int
     """
     def __init__(self,
                  server,
@@ -219,7 +217,11 @@ class Connection(object):
                  pool_keepalive=None,
                  source_address=None,
                  source_port=None,
-                 source_port_list=None):
+                 source_port_list=None,
+                 socket_size=None,
+                 pool_min_size=None,
+                 pool_max_size=None,
+                 tcp_keepalive=None):
 
         conf_default_pool_name = get_config_parameter('DEFAULT_THREADED_POOL_NAME')
         self.connection_lock = RLock()  # re-entrant lock to ensure that operations in the Connection object are executed atomically in the same thread
@@ -280,6 +282,9 @@ class Connection(object):
             self.cred_store = cred_store
             self.pool_lifetime = pool_lifetime
             self.pool_keepalive = pool_keepalive
+            self.pool_min_size = pool_min_size
+            self.pool_max_size = pool_max_size
+            self.tcp_keepalive = tcp_keepalive
             self.starting_tls = False
             self.check_names = check_names
             self.raise_exceptions = raise_exceptions
@@ -288,6 +293,7 @@ class Connection(object):
             self._entries = []
             self.fast_decoder = fast_decoder
             self.receive_timeout = receive_timeout
+            self.socket_size = socket_size
             self.empty_attributes = return_empty_attributes
             self.use_referral_cache = use_referral_cache
             self.auto_escape = auto_escape
@@ -355,24 +361,36 @@ class Connection(object):
             if self.strategy_type == SYNC:
                 self.strategy = SyncStrategy(self)
             elif self.strategy_type == SAFE_SYNC:
+                from ..strategy.safeSync import SafeSyncStrategy  # strategies are imported when used
                 self.strategy = SafeSyncStrategy(self)
             elif self.strategy_type == SAFE_RESTARTABLE:
+                from ..strategy.safeRestartable import SafeRestartableStrategy
                 self.strategy = SafeRestartableStrategy(self)
             elif self.strategy_type == ASYNC:
+                from ..strategy.asynchronous import AsyncStrategy
                 self.strategy = AsyncStrategy(self)
             elif self.strategy_type == LDIF:
+                from ..strategy.ldifProducer import LdifProducerStrategy
                 self.strategy = LdifProducerStrategy(self)
             elif self.strategy_type == RESTARTABLE:
+                from ..strategy.restartable import RestartableStrategy
                 self.strategy = RestartableStrategy(self)
             elif self.strategy_type == REUSABLE:
+                from ..strategy.reusable import ReusableStrategy
                 self.strategy = ReusableStrategy(self)
                 self.lazy = False
             elif self.strategy_type == MOCK_SYNC:
+                from ..strategy.mockSync import MockSyncStrategy
                 self.strategy = MockSyncStrategy(self)
             elif self.strategy_type == MOCK_ASYNC:
+                from ..strategy.mockAsync import MockAsyncStrategy
                 self.strategy = MockAsyncStrategy(self)
             elif self.strategy_type == ASYNC_STREAM:
+                from ..strategy.asyncStream import AsyncStreamStrategy
                 self.strategy = AsyncStreamStrategy(self)
+            elif self.strategy_type == ASYNCIO:
+                from ..strategy.asyncIo import AsyncIoStrategy  # needs Python 3.5+ for coroutines
+                self.strategy = AsyncIoStrategy(self)
             else:
                 self.last_error = 'unknown strategy'
                 if log_enabled(ERROR):
@@ -478,10 +496,14 @@ class Connection(object):
         r += '' if self.pool_size is None else ', pool_size={0.pool_size!r}'.format(self)
         r += '' if self.pool_lifetime is None else ', pool_lifetime={0.pool_lifetime!r}'.format(self)
         r += '' if self.pool_keepalive is None else ', pool_keepalive={0.pool_keepalive!r}'.format(self)
+        r += '' if self.pool_min_size is None else ', pool_min_size={0.pool_min_size!r}'.format(self)
+        r += '' if self.pool_max_size is None else ', pool_max_size={0.pool_max_size!r}'.format(self)
         r += '' if self.cred_store is None else (', cred_store=' + repr(self.cred_store))
         r += '' if self.fast_decoder is None else (', fast_decoder=' + ('True' if self.fast_decoder else 'False'))
         r += '' if self.auto_range is None else (', auto_range=' + ('True' if self.auto_range else 'False'))
         r += '' if self.receive_timeout is None else ', receive_timeout={0.receive_timeout!r}'.format(self)
+        r += '' if self.socket_size is None else ', socket_size={0.socket_size!r}'.format(self)
+        r += '' if self.tcp_keepalive is None else ', tcp_keepalive={0.tcp_keepalive!r}'.format(self)
         r += '' if self.empty_attributes is None else (', return_empty_attributes=' + ('True' if self.empty_attributes else 'False'))
         r += '' if self.auto_encode is None else (', auto_encode=' + ('True' if self.auto_encode else 'False'))
         r += '' if self.auto_escape is None else (', auto_escape=' + ('True' if self.auto_escape else 'False'))
@@ -518,10 +540,14 @@ class Connection(object):
         r += '' if self.pool_size is None else ', pool_size={0.pool_size!r}'.format(self)
         r += '' if self.pool_lifetime is None else ', pool_lifetime={0.pool_lifetime!r}'.format(self)
         r += '' if self.pool_keepalive is None else ', pool_keepalive={0.pool_keepalive!r}'.format(self)
+        r += '' if self.pool_min_size is None else ', pool_min_size={0.pool_min_size!r}'.format(self)
+        r += '' if self.pool_max_size is None else ', pool_max_size={0.pool_max_size!r}'.format(self)
         r += '' if self.cred_store is None else (', cred_store=' + repr(self.cred_store))
         r += '' if self.fast_decoder is None else (', fast_decoder=' + 'True' if self.fast_decoder else 'False')
         r += '' if self.auto_range is None else (', auto_range=' + ('True' if self.auto_range else 'False'))
         r += '' if self.receive_timeout is None else ', receive_timeout={0.receive_timeout!r}'.format(self)
+        r += '' if self.socket_size is None else ', socket_size={0.socket_size!r}'.format(self)
+        r += '' if self.tcp_keepalive is None else ', tcp_keepalive={0.tcp_keepalive!r}'.format(self)
         r += '' if self.empty_attributes is None else (', return_empty_attributes=' + 'True' if self.empty_attributes else 'False')
         r += '' if self.auto_encode is None else (', auto_encode=' + ('True' if self.auto_encode else 'False'))
         r += '' if self.auto_escape is None else (', auto_escape=' + ('True' if self.auto_escape else 'False'))
@@ -1257,6 +1283,67 @@ class Connection(object):
 
             return self._prepare_return_value(return_value)
 
+    def pipeline(self,
+                 max_outstanding=None):
+        """
+        Returns a Pipeline to send many operations without waiting for each response (only for synchronous strategies)
+
+        :param max_outstanding: maximum number of requests sent before waiting for the oldest response
+        :type max_outstanding: int
+        :return: Pipeline
+        """
+        return Pipeline(self, max_outstanding)
+
+    def search_generator(self,
+                         search_base,
+                         search_filter,
+                         search_scope=SUBTREE,
+                         dereference_aliases=DEREF_ALWAYS,
+                         attributes=None,
+                         size_limit=0,
+                         time_limit=0,
+                         types_only=False,
+                         get_operational_attributes=False,
+                         controls=None,
+                         auto_escape=None):
+        """
+        Sends a search and returns a generator that yields the responses as soon as they are received (only for synchronous strategies)
+        Responses are not stored in connection.response, so memory usage doesn't depend on the number of entries found.
+        Data is read from the socket only when the next response is requested, so a slow consumer slows down the server.
+        The search result is in connection.result when the generator is exhausted. If the generator is closed or
+        dropped before the end of the search the operation is abandoned. Referrals and range attributes are not followed
+
+        :return: generator of response dicts
+        """
+        if not self.strategy.sync or self.strategy.no_real_dsa or self.strategy.pooled:
+            self.last_error = 'search generator is only available for synchronous strategies'
+            if log_enabled(ERROR):
+                log(ERROR, '%s for <%s>', self.last_error, self)
+            raise LDAPConfigurationError(self.last_error)
+        with self.connection_lock:  # operations of other threads must not be sent while pipelining
+            self.strategy.pipelining = True
+            try:
+                message_id = self.search(search_base,
+                                         search_filter,
+                                         search_scope,
+                                         dereference_aliases,
+                                         attributes,
+                                         size_limit,
+                                         time_limit,
+                                         types_only,
+                                         get_operational_attributes,
+                                         controls,
+                                         auto_escape=auto_escape)
+            finally:
+                self.strategy.pipelining = False
+            if isinstance(message_id, tuple):  # thread safe strategies return a tuple with the messageId as status
+                message_id = message_id[0]
+            if not message_id:  # request not sent
+                return iter([])
+            responses = self.strategy.stream_response(message_id)
+            next(responses)  # registers the search now, responses received by other operations are kept for the generator
+        return responses
+
     def abandon(self,
                 message_id,
                 controls=None):
@@ -1369,13 +1456,16 @@ class Connection(object):
                 self.sasl_in_progress = True
                 try:
                     if self.sasl_mechanism == EXTERNAL:
+                        from ..protocol.sasl.external import sasl_external  # mechanisms are imported when used
                         result = sasl_external(self, controls)
                     elif self.sasl_mechanism == DIGEST_MD5:
+                        from ..protocol.sasl.digestMd5 import sasl_digest_md5  # loads the pycryptodomex ciphers
                         result = sasl_digest_md5(self, controls)
                     elif self.sasl_mechanism == GSSAPI:
                         from ..protocol.sasl.kerberos import sasl_gssapi  # needs the gssapi package
                         result = sasl_gssapi(self, controls)
                     elif self.sasl_mechanism == 'PLAIN':
+                        from ..protocol.sasl.plain import sasl_plain
                         result = sasl_plain(self, controls)
                 finally:
                     self.sasl_in_progress = False
@@ -1648,13 +1738,15 @@ class Connection(object):
             from .. import ObjectDef, Reader
 
             # build a table of ObjectDefs, grouping the entries found in search_response for their attributes set, subset will be included in superset
-            attr_sets = []
+            attr_sets = []  # in first seen order, so ObjectDefs don't depend on the hash order of the sets
+            attributes_order = dict()  # attribute set -> attribute names as in the first entry with the set
             for response in search_response:
                 if response['type'] == 'searchResEntry':
-                    resp_attr_set = set(response['attributes'].keys())
-                    if resp_attr_set not in attr_sets:
-                        attr_sets.append(resp_attr_set)
-            attr_sets.sort(key=lambda x: -len(x))  # sorts the list in descending length order
+                    attr_set = frozenset(response['attributes'].keys())
+                    if attr_set not in attributes_order:
+                        attributes_order[attr_set] = list(response['attributes'].keys())
+                        attr_sets.append(attr_set)
+            attr_sets.sort(key=lambda x: -len(x))  # sorts the list in descending length order, stable for sets of equal length
             unique_attr_sets = []
             for attr_set in attr_sets:
                 for unique_set in unique_attr_sets:
@@ -1665,18 +1757,23 @@ class Connection(object):
             object_defs = []
             for attr_set in unique_attr_sets:
                 object_def = ObjectDef(schema=self.server.schema)
-                object_def += list(attr_set)  # converts the set in a list to be added to the object definition
+                object_def += attributes_order[attr_set]
                 object_defs.append((attr_set,
                                     object_def,
                                     Reader(self, object_def, search_request['base'], search_request['filter'], attributes=attr_set) if self.strategy.sync else Reader(self, object_def, '', '', attributes=attr_set))
                                    )  # objects_defs contains a tuple with the set, the ObjectDef and a cursor
 
             entries = []
+            readers = dict()  # attribute set -> Reader, avoids searching the ObjectDef for each entry
             for response in search_response:
                 if response['type'] == 'searchResEntry':
-                    resp_attr_set = set(response['attributes'].keys())
+                    resp_attr_set = frozenset(response['attributes'].keys())
+                    if resp_attr_set in readers:
+                        entries.append(readers[resp_attr_set]._create_entry(response))
+                        continue
                     for object_def in object_defs:
                         if resp_attr_set <= object_def[0]:  # finds the ObjectDef for the attribute set of this entry
+                            readers[resp_attr_set] = object_def[2]
                             entry = object_def[2]._create_entry(response)
                             entries.append(entry)
                             break
@@ -0,0 +1,134 @@
+"""
+"""
+
+# Created on 2025.03.08
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+from collections import deque
+
+from .. import get_config_parameter
+from .exceptions import LDAPConfigurationError, LDAPExceptionError
+from .results import RESULT_SUCCESS, RESULT_COMPARE_TRUE
+from ..utils.log import log, log_enabled, ERROR, BASIC
+
+
+class Pipeline(object):
+    """
+    Sends operations back-to-back on a synchronous connection without waiting for each response
+    Responses are collected by messageId when the pipeline is executed; at most max_outstanding requests are sent
+    before waiting for the oldest response, so the server is never blocked writing responses that are not read
+    Each operation returns the messageId of the request. results contains a tuple (status, result, response, request)
+    for each operation, in the order the operations were requested
+    """
+
+    def __init__(self, connection, max_outstanding=None):
+        if not connection.strategy.sync or connection.strategy.no_real_dsa or connection.strategy.pooled:
+            connection.last_error = 'pipelining is only available for synchronous strategies'
+            if log_enabled(ERROR):
+                log(ERROR, '%s for <%s>', connection.last_error, connection)
+            raise LDAPConfigurationError(connection.last_error)
+        self.connection = connection
+        self.max_outstanding = max_outstanding or get_config_parameter('PIPELINE_MAX_OUTSTANDING')
+        self.results = []
+        self._pending = deque()
+
+    def __repr__(self):
+        return 'Pipeline(connection={0.connection!r}, max_outstanding={0.max_outstanding!r}) - pending: {1} - completed: {2}'.format(self, len(self._pending), len(self.results))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+        else:
+            self.discard()
+        return False  # re-raise the exception
+
+    def _send(self, operation, *args, **kwargs):
+        while len(self._pending) >= self.max_outstanding:
+            self._collect()
+        with self.connection.connection_lock:  # operations of other threads must not be sent while pipelining
+            self.connection.strategy.pipelining = True
+            try:
+                message_id = operation(*args, **kwargs)
+            finally:
+                self.connection.strategy.pipelining = False
+            if isinstance(message_id, tuple):  # thread safe strategies return a tuple with the messageId as status
+                message_id = message_id[0]
+            self.connection.strategy._responses[message_id] = []
+        self._pending.append(message_id)
+        return message_id
+
+    def _collect(self):
+        message_id = self._pending.popleft()
+        response, result, request = self.connection.get_response(message_id, get_request=True)
+        if result['type'] == 'searchResDone':
+            status = True if len(response) > 0 else False
+        elif result['type'] == 'compareResponse':
+            status = True if result['result'] == RESULT_COMPARE_TRUE else False
+        else:
+            status = True if result['result'] == RESULT_SUCCESS else False
+        self.results.append((status, result, response, request))
+
+    def execute(self):
+        """
+        Waits for all the pending responses and returns the results
+        """
+        while self._pending:
+            self._collect()
+        if log_enabled(BASIC):
+            log(BASIC, 'pipeline executed with %d results via <%s>', len(self.results), self.connection)
+        return self.results
+
+    def discard(self):
+        """
+        Reads and drops the responses of the pending requests. If responses can't be read the connection is closed
+        """
+        completed = len(self.results)
+        try:
+            while self._pending:
+                self._collect()
+        except LDAPExceptionError:
+            for message_id in self._pending:
+                self.connection.strategy._responses.pop(message_id, None)
+            self._pending.clear()
+            self.connection.strategy.close()
+        del self.results[completed:]
+
+    def search(self, *args, **kwargs):
+        return self._send(self.connection.search, *args, **kwargs)
+
+    def compare(self, *args, **kwargs):
+        return self._send(self.connection.compare, *args, **kwargs)
+
+    def add(self, *args, **kwargs):
+        return self._send(self.connection.add, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._send(self.connection.delete, *args, **kwargs)
+
+    def modify(self, *args, **kwargs):
+        return self._send(self.connection.modify, *args, **kwargs)
+
+    def modify_dn(self, *args, **kwargs):
+        return self._send(self.connection.modify_dn, *args, **kwargs)
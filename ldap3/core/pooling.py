@@ -25,15 +25,22 @@
 
 from datetime import datetime, MINYEAR
 from os import linesep
-from random import randint
+from random import randint, shuffle
+from threading import Thread, Condition, Event, Lock, RLock
 from time import sleep
+from weakref import ref
 
-from .. import FIRST, ROUND_ROBIN, RANDOM, SEQUENCE_TYPES, STRING_TYPES, get_config_parameter
+from .. import FIRST, ROUND_ROBIN, RANDOM, FASTEST, LEAST_OUTSTANDING, SEQUENCE_TYPES, STRING_TYPES, get_config_parameter
 from .exceptions import LDAPUnknownStrategyError, LDAPServerPoolError, LDAPServerPoolExhaustedError
 from .server import Server
 from ..utils.log import log, log_enabled, ERROR, BASIC, NETWORK
 
-POOLING_STRATEGIES = [FIRST, ROUND_ROBIN, RANDOM]
+try:
+    from time import monotonic  # Python 3
+except ImportError:
+    from time import time as monotonic  # Python 2
+
+POOLING_STRATEGIES = [FIRST, ROUND_ROBIN, RANDOM, FASTEST, LEAST_OUTSTANDING]
 
 
 class ServerState(object):
@@ -41,6 +48,30 @@ class ServerState(object):
         self.server = server
         self.last_checked_time = last_checked_time
         self.available = available
+        self.outstanding = 0  # requests sent to the server and still waiting for a response
+        self.completed = 0  # requests answered by the server
+        self.response_time = None  # exponentially weighted moving average of the response time in seconds
+        self._lock = Lock()
+
+    def __str__(self):
+        return str(self.server) + ' - available: ' + str(self.available) + ' - outstanding: ' + str(self.outstanding) + ' - completed: ' + str(self.completed) + ' - response time: ' + ('None' if self.response_time is None else '%.6f' % self.response_time)
+
+    def request_started(self):
+        with self._lock:
+            self.outstanding += 1
+        return monotonic()
+
+    def request_completed(self, start_time):
+        elapsed = monotonic() - start_time
+        weight = get_config_parameter('POOLING_RESPONSE_TIME_WEIGHT')
+        with self._lock:
+            self.outstanding -= 1
+            self.completed += 1
+            self.response_time = elapsed if self.response_time is None else weight * elapsed + (1 - weight) * self.response_time
+
+    def request_discarded(self):
+        with self._lock:
+            self.outstanding -= 1
 
 
 class ServerPoolState(object):
@@ -59,7 +90,7 @@ class ServerPoolState(object):
         s = 'servers: ' + linesep
         if self.server_states:
             for state in self.server_states:
-                s += str(state.server) + linesep
+                s += str(state) + linesep
         else:
             s += 'None' + linesep
         s += 'Pool strategy: ' + str(self.strategy) + linesep
@@ -68,14 +99,41 @@ class ServerPoolState(object):
         return s
 
     def refresh(self):
-        self.server_states = []
-        for server in self.server_pool.servers:
-            self.server_states.append(ServerState(server, datetime(MINYEAR, 1, 1), True))  # server, smallest date ever, supposed available
+        with self.server_pool.health_check_lock:  # results of a health check are published all together
+            previous_states = dict((id(server_state.server), server_state) for server_state in self.server_states)
+            server_states = []
+            health_checker = self.server_pool.health_checker
+            checked = health_checker.results if health_checker else dict()
+            for server in self.server_pool.servers:
+                if id(server) in previous_states:  # keeps the state of the server, requests in progress update its statistics when completed
+                    server_states.append(previous_states.pop(id(server)))
+                elif id(server) in checked:  # availability from the last health check
+                    server_states.append(ServerState(server, health_checker.last_check_time, checked[id(server)]))
+                else:
+                    server_states.append(ServerState(server, datetime(MINYEAR, 1, 1), True))  # server, smallest date ever, supposed available
+            self.server_states = server_states
         self.last_used_server = randint(0, len(self.server_states) - 1)
 
     def get_current_server(self):
         return self.server_states[self.last_used_server].server
 
+    def get_server_state(self, server):
+        for server_state in self.server_states:
+            if server_state.server is server:
+                return server_state
+        return None
+
+    def ranked_servers(self):
+        """
+        Returns the offsets of the servers sorted by the pool strategy statistics. Servers without a measured response time are
+        ranked first so that each server is measured
+        """
+        if self.server_pool.strategy == FASTEST:
+            key = lambda offset: (self.server_states[offset].response_time is not None, self.server_states[offset].response_time, self.server_states[offset].outstanding)
+        else:  # LEAST_OUTSTANDING
+            key = lambda offset: (self.server_states[offset].outstanding, self.server_states[offset].response_time is not None, self.server_states[offset].response_time)
+        return sorted(range(len(self.server_states)), key=key)
+
     def get_server(self):
         if self.server_states:
             if self.server_pool.strategy == FIRST:
@@ -98,6 +156,12 @@ class ServerPoolState(object):
                 else:
                     # returns a random server in the pool
                     self.last_used_server = randint(0, len(self.server_states) - 1)
+            elif self.server_pool.strategy in (FASTEST, LEAST_OUTSTANDING):
+                if self.server_pool.active:
+                    # returns the fastest or the least loaded active server
+                    self.last_used_server = self.find_active_server(offsets=self.ranked_servers())
+                else:
+                    self.last_used_server = self.ranked_servers()[0]
             else:
                 if log_enabled(ERROR):
                     log(ERROR, 'unknown server pooling strategy <%s>', self.server_pool.strategy)
@@ -110,15 +174,85 @@ class ServerPoolState(object):
                 log(ERROR, 'no servers in Server Pool <%s>', self)
             raise LDAPServerPoolError('no servers in server pool')
 
+    def check_servers_availability(self, server_states):
+        """
+        Checks the availability of the servers concurrently, each server in its own thread.
+        Checks are staggered as in Server.check_availability(): the next server is checked when all the servers being
+        checked are found unavailable, or when none of them answered in CHECK_AVAILABILITY_ATTEMPT_DELAY seconds.
+        Yields (server_state, available) in the order of server_states as soon as the server and all the preceding ones
+        have been checked. When the caller stops the servers already being checked complete their check in background,
+        the following servers are not checked
+        """
+        if len(server_states) == 1:
+            server_states[0].last_checked_time = datetime.now()
+            server_states[0].available = server_states[0].server.check_availability()
+            yield server_states[0], server_states[0].available
+            return
+
+        conf_attempt_delay = get_config_parameter('CHECK_AVAILABILITY_ATTEMPT_DELAY')
+        checked = dict()
+        condition = Condition()
+        started = 0
+        next_check_time = 0
+
+        def check(server_state):
+            try:
+                available = server_state.server.check_availability()
+            except Exception as e:
+                available = e
+            with condition:
+                if not isinstance(available, Exception):
+                    server_state.available = available
+                checked[server_state] = available
+                condition.notify_all()
+
+        for server_state in server_states:
+            with condition:
+                while server_state not in checked:
+                    now = monotonic()
+                    if started < len(server_states) and not any(available is True for available in checked.values()):
+                        if len(checked) == started or now >= next_check_time:  # previous checks failed or are slow
+                            started_state = server_states[started]
+                            started += 1
+                            next_check_time = now + conf_attempt_delay
+                            started_state.last_checked_time = datetime.now()
+                            if log_enabled(NETWORK):
+                                log(NETWORK, 'checking server <%s> for availability', started_state.server)
+                            thread = Thread(target=check, args=(started_state, ))
+                            thread.daemon = True
+                            thread.start()
+                            continue
+                        condition.wait(next_check_time - now)
+                    else:
+                        condition.wait()
+            if isinstance(checked[server_state], Exception):
+                raise checked[server_state]
+            yield server_state, checked[server_state]
+
+    def find_checked_server(self, offsets):
+        """
+        Returns the first server found available by the pool health checker, None if the pool is not checked yet
+        """
+        if self.server_pool.health_checker and self.server_pool.health_checker.last_check_time:
+            for offset in offsets:
+                if self.server_states[offset].available:
+                    return offset
+        return None
+
     def find_active_random_server(self):
         counter = self.server_pool.active  # can be True for "forever" or the number of cycles to try
+        offsets = list(range(len(self.server_states)))
+        shuffle(offsets)
+        offset = self.find_checked_server(offsets)
+        if offset is not None:
+            return offset
         while counter:
             if log_enabled(NETWORK):
                 log(NETWORK, 'entering loop for finding active server in pool <%s>', self)
             temp_list = self.server_states[:]  # copy
+            candidates = []
             while temp_list:
-                # pops a random server from a temp list and checks its
-                # availability, if not available tries another one
+                # pops a random server from a temp list, offline servers are not checked
                 server_state = temp_list.pop(randint(0, len(temp_list) - 1))
                 if not server_state.available:  # server is offline
                     if (isinstance(self.server_pool.exhaust, bool) and self.server_pool.exhaust) or (datetime.now() - server_state.last_checked_time).seconds < self.server_pool.exhaust:  # keeps server offline
@@ -127,35 +261,38 @@ class ServerPoolState(object):
                         continue
                     if log_enabled(NETWORK):
                             log(NETWORK, 'server <%s> reinserted in pool', server_state.server)
-                server_state.last_checked_time = datetime.now()
-                if log_enabled(NETWORK):
-                    log(NETWORK, 'checking server <%s> for availability', server_state.server)
-                if server_state.server.check_availability():
-                    # returns a random active server in the pool
-                    server_state.available = True
-                    return self.server_states.index(server_state)
-                else:
-                    server_state.available = False
+                candidates.append(server_state)
+            if candidates:
+                for server_state, available in self.check_servers_availability(candidates):
+                    if available:
+                        # returns a random active server in the pool
+                        return self.server_states.index(server_state)
             if not isinstance(self.server_pool.active, bool):
                 counter -= 1
         if log_enabled(ERROR):
             log(ERROR, 'no random active server available in Server Pool <%s> after maximum number of tries', self)
         raise LDAPServerPoolExhaustedError('no random active server available in server pool after maximum number of tries')
 
-    def find_active_server(self, starting):
+    def find_active_server(self, starting=0, offsets=None):
+        """
+        Returns the first active server in a circular range from starting, or in the order of offsets if specified
+        """
         conf_pool_timeout = get_config_parameter('POOLING_LOOP_TIMEOUT')
         counter = self.server_pool.active  # can be True for "forever" or the number of cycles to try
         if starting >= len(self.server_states):
             starting = 0
 
+        pool_size = len(self.server_states)
+        if offsets is None:
+            offsets = [(index + starting) % pool_size for index in range(pool_size)]
+        offset = self.find_checked_server(offsets)
+        if offset is not None:
+            return offset
         while counter:
             if log_enabled(NETWORK):
                 log(NETWORK, 'entering loop number <%s> for finding active server in pool <%s>', counter, self)
-            index = -1
-            pool_size = len(self.server_states)
-            while index < pool_size - 1:
-                index += 1
-                offset = index + starting if index + starting < pool_size else index + starting - pool_size
+            candidates = []
+            for offset in offsets:
                 server_state = self.server_states[offset]
                 if not server_state.available:  # server is offline
                     if (isinstance(self.server_pool.exhaust, bool) and self.server_pool.exhaust) or (datetime.now() - server_state.last_checked_time).seconds < self.server_pool.exhaust:  # keeps server offline
@@ -167,14 +304,12 @@ class ServerPoolState(object):
                         continue
                     if log_enabled(NETWORK):
                             log(NETWORK, 'server <%s> reinserted in pool', server_state.server)
-                server_state.last_checked_time = datetime.now()
-                if log_enabled(NETWORK):
-                    log(NETWORK, 'checking server <%s> for availability', server_state.server)
-                if server_state.server.check_availability():
-                    server_state.available = True
-                    return offset
-                else:
-                    server_state.available = False  # sets server offline
+                candidates.append(server_state)
+            if candidates:
+                # servers are checked concurrently but the first available in pool order is returned
+                for server_state, available in self.check_servers_availability(candidates):
+                    if available:
+                        return self.server_states.index(server_state)
 
             if not isinstance(self.server_pool.active, bool):
                 counter -= 1
@@ -190,13 +325,82 @@ class ServerPoolState(object):
         return len(self.server_states)
 
 
+class ServerPoolHealthChecker(Thread):
+    """
+    Checks the availability of all the servers of the pool every interval seconds and updates the pool states,
+    so that get_server() can choose an available server without checking it when a connection is opened
+    The pool is referenced weakly, the thread ends when the pool is released
+    """
+
+    def __init__(self, server_pool, interval):
+        Thread.__init__(self)
+        self.daemon = True
+        self._server_pool = ref(server_pool)
+        self.lock = server_pool.health_check_lock
+        self.interval = interval
+        self.stop_event = Event()
+        self.last_check_time = None
+        self.results = dict()  # id(server) -> availability in the last check
+
+    def __repr__(self):
+        return 'ServerPoolHealthChecker(interval={0.interval!r}) - last check: {0.last_check_time}'.format(self)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            server_pool = self._server_pool()
+            if server_pool is None:  # pool released
+                return
+            self.check(server_pool)
+            server_pool = None  # the pool can be released while waiting
+            self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def check(self, server_pool):
+        results = dict()  # id(server) -> available
+
+        def check(server):
+            try:
+                results[id(server)] = server.check_availability()
+            except Exception as e:
+                if log_enabled(ERROR):
+                    log(ERROR, 'error <%s> while checking server <%s> in Server Pool health check', e, server)
+                results[id(server)] = False
+
+        threads = []
+        for server in server_pool.servers[:]:
+            thread = Thread(target=check, args=(server, ))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        check_time = datetime.now()
+        with self.lock:  # pool states created or refreshed during the check read the results after they are applied
+            pool_states = list(server_pool.pool_states.values())
+            if server_pool._pool_state:
+                pool_states.append(server_pool._pool_state)
+            for pool_state in pool_states:
+                for server_state in pool_state.server_states:
+                    if id(server_state.server) in results:
+                        server_state.available = results[id(server_state.server)]
+                        server_state.last_checked_time = check_time
+            self.results = results
+            self.last_check_time = check_time  # set last, the check is complete when it's visible
+        if log_enabled(NETWORK):
+            log(NETWORK, 'health check of Server Pool <%s>: %d of %d servers available', server_pool, sum(results.values()), len(results))
+
+
 class ServerPool(object):
     def __init__(self,
                  servers=None,
                  pool_strategy=ROUND_ROBIN,
                  active=True,
                  exhaust=False,
-                 single_state=True):
+                 single_state=True,
+                 health_check_interval=None):
 
         if pool_strategy not in POOLING_STRATEGIES:
             if log_enabled(ERROR):
@@ -206,17 +410,26 @@ class ServerPool(object):
             if log_enabled(ERROR):
                 log(ERROR, 'cannot instantiate pool with exhaust and not active')
             raise LDAPServerPoolError('pools can be exhausted only when checking for active servers')
+        if health_check_interval and not active:
+            if log_enabled(ERROR):
+                log(ERROR, 'cannot instantiate pool with health check and not active')
+            raise LDAPServerPoolError('health check is available only when checking for active servers')
         self.servers = []
         self.pool_states = dict()
         self.active = active
         self.exhaust = exhaust
         self.single = single_state
         self._pool_state = None # used for storing the global state of the pool
+        self.health_checker = None
+        self.health_check_lock = RLock()
         if isinstance(servers, SEQUENCE_TYPES + (Server, )):
             self.add(servers)
         elif isinstance(servers, STRING_TYPES):
             self.add(Server(servers))
         self.strategy = pool_strategy
+        if health_check_interval:
+            self.health_checker = ServerPoolHealthChecker(self, health_check_interval)
+            self.health_checker.start()
 
         if log_enabled(BASIC):
             log(BASIC, 'instantiated ServerPool: <%r>', self)
@@ -231,6 +444,8 @@ class ServerPool(object):
             s += 'Pool strategy: ' + str(self.strategy)
             s += ' - ' + 'active: ' + (str(self.active) if self.active else 'False')
             s += ' - ' + 'exhaust pool: ' + (str(self.exhaust) if self.exhaust else 'False')
+            if self.health_checker:
+                s += ' - ' + 'health check interval: ' + str(self.health_checker.interval)
             return s
 
     def __repr__(self):
@@ -245,6 +460,8 @@ class ServerPool(object):
         r += ', pool_strategy={0.strategy!r}'.format(self)
         r += ', active={0.active!r}'.format(self)
         r += ', exhaust={0.exhaust!r}'.format(self)
+        if self.health_checker:
+            r += ', health_check_interval={0.health_checker.interval!r}'.format(self)
         r += ')'
 
         return r
@@ -303,14 +520,20 @@ class ServerPool(object):
                 # notifies connections using this pool to refresh
                 self.pool_states[connection].refresh()
 
+    def stop_health_check(self):
+        if self.health_checker:
+            self.health_checker.stop()
+            self.health_checker = None
+
     def initialize(self, connection):
         # registers pool_state in ServerPool object
-        if self.single:
-            if not self._pool_state:
-                self._pool_state = ServerPoolState(self)
-            self.pool_states[connection] = self._pool_state
-        else:
-            self.pool_states[connection] = ServerPoolState(self)
+        with self.health_check_lock:  # a health check is applied to the new pool state or read by it, not lost in between
+            if self.single:
+                if not self._pool_state:
+                    self._pool_state = ServerPoolState(self)
+                self.pool_states[connection] = self._pool_state
+            else:
+                self.pool_states[connection] = ServerPoolState(self)
 
     def get_server(self, connection):
         if connection in self.pool_states:
@@ -320,6 +543,17 @@ class ServerPool(object):
                 log(ERROR, 'connection <%s> not in Server Pool State <%s>', connection, self)
             raise LDAPServerPoolError('connection not in ServerPoolState')
 
+    def request_started(self, connection):
+        """
+        Updates the statistics of the server used by the connection, returns the server state and the start time of the
+        request or None if the server is not in the pool
+        """
+        if connection in self.pool_states:
+            server_state = self.pool_states[connection].get_server_state(connection.server)
+            if server_state:
+                return server_state, server_state.request_started()
+        return None
+
     def get_current_server(self, connection):
         if connection in self.pool_states:
             return self.pool_states[connection].get_current_server()
@@ -24,6 +24,8 @@
 # If not, see <http://www.gnu.org/licenses/>.
 
 import socket
+from errno import EINPROGRESS, EWOULDBLOCK
+from select import select
 from threading import Lock
 from datetime import datetime, MINYEAR
 
@@ -37,6 +39,11 @@ from ..utils.log import log, log_enabled, ERROR, BASIC, PROTOCOL, NETWORK
 from ..utils.conv import to_unicode
 from ..utils.port_validators import check_port, check_port_and_port_list
 
+try:
+    from time import monotonic  # Python 3
+except ImportError:
+    from time import time as monotonic  # Python 2
+
 try:
     from urllib.parse import unquote  # Python 3
 except ImportError:
@@ -290,6 +297,9 @@ class Server(object):
         Tries to open, connect and close a socket to specified address and port to check availability.
         Timeout in seconds is specified in CHECK_AVAILABITY_TIMEOUT if not specified in
         the Server object.
+        Candidate addresses are checked concurrently with non blocking sockets: a new address is tried every
+        CHECK_AVAILABILITY_ATTEMPT_DELAY seconds (or as soon as the previous attempts fail) and the first address
+        that accepts the connection wins, so unreachable addresses don't add up their timeouts.
         If specified, use a specific address, port, or list of possible ports, when attempting to check availability.
         NOTE: This will only consider multiple ports from the source port list if the first ones we try to bind to are
               already in use. This will not attempt using different ports in the list if the server is unavailable,
@@ -316,68 +326,123 @@ class Server(object):
             candidate_bind_ports = source_port_list[:]
 
         conf_availability_timeout = get_config_parameter('CHECK_AVAILABILITY_TIMEOUT')
-        available = False
+        conf_attempt_delay = get_config_parameter('CHECK_AVAILABILITY_ATTEMPT_DELAY')
+        timeout = self.connect_timeout if self.connect_timeout else conf_availability_timeout  # set timeout for checking availability to default
+        available_address = None
         self.reset_availability()
-        for address in self.candidate_addresses():
-            available = True
+        candidates = self.candidate_addresses()
+        next_candidate = 0
+        next_attempt_time = 0
+        attempts = dict()  # pending connections: socket -> (address, deadline)
+        try:
+            while available_address is None and (attempts or next_candidate < len(candidates)):
+                now = monotonic()
+                if next_candidate < len(candidates) and (not attempts or now >= next_attempt_time):
+                    address = candidates[next_candidate]
+                    next_candidate += 1
+                    next_attempt_time = now + conf_attempt_delay
+                    temp_socket, connected = self._start_availability_check(address, bind_address, candidate_bind_ports)
+                    if connected:
+                        available_address = self._end_availability_check(temp_socket, address)
+                    elif temp_socket:
+                        attempts[temp_socket] = (address, now + timeout)
+                    else:
+                        self._set_unavailable(address)
+                    continue
+
+                wait = min(deadline for _, deadline in attempts.values())
+                if next_candidate < len(candidates):
+                    wait = min(wait, next_attempt_time)
+                _, writable, failed = select([], list(attempts), list(attempts), max(wait - now, 0))
+                for temp_socket in set(writable + failed):
+                    address, _ = attempts.pop(temp_socket)
+                    if available_address is None and temp_socket not in failed and not temp_socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                        available_address = self._end_availability_check(temp_socket, address)
+                    else:
+                        temp_socket.close()
+                        self._set_unavailable(address)
+                now = monotonic()
+                for temp_socket, (address, deadline) in list(attempts.items()):
+                    if deadline <= now:  # connect timeout expired
+                        del attempts[temp_socket]
+                        temp_socket.close()
+                        self._set_unavailable(address)
+        finally:
+            for temp_socket in attempts:  # attempts still pending when an available address is found are not marked
+                temp_socket.close()
+
+        return available_address is not None
+
+    def _start_availability_check(self, address, bind_address, candidate_bind_ports):
+        """
+        Starts a non blocking connection to address, returns the socket (None if the connection failed) and True if
+        the connection is already established
+        """
+        try:
+            temp_socket = socket.socket(*address[:3])
+        except socket.error:
+            return None, False
+
+        # Go through our candidate bind ports and try to bind our socket to our source address with them.
+        # if no source address or ports were specified, this will have the same success/fail result as if we
+        # tried to connect to the remote server without binding locally first.
+        # This is actually a little bit better, as it lets us distinguish the case of "issue binding the socket
+        # locally" from "remote server is unavailable" with more clarity, though this will only really be an
+        # issue when no source address/port is specified if the system checking server availability is running
+        # as a very unprivileged user.
+        last_bind_exc = None
+        socket_bind_succeeded = False
+        for bind_port in candidate_bind_ports:
             try:
-                temp_socket = socket.socket(*address[:3])
-
-                # Go through our candidate bind ports and try to bind our socket to our source address with them.
-                # if no source address or ports were specified, this will have the same success/fail result as if we
-                # tried to connect to the remote server without binding locally first.
-                # This is actually a little bit better, as it lets us distinguish the case of "issue binding the socket
-                # locally" from "remote server is unavailable" with more clarity, though this will only really be an
-                # issue when no source address/port is specified if the system checking server availability is running
-                # as a very unprivileged user.
-                last_bind_exc = None
-                socket_bind_succeeded = False
-                for bind_port in candidate_bind_ports:
-                    try:
-                        temp_socket.bind((bind_address, bind_port))
-                        socket_bind_succeeded = True
-                        break
-                    except Exception as bind_ex:
-                        last_bind_exc = bind_ex
-                        if log_enabled(NETWORK):
-                            log(NETWORK, 'Unable to bind to local address <%s> with source port <%s> due to <%s>',
-                                bind_address, bind_port, bind_ex)
-                if not socket_bind_succeeded:
-                    if log_enabled(ERROR):
-                        log(ERROR, 'Unable to locally bind to local address <%s> with any of the source ports <%s> due to <%s>',
-                            bind_address, candidate_bind_ports, last_bind_exc)
-                    raise LDAPSocketOpenError('Unable to bind socket locally to address {} with any of the source ports {} due to {}'
-                                              .format(bind_address, candidate_bind_ports, last_bind_exc))
+                temp_socket.bind((bind_address, bind_port))
+                socket_bind_succeeded = True
+                break
+            except Exception as bind_ex:
+                last_bind_exc = bind_ex
+                if log_enabled(NETWORK):
+                    log(NETWORK, 'Unable to bind to local address <%s> with source port <%s> due to <%s>',
+                        bind_address, bind_port, bind_ex)
+        if not socket_bind_succeeded:
+            temp_socket.close()
+            if log_enabled(ERROR):
+                log(ERROR, 'Unable to locally bind to local address <%s> with any of the source ports <%s> due to <%s>',
+                    bind_address, candidate_bind_ports, last_bind_exc)
+            raise LDAPSocketOpenError('Unable to bind socket locally to address {} with any of the source ports {} due to {}'
+                                      .format(bind_address, candidate_bind_ports, last_bind_exc))
 
-                if self.connect_timeout:
-                    temp_socket.settimeout(self.connect_timeout)
-                else:
-                    temp_socket.settimeout(conf_availability_timeout)  # set timeout for checking availability to default
-                try:
-                    temp_socket.connect(address[4])
-                except socket.error:
-                    available = False
-                finally:
-                    try:
-                        temp_socket.shutdown(socket.SHUT_RDWR)
-                    except socket.error:
-                        available = False
-                    finally:
-                        temp_socket.close()
-            except socket.gaierror:
-                available = False
-
-            if available:
-                if log_enabled(BASIC):
-                    log(BASIC, 'server <%s> available at <%r>', self, address)
-                self.update_availability(address, True)
-                break  # if an available address is found exits immediately
-            else:
-                self.update_availability(address, False)
-                if log_enabled(ERROR):
-                    log(ERROR, 'server <%s> not available at <%r>', self, address)
+        temp_socket.setblocking(False)
+        try:
+            error = temp_socket.connect_ex(address[4])
+        except socket.error:  # name resolution errors are raised by connect_ex
+            error = -1
+        if error in (EINPROGRESS, EWOULDBLOCK):
+            return temp_socket, False
+        elif error:
+            temp_socket.close()
+            return None, False
+        return temp_socket, True
+
+    def _end_availability_check(self, temp_socket, address):
+        """
+        Closes a connected socket, returns the address if the server is available
+        """
+        try:
+            temp_socket.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            self._set_unavailable(address)
+            return None
+        finally:
+            temp_socket.close()
+
+        if log_enabled(BASIC):
+            log(BASIC, 'server <%s> available at <%r>', self, address)
+        self.update_availability(address, True)
+        return address
 
-        return available
+    def _set_unavailable(self, address):
+        self.update_availability(address, False)
+        if log_enabled(ERROR):
+            log(ERROR, 'server <%s> not available at <%r>', self, address)
 
     @staticmethod
     def next_message_id():
@@ -472,6 +537,20 @@ class Server(object):
         if schema_entry and not connection.strategy.pooled:  # in pooled strategies get_schema_info is performed by the worker threads
             if isinstance(schema_entry, bytes) and str is not bytes:  # Python 3
                 schema_entry = to_unicode(schema_entry, from_server=True)
+            cache_name = None
+            if get_config_parameter('SCHEMA_CACHE_SERVERS') and not self.custom_formatter:  # cached schemas are formatted with the standard formatters
+                from ..utils.schemaCache import server_cache_name, has_cached_server_schema, load_server_schema
+                cache_name = server_cache_name(self, schema_entry)
+                if has_cached_server_schema(cache_name):  # no timestamps search when there is no cached schema to check
+                    timestamps = self._get_schema_timestamps(connection, schema_entry)
+                    schema_info = load_server_schema(cache_name, timestamps) if timestamps else None
+                    if schema_info:  # schema not changed since it has been cached
+                        with self.dit_lock:
+                            self._schema_info = schema_info
+                            self._format_dsa_info_other()
+                        if log_enabled(BASIC):
+                            log(BASIC, 'cached schema used for <%s> via <%s>', self, connection)
+                        return
             result = connection.search(schema_entry,
                                        search_filter='(objectClass=subschema)',
                                        search_scope=BASE,
@@ -508,12 +587,39 @@ class Server(object):
                     if self._schema_info:  # if schema is valid tries to apply formatter to the "other" dict with raw values for schema and info
                         for attribute in self._schema_info.other:
                             self._schema_info.other[attribute] = format_attribute_values(self._schema_info, attribute, self._schema_info.raw[attribute], self.custom_formatter)
-                        if self._dsa_info:  # try to apply formatter to the "other" dict with dsa info raw values
-                            for attribute in self._dsa_info.other:
-                                self._dsa_info.other[attribute] = format_attribute_values(self._schema_info, attribute, self._dsa_info.raw[attribute], self.custom_formatter)
+                        self._format_dsa_info_other()
+                        if cache_name:
+                            from ..utils.schemaCache import store_server_schema
+                            store_server_schema(cache_name, self._schema_info)
             if log_enabled(BASIC):
                 log(BASIC, 'schema read for <%s> via <%s>', self, connection)
 
+    def _format_dsa_info_other(self):
+        if self._dsa_info:  # try to apply formatter to the "other" dict with dsa info raw values
+            for attribute in self._dsa_info.other:
+                self._dsa_info.other[attribute] = format_attribute_values(self._schema_info, attribute, self._dsa_info.raw[attribute], self.custom_formatter)
+
+    def _get_schema_timestamps(self, connection, schema_entry):
+        """
+        Reads only the createTimestamp and modifyTimestamp of the subschema entry, to check if a cached schema has changed
+        """
+        from ..utils.schemaCache import schema_timestamps
+        result = connection.search(schema_entry,
+                                   search_filter='(objectClass=subschema)',
+                                   search_scope=BASE,
+                                   attributes=['createTimestamp', 'modifyTimestamp'])
+        if connection.strategy.thread_safe:
+            status, result, response, _ = result
+        else:
+            status = result
+            response = connection.response
+        if not connection.strategy.sync:  # asynchronous request
+            response, _ = connection.get_response(status)
+            status = True
+        if status and len(response) == 1 and 'raw_attributes' in response[0]:
+            return schema_timestamps(response[0]['raw_attributes'])
+        return None
+
     def get_info_from_server(self, connection):
         """
         reads info from DSE and from subschema
@@ -522,27 +628,14 @@ class Server(object):
             if self.get_info in [DSA, ALL]:
                 self._get_dsa_info(connection)
             if self.get_info in [SCHEMA, ALL]:
+                    if self._schema_info:  # helpers resolved with the previous schema are not valid anymore
+                        self._schema_info.attribute_helpers_cache.clear()
                     self._get_schema_info(connection)
-        elif self.get_info == OFFLINE_EDIR_8_8_8:
-            from ..protocol.schemas.edir888 import edir_8_8_8_schema, edir_8_8_8_dsa_info
-            self.attach_schema_info(SchemaInfo.from_json(edir_8_8_8_schema))
-            self.attach_dsa_info(DsaInfo.from_json(edir_8_8_8_dsa_info))
-        elif self.get_info == OFFLINE_EDIR_9_1_4:
-            from ..protocol.schemas.edir914 import edir_9_1_4_schema, edir_9_1_4_dsa_info
-            self.attach_schema_info(SchemaInfo.from_json(edir_9_1_4_schema))
-            self.attach_dsa_info(DsaInfo.from_json(edir_9_1_4_dsa_info))
-        elif self.get_info == OFFLINE_AD_2012_R2:
-            from ..protocol.schemas.ad2012R2 import ad_2012_r2_schema, ad_2012_r2_dsa_info
-            self.attach_schema_info(SchemaInfo.from_json(ad_2012_r2_schema))
-            self.attach_dsa_info(DsaInfo.from_json(ad_2012_r2_dsa_info))
-        elif self.get_info == OFFLINE_SLAPD_2_4:
-            from ..protocol.schemas.slapd24 import slapd_2_4_schema, slapd_2_4_dsa_info
-            self.attach_schema_info(SchemaInfo.from_json(slapd_2_4_schema))
-            self.attach_dsa_info(DsaInfo.from_json(slapd_2_4_dsa_info))
-        elif self.get_info == OFFLINE_DS389_1_3_3:
-            from ..protocol.schemas.ds389 import ds389_1_3_3_schema, ds389_1_3_3_dsa_info
-            self.attach_schema_info(SchemaInfo.from_json(ds389_1_3_3_schema))
-            self.attach_dsa_info(DsaInfo.from_json(ds389_1_3_3_dsa_info))
+        elif self.get_info in [OFFLINE_EDIR_8_8_8, OFFLINE_EDIR_9_1_4, OFFLINE_AD_2012_R2, OFFLINE_SLAPD_2_4, OFFLINE_DS389_1_3_3]:
+            from ..utils.schemaCache import load_offline_info
+            schema_info, dsa_info = load_offline_info(self.get_info)
+            self.attach_schema_info(schema_info)
+            self.attach_dsa_info(dsa_info)
 
     def attach_dsa_info(self, dsa_info=None):
         if isinstance(dsa_info, DsaInfo):
@@ -26,28 +26,6 @@
 from os import linesep
 
 from .. import SUBTREE, DEREF_ALWAYS, ALL_ATTRIBUTES, DEREF_NEVER
-from .microsoft.dirSync import DirSync
-from .microsoft.modifyPassword import ad_modify_password
-from .microsoft.unlockAccount import ad_unlock_account
-from .microsoft.addMembersToGroups import ad_add_members_to_groups
-from .microsoft.removeMembersFromGroups import ad_remove_members_from_groups
-from .microsoft.persistentSearch import ADPersistentSearch
-from .microsoft.fastBind import FastBind
-from .novell.partition_entry_count import PartitionEntryCount
-from .novell.replicaInfo import ReplicaInfo
-from .novell.listReplicas import ListReplicas
-from .novell.getBindDn import GetBindDn
-from .novell.nmasGetUniversalPassword import NmasGetUniversalPassword
-from .novell.nmasSetUniversalPassword import NmasSetUniversalPassword
-from .novell.startTransaction import StartTransaction
-from .novell.endTransaction import EndTransaction
-from .novell.addMembersToGroups import edir_add_members_to_groups
-from .novell.removeMembersFromGroups import edir_remove_members_from_groups
-from .novell.checkGroupsMemberships import edir_check_groups_memberships
-from .standard.whoAmI import WhoAmI
-from .standard.modifyPassword import ModifyPassword
-from .standard.PagedSearch import paged_search_generator, paged_search_accumulator
-from .standard.PersistentSearch import PersistentSearch
 
 
 class ExtendedOperationContainer(object):
@@ -63,6 +41,7 @@ class ExtendedOperationContainer(object):
 
 class StandardExtendedOperations(ExtendedOperationContainer):
     def who_am_i(self, controls=None):
+        from .standard.whoAmI import WhoAmI
         return WhoAmI(self._connection,
                       controls).send()
 
@@ -73,6 +52,7 @@ class StandardExtendedOperations(ExtendedOperationContainer):
                         hash_algorithm=None,
                         salt=None,
                         controls=None):
+        from .standard.modifyPassword import ModifyPassword
 
         return ModifyPassword(self._connection,
                               user,
@@ -95,7 +75,9 @@ class StandardExtendedOperations(ExtendedOperationContainer):
                      controls=None,
                      paged_size=100,
                      paged_criticality=False,
-                     generator=True):
+                     generator=True,
+                     prefetch=0):
+        from .standard.PagedSearch import paged_search_generator, paged_search_accumulator
 
         if generator:
             return paged_search_generator(self._connection,
@@ -110,7 +92,8 @@ class StandardExtendedOperations(ExtendedOperationContainer):
                                           get_operational_attributes,
                                           controls,
                                           paged_size,
-                                          paged_criticality)
+                                          paged_criticality,
+                                          prefetch)
         else:
             return paged_search_accumulator(self._connection,
                                             search_base,
@@ -144,6 +127,7 @@ class StandardExtendedOperations(ExtendedOperationContainer):
                           streaming=True,
                           callback=None
                           ):
+        from .standard.PersistentSearch import PersistentSearch
         events_type = 0
         if show_additions:
             events_type += 1
@@ -183,6 +167,7 @@ class StandardExtendedOperations(ExtendedOperationContainer):
                       streaming=False,
                       callback=None
                       ):
+        from .standard.PersistentSearch import PersistentSearch
         return PersistentSearch(self._connection,
                                 search_base,
                                 search_filter,
@@ -201,46 +186,55 @@ class StandardExtendedOperations(ExtendedOperationContainer):
 
 class NovellExtendedOperations(ExtendedOperationContainer):
     def get_bind_dn(self, controls=None):
+        from .novell.getBindDn import GetBindDn
         return GetBindDn(self._connection,
                          controls).send()
 
     def get_universal_password(self, user, controls=None):
+        from .novell.nmasGetUniversalPassword import NmasGetUniversalPassword
         return NmasGetUniversalPassword(self._connection,
                                         user,
                                         controls).send()
 
     def set_universal_password(self, user, new_password=None, controls=None):
+        from .novell.nmasSetUniversalPassword import NmasSetUniversalPassword
         return NmasSetUniversalPassword(self._connection,
                                         user,
                                         new_password,
                                         controls).send()
 
     def list_replicas(self, server_dn, controls=None):
+        from .novell.listReplicas import ListReplicas
         return ListReplicas(self._connection,
                             server_dn,
                             controls).send()
 
     def partition_entry_count(self, partition_dn, controls=None):
+        from .novell.partition_entry_count import PartitionEntryCount
         return PartitionEntryCount(self._connection,
                                    partition_dn,
                                    controls).send()
 
     def replica_info(self, server_dn, partition_dn, controls=None):
+        from .novell.replicaInfo import ReplicaInfo
         return ReplicaInfo(self._connection,
                            server_dn,
                            partition_dn,
                            controls).send()
 
     def start_transaction(self, controls=None):
+        from .novell.startTransaction import StartTransaction
         return StartTransaction(self._connection,
                                 controls).send()
 
     def end_transaction(self, commit=True, controls=None):  # attach the groupingControl to commit, None to abort transaction
+        from .novell.endTransaction import EndTransaction
         return EndTransaction(self._connection,
                               commit,
                               controls).send()
 
     def add_members_to_groups(self, members, groups, fix=True, transaction=True):
+        from .novell.addMembersToGroups import edir_add_members_to_groups
         return edir_add_members_to_groups(self._connection,
                                           members_dn=members,
                                           groups_dn=groups,
@@ -248,6 +242,7 @@ class NovellExtendedOperations(ExtendedOperationContainer):
                                           transaction=transaction)
 
     def remove_members_from_groups(self, members, groups, fix=True, transaction=True):
+        from .novell.removeMembersFromGroups import edir_remove_members_from_groups
         return edir_remove_members_from_groups(self._connection,
                                                members_dn=members,
                                                groups_dn=groups,
@@ -255,6 +250,7 @@ class NovellExtendedOperations(ExtendedOperationContainer):
                                                transaction=transaction)
 
     def check_groups_memberships(self, members, groups, fix=False, transaction=True):
+        from .novell.checkGroupsMemberships import edir_check_groups_memberships
         return edir_check_groups_memberships(self._connection,
                                              members_dn=members,
                                              groups_dn=groups,
@@ -274,6 +270,7 @@ class MicrosoftExtendedOperations(ExtendedOperationContainer):
                  incremental_values=True,
                  max_length=2147483647,
                  hex_guid=False):
+        from .microsoft.dirSync import DirSync
         return DirSync(self._connection,
                        sync_base=sync_base,
                        sync_filter=sync_filter,
@@ -287,9 +284,11 @@ class MicrosoftExtendedOperations(ExtendedOperationContainer):
                        hex_guid=hex_guid)
 
     def fast_bind(self, controls=None):
+        from .microsoft.fastBind import FastBind
         return FastBind(self._connection, controls).send()
 
     def modify_password(self, user, new_password, old_password=None, controls=None):
+        from .microsoft.modifyPassword import ad_modify_password
         return ad_modify_password(self._connection,
                                   user,
                                   new_password,
@@ -297,16 +296,19 @@ class MicrosoftExtendedOperations(ExtendedOperationContainer):
                                   controls)
 
     def unlock_account(self, user):
+        from .microsoft.unlockAccount import ad_unlock_account
         return ad_unlock_account(self._connection,
                                  user)
 
     def add_members_to_groups(self, members, groups, fix=True):
+        from .microsoft.addMembersToGroups import ad_add_members_to_groups
         return ad_add_members_to_groups(self._connection,
                                         members_dn=members,
                                         groups_dn=groups,
                                         fix=fix)
 
     def remove_members_from_groups(self, members, groups, fix=True):
+        from .microsoft.removeMembersFromGroups import ad_remove_members_from_groups
         return ad_remove_members_from_groups(self._connection,
                                              members_dn=members,
                                              groups_dn=groups,
@@ -319,6 +321,7 @@ class MicrosoftExtendedOperations(ExtendedOperationContainer):
                           streaming=True,
                           callback=None
                           ):
+        from .microsoft.persistentSearch import ADPersistentSearch
 
         if callback:
             streaming = False
@@ -0,0 +1,108 @@
+"""
+"""
+
+# Created on 2025.04.02
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+from .. import BASE, DEREF_NEVER
+
+
+def can_pipeline(connection):
+    return connection.strategy.sync and not connection.strategy.no_real_dsa and not connection.strategy.pooled
+
+
+def normalized_dns(dns):
+    """
+    Returns the set of the lowercased dn, used to compare dn values
+    """
+    return set(dn.lower() for dn in dns)
+
+
+def _operation_result(connection, result):
+    if not connection.strategy.sync:
+        response, result = connection.get_response(result)
+    else:
+        if connection.strategy.thread_safe:
+            _, result, response, _ = result
+        else:
+            response = connection.response
+            result = connection.result
+    return response, result
+
+
+def read_entries(connection, entries_dn, attributes):
+    """
+    :param connection: a bound Connection object
+    :param entries_dn: the list of dn to read
+    :param attributes: the attributes to read
+    :return: a list of (dn, result, attributes) tuples, attributes is None if the entry has not been read
+    Reads the attributes of each entry with a base search. Searches are pipelined on synchronous strategies
+    and sent all together on asynchronous strategies, so the time spent is not proportional to the number of entries.
+    """
+    entries = []
+    if can_pipeline(connection) and len(entries_dn) > 1:
+        with connection.pipeline() as pipeline:
+            for dn in entries_dn:
+                pipeline.search(dn, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=attributes)
+        for dn, (_, result, response, _) in zip(entries_dn, pipeline.results):
+            entries.append((dn, result, response[0]['attributes'] if result['description'] == 'success' and response else None))
+    elif not connection.strategy.sync:
+        message_ids = [connection.search(dn, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=attributes) for dn in entries_dn]
+        for dn, message_id in zip(entries_dn, message_ids):
+            response, result = connection.get_response(message_id)
+            entries.append((dn, result, response[0]['attributes'] if result['description'] == 'success' and response else None))
+    else:
+        for dn in entries_dn:
+            response, result = _operation_result(connection, connection.search(dn, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=attributes))
+            entries.append((dn, result, response[0]['attributes'] if result['description'] == 'success' and response else None))
+
+    return entries
+
+
+def modify_entries(connection, modifications, controls=None, stop_at_first_error=True):
+    """
+    :param connection: a bound Connection object
+    :param modifications: a list of (dn, changes) tuples
+    :param controls: controls to send with each modify operation
+    :param stop_at_first_error: send the modify operations one at a time and don't send the remaining ones after an error
+    :return: the list of the results of the modify operations
+    Modify operations are sent one at a time and stop at the first error, so entries after a failed one are not modified.
+    When stop_at_first_error is False (i.e. in a transaction that is aborted on error) the requests are pipelined on
+    synchronous strategies and sent all together on asynchronous strategies, and all the entries are modified even if one fails.
+    """
+    results = []
+    if not stop_at_first_error and can_pipeline(connection) and len(modifications) > 1:
+        with connection.pipeline() as pipeline:
+            for dn, changes in modifications:
+                pipeline.modify(dn, changes, controls=controls)
+        results = [result for _, result, _, _ in pipeline.results]
+    elif not stop_at_first_error and not connection.strategy.sync:
+        message_ids = [connection.modify(dn, changes, controls=controls) for dn, changes in modifications]
+        results = [connection.get_response(message_id)[1] for message_id in message_ids]
+    else:
+        for dn, changes in modifications:
+            _, result = _operation_result(connection, connection.modify(dn, changes, controls=controls))
+            results.append(result)
+            if result['description'] != 'success':
+                break
+
+    return results
@@ -24,8 +24,9 @@
 # If not, see <http://www.gnu.org/licenses/>.
 
 from ...core.exceptions import LDAPInvalidDnError, LDAPOperationsErrorResult
-from ... import SEQUENCE_TYPES, MODIFY_DELETE, BASE, DEREF_NEVER
+from ... import SEQUENCE_TYPES, MODIFY_DELETE
 from ...utils.dn import safe_dn
+from ..bulkOperations import normalized_dns, read_entries, modify_entries
 
 
 def ad_remove_members_from_groups(connection,
@@ -41,6 +42,8 @@ def ad_remove_members_from_groups(connection,
     :param raise_error: If the operation fails it raises an error instead of returning False
     :return: a boolean where True means that the operation was successful and False means an error has happened
     Removes users-groups relations following the Activwe Directory rules: users are removed from groups' member attribute
+    Groups are read in bulk, so no group is modified if any of them is not found. Groups are modified one at a time
+    and the remaining groups are not modified after an error.
 
     """
     if not isinstance(members_dn, SEQUENCE_TYPES):
@@ -53,47 +56,29 @@ def ad_remove_members_from_groups(connection,
         members_dn = [safe_dn(member_dn) for member_dn in members_dn]
         groups_dn = [safe_dn(group_dn) for group_dn in groups_dn]
 
-    error = False
-
-    for group in groups_dn:
-        if fix:  # checks for existance of group and for already assigned members
-            result = connection.search(group, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=['member'])
-
-            if not connection.strategy.sync:
-                response, result = connection.get_response(result)
-            else:
-                if connection.strategy.thread_safe:
-                    _, result, response, _ = result
-                else:
-                    response = connection.response
-                    result = connection.result
-
-            if not result['description'] == 'success':
+    if fix:  # checks for existance of groups and for already assigned members
+        groups = []
+        for group, result, attributes in read_entries(connection, groups_dn, ['member']):
+            if attributes is None:
                 raise LDAPInvalidDnError(group + ' not found')
+            groups.append((group, normalized_dns(attributes['member'] if 'member' in attributes else [])))
+    else:
+        all_members = normalized_dns(members_dn)
+        groups = [(group, all_members) for group in groups_dn]
 
-            existing_members = response[0]['attributes']['member'] if 'member' in response[0]['attributes'] else []
-        else:
-            existing_members = members_dn
-
-        existing_members = [element.lower() for element in existing_members]
-        changes = dict()
+    modifications = []
+    for group, existing_members in groups:
         member_to_remove = [element for element in members_dn if element.lower() in existing_members]
         if member_to_remove:
-            changes['member'] = (MODIFY_DELETE, member_to_remove)
-        if changes:
-            result = connection.modify(group, changes)
-            if not connection.strategy.sync:
-                _, result = connection.get_response(result)
-            else:
-                if connection.strategy.thread_safe:
-                    _, result, _, _ = result
-                else:
-                    result = connection.result
-            if result['description'] != 'success':
-                error = True
-                result_error_params = ['result', 'description', 'dn', 'message']
-                if raise_error:
-                    raise LDAPOperationsErrorResult([(k, v) for k, v in result.items() if k in result_error_params])
-                break
+            modifications.append((group, {'member': (MODIFY_DELETE, member_to_remove)}))
+
+    error = False
+    for result in modify_entries(connection, modifications):
+        if result['description'] != 'success':
+            error = True
+            result_error_params = ['result', 'description', 'dn', 'message']
+            if raise_error:
+                raise LDAPOperationsErrorResult([(k, v) for k, v in result.items() if k in result_error_params])
+            break
 
     return not error
@@ -23,8 +23,9 @@
 # along with ldap3 in the COPYING and COPYING.LESSER files.
 # If not, see <http://www.gnu.org/licenses/>.
 from ...core.exceptions import LDAPInvalidDnError
-from ... import SEQUENCE_TYPES, MODIFY_ADD, BASE, DEREF_NEVER
+from ... import SEQUENCE_TYPES, MODIFY_ADD
 from ...utils.dn import safe_dn
+from ..bulkOperations import normalized_dns, read_entries, modify_entries
 
 
 def edir_add_members_to_groups(connection,
@@ -42,6 +43,8 @@ def edir_add_members_to_groups(connection,
     Establishes users-groups relations following the eDirectory rules: groups are added to securityEquals and groupMembership
     attributes in the member object while members are added to member and equivalentToMe attributes in the group object.
     Raises LDAPInvalidDnError if members or groups are not found in the DIT.
+    All the members are read before any of them is modified, then the same is done for the groups.
+    Modify operations are sent one at a time and stop at the first error, in a transaction they are sent together.
     """
     if not isinstance(members_dn, SEQUENCE_TYPES):
         members_dn = [members_dn]
@@ -67,29 +70,18 @@ def edir_add_members_to_groups(connection,
         transaction_control = connection.extend.novell.start_transaction()
 
     if not error:
-        for member in members_dn:
-            if fix:  # checks for existance of member and for already assigned groups
-                result = connection.search(member, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=['securityEquals', 'groupMembership'])
-
-                if not connection.strategy.sync:
-                    response, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, response, _ = result
-                    else:
-                        result = connection.result
-                        response = connection.response
-
-                if not result['description'] == 'success':
+        if fix:  # checks for existance of members and for already assigned groups
+            members = []
+            for member, result, attributes in read_entries(connection, members_dn, ['securityEquals', 'groupMembership']):
+                if attributes is None:
                     raise LDAPInvalidDnError(member + ' not found')
-
-                existing_security_equals = response[0]['attributes']['securityEquals'] if 'securityEquals' in response[0]['attributes'] else []
-                existing_group_membership = response[0]['attributes']['groupMembership'] if 'groupMembership' in response[0]['attributes'] else []
-                existing_security_equals = [element.lower() for element in existing_security_equals]
-                existing_group_membership = [element.lower() for element in existing_group_membership]
-            else:
-                existing_security_equals = []
-                existing_group_membership = []
+                members.append((member,
+                                normalized_dns(attributes['securityEquals'] if 'securityEquals' in attributes else []),
+                                normalized_dns(attributes['groupMembership'] if 'groupMembership' in attributes else [])))
+        else:
+            members = [(member, set(), set()) for member in members_dn]
+        modifications = []
+        for member, existing_security_equals, existing_group_membership in members:
             changes = dict()
             security_equals_to_add = [element for element in groups_dn if element.lower() not in existing_security_equals]
             group_membership_to_add = [element for element in groups_dn if element.lower() not in existing_group_membership]
@@ -98,43 +90,23 @@ def edir_add_members_to_groups(connection,
             if group_membership_to_add:
                 changes['groupMembership'] = (MODIFY_ADD, group_membership_to_add)
             if changes:
-                result = connection.modify(member, changes, controls=[transaction_control] if transaction else None)
-                if not connection.strategy.sync:
-                    _, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, _, _ = result
-                    else:
-                        result = connection.result
-                if result['description'] != 'success':
-                    error = True
-                    break
+                modifications.append((member, changes))
+        if any(result['description'] != 'success' for result in modify_entries(connection, modifications, controls=[transaction_control] if transaction else None, stop_at_first_error=not transaction)):
+            error = True
 
     if not error:
-        for group in groups_dn:
-            if fix:  # checks for existance of group and for already assigned members
-                result = connection.search(group, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=['member', 'equivalentToMe'])
-
-                if not connection.strategy.sync:
-                    response, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, response, _ = result
-                    else:
-                        result = connection.result
-                        response = connection.response
-
-                if not result['description'] == 'success':
+        if fix:  # checks for existance of groups and for already assigned members
+            groups = []
+            for group, result, attributes in read_entries(connection, groups_dn, ['member', 'equivalentToMe']):
+                if attributes is None:
                     raise LDAPInvalidDnError(group + ' not found')
-
-                existing_members = response[0]['attributes']['member'] if 'member' in response[0]['attributes'] else []
-                existing_equivalent_to_me = response[0]['attributes']['equivalentToMe'] if 'equivalentToMe' in response[0]['attributes'] else []
-                existing_members = [element.lower() for element in existing_members]
-                existing_equivalent_to_me = [element.lower() for element in existing_equivalent_to_me]
-            else:
-                existing_members = []
-                existing_equivalent_to_me = []
-
+                groups.append((group,
+                               normalized_dns(attributes['member'] if 'member' in attributes else []),
+                               normalized_dns(attributes['equivalentToMe'] if 'equivalentToMe' in attributes else [])))
+        else:
+            groups = [(group, set(), set()) for group in groups_dn]
+        modifications = []
+        for group, existing_members, existing_equivalent_to_me in groups:
             changes = dict()
             member_to_add = [element for element in members_dn if element.lower() not in existing_members]
             equivalent_to_me_to_add = [element for element in members_dn if element.lower() not in existing_equivalent_to_me]
@@ -143,17 +115,9 @@ def edir_add_members_to_groups(connection,
             if equivalent_to_me_to_add:
                 changes['equivalentToMe'] = (MODIFY_ADD, equivalent_to_me_to_add)
             if changes:
-                result = connection.modify(group, changes, controls=[transaction_control] if transaction else None)
-                if not connection.strategy.sync:
-                    _, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, _, _ = result
-                    else:
-                        result = connection.result
-                if result['description'] != 'success':
-                    error = True
-                    break
+                modifications.append((group, changes))
+        if any(result['description'] != 'success' for result in modify_entries(connection, modifications, controls=[transaction_control] if transaction else None, stop_at_first_error=not transaction)):
+            error = True
 
     if transaction:
         if error:  # aborts transaction in case of error in the modify operations
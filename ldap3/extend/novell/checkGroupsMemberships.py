@@ -26,8 +26,9 @@
 
 from .addMembersToGroups import edir_add_members_to_groups
 from ...core.exceptions import LDAPInvalidDnError
-from ... import SEQUENCE_TYPES, BASE, DEREF_NEVER
+from ... import SEQUENCE_TYPES
 from ...utils.dn import safe_dn
+from ..bulkOperations import normalized_dns, read_entries
 
 
 def _check_members_have_memberships(connection,
@@ -49,25 +50,12 @@ def _check_members_have_memberships(connection,
         groups_dn = [groups_dn]
 
     partial = False  # True when a member has groupMembership but doesn't have securityEquals
-    for member in members_dn:
-        result = connection.search(member, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=['groupMembership', 'securityEquals'])
-
-        if not connection.strategy.sync:
-            response, result = connection.get_response(result)
-        else:
-            if connection.strategy.thread_safe:
-                _, result, response, _ = result
-            else:
-                result = connection.result
-                response = connection.response
-
-        if not result['description'] == 'success':  # member not found in DIT
+    for member, result, attributes in read_entries(connection, members_dn, ['groupMembership', 'securityEquals']):
+        if attributes is None:  # member not found in DIT
             raise LDAPInvalidDnError(member + ' not found')
 
-        existing_security_equals = response[0]['attributes']['securityEquals'] if 'securityEquals' in response[0]['attributes'] else []
-        existing_group_membership = response[0]['attributes']['groupMembership'] if 'groupMembership' in response[0]['attributes'] else []
-        existing_security_equals = [element.lower() for element in existing_security_equals]
-        existing_group_membership = [element.lower() for element in existing_group_membership]
+        existing_security_equals = normalized_dns(attributes['securityEquals'] if 'securityEquals' in attributes else [])
+        existing_group_membership = normalized_dns(attributes['groupMembership'] if 'groupMembership' in attributes else [])
 
         for group in groups_dn:
             if group.lower() not in existing_group_membership:
@@ -97,25 +85,12 @@ def _check_groups_contain_members(connection,
         members_dn = [members_dn]
 
     partial = False  # True when a group has member but doesn't have equivalentToMe
-    for group in groups_dn:
-        result = connection.search(group, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=['member', 'equivalentToMe'])
-
-        if not connection.strategy.sync:
-            response, result = connection.get_response(result)
-        else:
-            if connection.strategy.thread_safe:
-                _, result, response, _ = result
-            else:
-                result = connection.result
-                response = connection.response
-
-        if not result['description'] == 'success':
+    for group, result, attributes in read_entries(connection, groups_dn, ['member', 'equivalentToMe']):
+        if attributes is None:
             raise LDAPInvalidDnError(group + ' not found')
 
-        existing_members = response[0]['attributes']['member'] if 'member' in response[0]['attributes'] else []
-        existing_equivalent_to_me = response[0]['attributes']['equivalentToMe'] if 'equivalentToMe' in response[0]['attributes'] else []
-        existing_members = [element.lower() for element in existing_members]
-        existing_equivalent_to_me = [element.lower() for element in existing_equivalent_to_me]
+        existing_members = normalized_dns(attributes['member'] if 'member' in attributes else [])
+        existing_equivalent_to_me = normalized_dns(attributes['equivalentToMe'] if 'equivalentToMe' in attributes else [])
         for member in members_dn:
             if member.lower() not in existing_members:
                 return False, False
@@ -23,8 +23,9 @@
 # along with ldap3 in the COPYING and COPYING.LESSER files.
 # If not, see <http://www.gnu.org/licenses/>.
 from ...core.exceptions import LDAPInvalidDnError
-from ... import SEQUENCE_TYPES, MODIFY_DELETE, BASE, DEREF_NEVER
+from ... import SEQUENCE_TYPES, MODIFY_DELETE
 from ...utils.dn import safe_dn
+from ..bulkOperations import normalized_dns, read_entries, modify_entries
 
 
 def edir_remove_members_from_groups(connection,
@@ -42,6 +43,8 @@ def edir_remove_members_from_groups(connection,
     Removes users-groups relations following the eDirectory rules: groups are removed from securityEquals and groupMembership
     attributes in the member object while members are removed from member and equivalentToMe attributes in the group object.
     Raises LDAPInvalidDnError if members or groups are not found in the DIT.
+    All the members are read before any of them is modified, then the same is done for the groups.
+    Modify operations are sent one at a time and stop at the first error, in a transaction they are sent together.
 
     """
     if not isinstance(members_dn, SEQUENCE_TYPES):
@@ -68,30 +71,19 @@ def edir_remove_members_from_groups(connection,
         transaction_control = connection.extend.novell.start_transaction()
 
     if not error:
-        for member in members_dn:
-            if fix:  # checks for existance of member and for already assigned groups
-                result = connection.search(member, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=['securityEquals', 'groupMembership'])
-
-                if not connection.strategy.sync:
-                    response, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, response, _ = result
-                    else:
-                        response = connection.response
-                        result = connection.result
-
-                if not result['description'] == 'success':
+        if fix:  # checks for existance of members and for already assigned groups
+            members = []
+            for member, result, attributes in read_entries(connection, members_dn, ['securityEquals', 'groupMembership']):
+                if attributes is None:
                     raise LDAPInvalidDnError(member + ' not found')
-
-                existing_security_equals = response[0]['attributes']['securityEquals'] if 'securityEquals' in response[0]['attributes'] else []
-                existing_group_membership = response[0]['attributes']['groupMembership'] if 'groupMembership' in response[0]['attributes'] else []
-            else:
-                existing_security_equals = groups_dn
-                existing_group_membership = groups_dn
-            existing_security_equals = [element.lower() for element in existing_security_equals]
-            existing_group_membership = [element.lower() for element in existing_group_membership]
-
+                members.append((member,
+                                normalized_dns(attributes['securityEquals'] if 'securityEquals' in attributes else []),
+                                normalized_dns(attributes['groupMembership'] if 'groupMembership' in attributes else [])))
+        else:
+            all_groups = normalized_dns(groups_dn)
+            members = [(member, all_groups, all_groups) for member in members_dn]
+        modifications = []
+        for member, existing_security_equals, existing_group_membership in members:
             changes = dict()
             security_equals_to_remove = [element for element in groups_dn if element.lower() in existing_security_equals]
             group_membership_to_remove = [element for element in groups_dn if element.lower() in existing_group_membership]
@@ -100,44 +92,24 @@ def edir_remove_members_from_groups(connection,
             if group_membership_to_remove:
                 changes['groupMembership'] = (MODIFY_DELETE, group_membership_to_remove)
             if changes:
-                result = connection.modify(member, changes, controls=[transaction_control] if transaction else None)
-                if not connection.strategy.sync:
-                    _, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, _, _ = result
-                    else:
-                        result = connection.result
-                if result['description'] != 'success':
-                    error = True
-                    break
+                modifications.append((member, changes))
+        if any(result['description'] != 'success' for result in modify_entries(connection, modifications, controls=[transaction_control] if transaction else None, stop_at_first_error=not transaction)):
+            error = True
 
     if not error:
-        for group in groups_dn:
-            if fix:  # checks for existance of group and for already assigned members
-                result = connection.search(group, '(objectclass=*)', BASE, dereference_aliases=DEREF_NEVER, attributes=['member', 'equivalentToMe'])
-
-                if not connection.strategy.sync:
-                    response, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, response, _ = result
-                    else:
-                        response = connection.response
-                        result = connection.result
-
-                if not result['description'] == 'success':
+        if fix:  # checks for existance of groups and for already assigned members
+            groups = []
+            for group, result, attributes in read_entries(connection, groups_dn, ['member', 'equivalentToMe']):
+                if attributes is None:
                     raise LDAPInvalidDnError(group + ' not found')
-
-                existing_members = response[0]['attributes']['member'] if 'member' in response[0]['attributes'] else []
-                existing_equivalent_to_me = response[0]['attributes']['equivalentToMe'] if 'equivalentToMe' in response[0]['attributes'] else []
-            else:
-                existing_members = members_dn
-                existing_equivalent_to_me = members_dn
-
-            existing_members = [element.lower() for element in existing_members]
-            existing_equivalent_to_me = [element.lower() for element in existing_equivalent_to_me]
-
+                groups.append((group,
+                               normalized_dns(attributes['member'] if 'member' in attributes else []),
+                               normalized_dns(attributes['equivalentToMe'] if 'equivalentToMe' in attributes else [])))
+        else:
+            all_members = normalized_dns(members_dn)
+            groups = [(group, all_members, all_members) for group in groups_dn]
+        modifications = []
+        for group, existing_members, existing_equivalent_to_me in groups:
             changes = dict()
             member_to_remove = [element for element in members_dn if element.lower() in existing_members]
             equivalent_to_me_to_remove = [element for element in members_dn if element.lower() in existing_equivalent_to_me]
@@ -146,17 +118,9 @@ def edir_remove_members_from_groups(connection,
             if equivalent_to_me_to_remove:
                 changes['equivalentToMe'] = (MODIFY_DELETE, equivalent_to_me_to_remove)
             if changes:
-                result = connection.modify(group, changes, controls=[transaction_control] if transaction else None)
-                if not connection.strategy.sync:
-                    _, result = connection.get_response(result)
-                else:
-                    if connection.strategy.thread_safe:
-                        _, result, _, _ = result
-                    else:
-                        result = connection.result
-                if result['description'] != 'success':
-                    error = True
-                    break
+                modifications.append((group, changes))
+        if any(result['description'] != 'success' for result in modify_entries(connection, modifications, controls=[transaction_control] if transaction else None, stop_at_first_error=not transaction)):
+            error = True
 
     if transaction:
         if error:  # aborts transaction in case of error in the modify operations
@@ -23,6 +23,13 @@
 # along with ldap3 in the COPYING and COPYING.LESSER files.
 # If not, see <http://www.gnu.org/licenses/>.
 
+from threading import Thread, Event
+try:
+    from queue import Queue, Empty
+except ImportError:  # Python 2
+    # noinspection PyUnresolvedReferences
+    from Queue import Queue, Empty
+
 from ... import SUBTREE, DEREF_ALWAYS
 from ...utils.dn import safe_dn
 from ...core.results import DO_NOT_RAISE_EXCEPTIONS, RESULT_SIZE_LIMIT_EXCEEDED
@@ -30,51 +37,51 @@ from ...core.exceptions import LDAPOperationResult
 from ...utils.log import log, log_enabled, ERROR, BASIC, PROTOCOL, NETWORK, EXTENDED
 
 
-def paged_search_generator(connection,
-                           search_base,
-                           search_filter,
-                           search_scope=SUBTREE,
-                           dereference_aliases=DEREF_ALWAYS,
-                           attributes=None,
-                           size_limit=0,
-                           time_limit=0,
-                           types_only=False,
-                           get_operational_attributes=False,
-                           controls=None,
-                           paged_size=100,
-                           paged_criticality=False):
-    if connection.check_names and search_base:
-        search_base = safe_dn(search_base)
-
-    responses = []
+def _paged_search_pages(connection,
+                        search_base,
+                        search_filter,
+                        search_scope,
+                        dereference_aliases,
+                        attributes,
+                        size_limit,
+                        time_limit,
+                        types_only,
+                        get_operational_attributes,
+                        controls,
+                        paged_size,
+                        paged_criticality):
+    """
+    Generator that performs the paged search and yields the responses of each page
+    """
     original_connection = None
     original_auto_referrals = connection.auto_referrals
     connection.auto_referrals = False  # disable auto referrals because it cannot handle paged searches
     cookie = True  # performs search operation at least one time
     cachekey = None  # for referrals cache
     while cookie:
-        result = connection.search(search_base,
-                                   search_filter,
-                                   search_scope,
-                                   dereference_aliases,
-                                   attributes,
-                                   size_limit,
-                                   time_limit,
-                                   types_only,
-                                   get_operational_attributes,
-                                   controls,
-                                   paged_size,
-                                   paged_criticality,
-                                   None if cookie is True else cookie)
-
-        if not connection.strategy.sync:
-            response, result = connection.get_response(result)
-        else:
-            if connection.strategy.thread_safe:
-                _, result, response, _ = result
+        with connection.connection_lock:  # the page is requested and read atomically, also from the prefetch thread
+            result = connection.search(search_base,
+                                       search_filter,
+                                       search_scope,
+                                       dereference_aliases,
+                                       attributes,
+                                       size_limit,
+                                       time_limit,
+                                       types_only,
+                                       get_operational_attributes,
+                                       controls,
+                                       paged_size,
+                                       paged_criticality,
+                                       None if cookie is True else cookie)
+
+            if not connection.strategy.sync:
+                response, result = connection.get_response(result)
             else:
-                response = connection.response
-                result = connection.result
+                if connection.strategy.thread_safe:
+                    _, result, response, _ = result
+                else:
+                    response = connection.response
+                    result = connection.result
 
         if result['referrals'] and original_auto_referrals:  # if rererrals are returned start over the loop with a new connection to the referral
             if not original_connection:
@@ -82,7 +89,6 @@ def paged_search_generator(connection,
             _, connection, cachekey = connection.strategy.create_referral_connection(result['referrals'])   # change connection to a valid referrals
             continue
 
-        responses.extend(response)
         try:
             cookie = result['controls']['1.2.840.113556.1.4.319']['value']['cookie']
         except KeyError:
@@ -92,12 +98,10 @@ def paged_search_generator(connection,
             if log_enabled(PROTOCOL):
                 log(PROTOCOL, 'paged search operation result <%s> for <%s>', result, connection)
             if result['result'] == RESULT_SIZE_LIMIT_EXCEEDED:
-                while responses:
-                    yield responses.pop()
+                yield list(response)
             raise LDAPOperationResult(result=result['result'], description=result['description'], dn=result['dn'], message=result['message'], response_type=result['type'])
 
-        while responses:
-            yield responses.pop()
+        yield list(response)
 
     if original_connection:
         connection = original_connection
@@ -110,6 +114,95 @@ def paged_search_generator(connection,
     connection.response = None
 
 
+def _prefetch_pages(pages, prefetch):
+    """
+    Generator that reads the pages in a background thread, up to prefetch pages ahead of the consumer
+    The request for the next page is sent while the consumer is still processing the current one
+    Exceptions raised while searching are raised in the consumer after the pages received before the error
+    """
+    queue = Queue(prefetch)
+    stopped = Event()
+
+    def producer():
+        try:
+            for page in pages:
+                queue.put((page, None))
+                if stopped.is_set():
+                    break
+            queue.put((None, None))
+        except Exception as e:
+            queue.put((None, e))
+        finally:
+            pages.close()
+
+    thread = Thread(target=producer, name='paged search prefetch')
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            page, exception = queue.get()
+            if exception:
+                raise exception
+            if page is None:
+                break
+            yield page
+    finally:
+        stopped.set()
+        while thread.is_alive():  # unblocks the producer if the consumer stops before the end of the search
+            try:
+                queue.get(timeout=0.1)
+            except Empty:
+                pass
+        thread.join()
+
+
+def paged_search_generator(connection,
+                           search_base,
+                           search_filter,
+                           search_scope=SUBTREE,
+                           dereference_aliases=DEREF_ALWAYS,
+                           attributes=None,
+                           size_limit=0,
+                           time_limit=0,
+                           types_only=False,
+                           get_operational_attributes=False,
+                           controls=None,
+                           paged_size=100,
+                           paged_criticality=False,
+                           prefetch=0):
+    """
+    Performs a paged search and yields the responses
+    With prefetch > 0 pages are requested in a background thread, up to prefetch pages ahead of the consumer,
+    so the server round trip for the next page overlaps with the processing of the current page.
+    Each page request holds the connection lock, so the prefetch thread can be used with strategies that are not
+    thread safe, but the connection must not be used by the caller while the generator is running
+    """
+    if connection.check_names and search_base:
+        search_base = safe_dn(search_base)
+
+    pages = _paged_search_pages(connection,
+                                search_base,
+                                search_filter,
+                                search_scope,
+                                dereference_aliases,
+                                attributes,
+                                size_limit,
+                                time_limit,
+                                types_only,
+                                get_operational_attributes,
+                                controls,
+                                paged_size,
+                                paged_criticality)
+    if prefetch:
+        if log_enabled(BASIC):
+            log(BASIC, 'paged search prefetching %d pages via <%s>', prefetch, connection)
+        pages = _prefetch_pages(pages, prefetch)
+
+    for responses in pages:
+        while responses:
+            yield responses.pop()
+
+
 def paged_search_accumulator(connection,
                              search_base,
                              search_filter,
@@ -25,11 +25,15 @@
 
 from string import whitespace
 from os import linesep
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
 
 from .. import DEREF_NEVER, BASE, LEVEL, SUBTREE, DEREF_SEARCH, DEREF_BASE, DEREF_ALWAYS, NO_ATTRIBUTES, SEQUENCE_TYPES, get_config_parameter, STRING_TYPES
 
 from ..core.exceptions import LDAPInvalidFilterError, LDAPAttributeError, LDAPInvalidScopeError, LDAPInvalidDereferenceAliasesError
-from ..utils.ciDict import CaseInsensitiveDict
+from ..utils.ciDict import CaseInsensitiveDict, register_attribute_name
 from ..protocol.rfc4511 import SearchRequest, LDAPDN, Scope, DerefAliases, Integer0ToMax, TypesOnly, \
     AttributeSelection, Selector, EqualityMatch, AttributeDescription, AssertionValue, Filter, \
     Not, And, Or, ApproxMatch, GreaterOrEqual, LessOrEqual, ExtensibleMatch, Present, SubstringFilter, \
@@ -38,6 +42,8 @@ from ..operation.bind import referrals_to_list
 from ..protocol.convert import ava_to_dict, attributes_to_list, search_refs_to_list, validate_assertion_value, prepare_filter_for_sending, search_refs_to_list_fast
 from ..protocol.formatters.standard import format_attribute_values
 from ..utils.conv import to_unicode, to_raw
+from ..utils.lruCache import LruCache
+from ..utils.config import get_config_version
 
 ROOT = 0
 AND = 1
@@ -56,6 +62,10 @@ SEARCH_OPEN_OR_CLOSE = 21
 SEARCH_MATCH_OR_CLOSE = 22
 SEARCH_MATCH_OR_CONTROL = 23
 
+filter_cache = LruCache(get_config_parameter('FILTER_CACHE_SIZE'))  # compiled filters, hits and misses can be used to size the cache
+ATTRIBUTE_NAMES_SIZE = 4096  # maximum number of attribute names kept in a names table
+attribute_names = dict()  # raw attribute name -> attribute name, used when the schema is not available
+
 
 class FilterNode(object):
     def __init__(self, tag=None, assertion=None):
@@ -295,6 +305,34 @@ def compile_filter(filter_node):
     return compiled_filter
 
 
+def get_filter_cache(schema):
+    """
+    Returns the cache of the compiled filters for the schema
+    The cache is kept in the schema, so it is released with the schema, filters without schema use the module cache
+    """
+    if schema is None:
+        return filter_cache
+    cache = schema.compiled_filters_cache
+    if cache is None:
+        cache = LruCache(get_config_parameter('FILTER_CACHE_SIZE'))
+        schema.compiled_filters_cache = cache
+    return cache
+
+
+def get_compiled_filter(search_filter, schema, auto_escape, auto_encode, validator, check_names):
+    """Returns the ASN1 structure for the filter string, compiled filters are cached and shared by requests because
+    they are only read when the request is encoded. Entries are keyed by the validator identity and checked against the
+    stored object, and by the configuration version because the values are validated with the configuration parameters"""
+    key = (search_filter, auto_escape, auto_encode, id(validator), check_names, get_config_version())
+    cache = get_filter_cache(schema)
+    cached = cache.get(key)
+    if cached is not None and cached[0] is validator:
+        return cached[1]
+    compiled_filter = compile_filter(parse_filter(search_filter, schema, auto_escape, auto_encode, validator, check_names).elements[0])  # parse the searchFilter string and compile it starting from the root node
+    cache.set(key, (validator, compiled_filter))
+    return compiled_filter
+
+
 def build_attribute_selection(attribute_list, schema):
     conf_attributes_excluded_from_check = [v.lower() for v in get_config_parameter('ATTRIBUTES_EXCLUDED_FROM_CHECK')]
 
@@ -368,7 +406,7 @@ def search_operation(search_base,
     request['sizeLimit'] = Integer0ToMax(size_limit)
     request['timeLimit'] = Integer0ToMax(time_limit)
     request['typesOnly'] = TypesOnly(True) if types_only else TypesOnly(False)
-    request['filter'] = compile_filter(parse_filter(search_filter, schema, auto_escape, auto_encode, validator, check_names).elements[0])  # parse the searchFilter string and compile it starting from the root node
+    request['filter'] = get_compiled_filter(search_filter, schema, auto_escape, auto_encode, validator, check_names)
     if not isinstance(attributes, SEQUENCE_TYPES):
         attributes = [NO_ATTRIBUTES]
 
@@ -377,6 +415,39 @@ def search_operation(search_base,
     return request
 
 
+def get_attribute_names(schema):
+    """
+    Returns the table that maps the raw attribute names received from the server to a canonical str
+    The table is kept in the schema and populated with the names of its attribute types
+    """
+    if schema is None:
+        return attribute_names
+    names = schema.attribute_names_cache
+    if names is None:
+        names = dict()
+        if schema.attribute_types:
+            # lazy schemas return the definitions without parsing them, names are read when the definitions are indexed
+            attribute_types = schema.attribute_types.definitions() if hasattr(schema.attribute_types, 'definitions') else schema.attribute_types.values()
+            for attribute_type in attribute_types:
+                for name in attribute_type.name or []:
+                    names[to_raw(name)] = register_attribute_name(name)
+        schema.attribute_names_cache = names
+    return names
+
+
+def decode_attribute_name(raw_name, names):
+    """
+    Decodes a raw attribute name, the same str object is returned for all the entries
+    """
+    try:
+        return names[raw_name]
+    except KeyError:
+        name = to_unicode(raw_name, from_server=True)
+        if len(names) < ATTRIBUTE_NAMES_SIZE:
+            names[raw_name] = register_attribute_name(name)
+        return name
+
+
 def decode_vals(vals):
     try:
         return [str(val) for val in vals if val] if vals else None
@@ -398,11 +469,11 @@ def attributes_to_dict(attribute_list):
     return attributes
 
 
-def attributes_to_dict_fast(attribute_list):
+def attributes_to_dict_fast(attribute_list, names=attribute_names):
     conf_case_insensitive_attributes = get_config_parameter('CASE_INSENSITIVE_ATTRIBUTE_NAMES')
     attributes = CaseInsensitiveDict() if conf_case_insensitive_attributes else dict()
     for attribute in attribute_list:
-        attributes[to_unicode(attribute[3][0][3], from_server=True)] = decode_vals_fast(attribute[3][1][3])
+        attributes[decode_attribute_name(attribute[3][0][3], names)] = decode_vals_fast(attribute[3][1][3])
 
     return attributes
 
@@ -425,11 +496,11 @@ def raw_attributes_to_dict(attribute_list):
     return attributes
 
 
-def raw_attributes_to_dict_fast(attribute_list):
+def raw_attributes_to_dict_fast(attribute_list, names=attribute_names):
     conf_case_insensitive_attributes = get_config_parameter('CASE_INSENSITIVE_ATTRIBUTE_NAMES')
     attributes = CaseInsensitiveDict() if conf_case_insensitive_attributes else dict()
     for attribute in attribute_list:
-        attributes[to_unicode(attribute[3][0][3], from_server=True)] = decode_raw_vals_fast(attribute[3][1][3])
+        attributes[decode_attribute_name(attribute[3][0][3], names)] = decode_raw_vals_fast(attribute[3][1][3])
 
     return attributes
 
@@ -448,12 +519,118 @@ def checked_attributes_to_dict_fast(attribute_list, schema=None, custom_formatte
     conf_case_insensitive_attributes = get_config_parameter('CASE_INSENSITIVE_ATTRIBUTE_NAMES')
 
     checked_attributes = CaseInsensitiveDict() if conf_case_insensitive_attributes else dict()
+    names = get_attribute_names(schema)
     for attribute in attribute_list:
-        name = to_unicode(attribute[3][0][3], from_server=True)
+        name = decode_attribute_name(attribute[3][0][3], names)
         checked_attributes[name] = format_attribute_values(schema, name, decode_raw_vals_fast(attribute[3][1][3]) or [], custom_formatter)
     return checked_attributes
 
 
+class _UndecodedValues(object):
+    """
+    BER values of an attribute not yet decoded
+    """
+    __slots__ = ('name', 'vals')
+
+    def __init__(self, name, vals):
+        self.name = name
+        self.vals = vals
+
+
+class LazyAttributesDict(MutableMapping):
+    """
+    Attributes of a search entry whose values are decoded only the first time they are read
+    The decoded value is cached and replaces the undecoded BER values
+    """
+
+    __slots__ = ('_decoder', '_store')
+
+    def __init__(self, decoder, case_insensitive=True):
+        self._decoder = decoder  # function(name, vals) that returns the decoded values
+        self._store = CaseInsensitiveDict() if case_insensitive else dict()
+
+    def set_undecoded(self, name, vals):
+        self._store[name] = _UndecodedValues(name, vals)
+
+    def _decode_all(self):
+        for key in self._store:
+            self[key]
+
+    def __getitem__(self, key):
+        value = self._store[key]
+        if type(value) is _UndecodedValues:
+            value = self._decoder(value.name, value.vals)
+            self._store[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._store[key] = value
+
+    def __delitem__(self, key):
+        del self._store[key]
+
+    def __contains__(self, key):
+        return key in self._store
+
+    def __iter__(self):
+        return iter(self._store)
+
+    def __len__(self):
+        return len(self._store)
+
+    def keys(self):
+        return self._store.keys()
+
+    def values(self):
+        self._decode_all()
+        return self._store.values()
+
+    def items(self):
+        self._decode_all()
+        return self._store.items()
+
+    def __eq__(self, other):
+        self._decode_all()
+        return self._store == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self._decode_all()
+        return repr(self._store)
+
+    def __str__(self):
+        self._decode_all()
+        return str(self._store)
+
+    def copy(self):
+        self._decode_all()
+        return self._store.copy()
+
+    def __reduce__(self):  # decoders are not pickable, copies and pickles get the decoded attributes
+        return self._store.__class__, (), None, None, iter(self.items())
+
+
+def lazy_attributes_to_dict_fast(attribute_list, schema=None, custom_formatter=None, check_names=True):
+    """
+    Returns the raw_attributes and attributes of an entry as LazyAttributesDict,
+    formatted values are computed from the raw values when the attribute is read
+    """
+    conf_case_insensitive_attributes = get_config_parameter('CASE_INSENSITIVE_ATTRIBUTE_NAMES')
+    raw_attributes = LazyAttributesDict(lambda name, vals: decode_raw_vals_fast(vals), conf_case_insensitive_attributes)
+    if check_names:
+        attributes = LazyAttributesDict(lambda name, vals: format_attribute_values(schema, name, raw_attributes[name] or [], custom_formatter), conf_case_insensitive_attributes)
+    else:
+        attributes = LazyAttributesDict(lambda name, vals: decode_vals_fast(vals), conf_case_insensitive_attributes)
+    names = get_attribute_names(schema)
+    for attribute in attribute_list:
+        name = decode_attribute_name(attribute[3][0][3], names)
+        raw_attributes.set_undecoded(name, attribute[3][1][3])
+        attributes.set_undecoded(name, attribute[3][1][3])
+    return raw_attributes, attributes
+
+
 def matching_rule_assertion_to_string(matching_rule_assertion):
     return str(matching_rule_assertion)
 
@@ -566,11 +743,14 @@ def search_result_entry_response_to_dict_fast(response, schema, custom_formatter
     entry_dict = dict()
     entry_dict['raw_dn'] = response[0][3]
     entry_dict['dn'] = to_unicode(response[0][3], from_server=True)
-    entry_dict['raw_attributes'] = raw_attributes_to_dict_fast(response[1][3])  # attributes
+    if get_config_parameter('LAZY_ATTRIBUTE_DECODING'):
+        entry_dict['raw_attributes'], entry_dict['attributes'] = lazy_attributes_to_dict_fast(response[1][3], schema, custom_formatter, check_names)
+        return entry_dict
+    entry_dict['raw_attributes'] = raw_attributes_to_dict_fast(response[1][3], get_attribute_names(schema))  # attributes
     if check_names:
         entry_dict['attributes'] = checked_attributes_to_dict_fast(response[1][3], schema, custom_formatter)  # attributes
     else:
-        entry_dict['attributes'] = attributes_to_dict_fast(response[1][3])  # attributes
+        entry_dict['attributes'] = attributes_to_dict_fast(response[1][3], get_attribute_names(schema))  # attributes
 
     return entry_dict
 
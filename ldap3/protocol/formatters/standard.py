@@ -193,13 +193,26 @@ def find_attribute_helpers(attr_type, name, custom_formatter):
     return formatter
 
 
-def format_attribute_values(schema, name, values, custom_formatter):
-    if not values:  # RFCs states that attributes must always have values, but a flaky server returns empty values too
-        return []
+def _get_attribute_helpers(schema, name, custom_helpers, resolve):
+    """
+    Returns the helpers resolved for the attribute name from the cache of the schema (invalidated when the schema is
+    read again from the server). Entries are keyed by the custom helpers identity and checked against the stored object
+    """
+    if not schema or not hasattr(schema, 'attribute_helpers_cache'):  # no schema, no cache
+        return resolve(schema, name, custom_helpers)
+    key = (resolve, name, id(custom_helpers))
+    try:
+        cached_custom_helpers, helpers = schema.attribute_helpers_cache[key]
+        if cached_custom_helpers is custom_helpers:
+            return helpers
+    except KeyError:
+        pass
+    helpers = resolve(schema, name, custom_helpers)
+    schema.attribute_helpers_cache[key] = (custom_helpers, helpers)
+    return helpers
 
-    if not isinstance(values, SEQUENCE_TYPES):
-        values = [values]
 
+def _resolve_attribute_formatter(schema, name, custom_formatter):
     if schema and schema.attribute_types and name in schema.attribute_types:
         attr_type = schema.attribute_types[name]
     else:
@@ -210,15 +223,10 @@ def format_attribute_values(schema, name, values, custom_formatter):
         formatter = attribute_helpers
     else:
         formatter = format_unicode if not attribute_helpers[0] else attribute_helpers[0]
-
-    formatted_values = [formatter(raw_value) for raw_value in values]  # executes formatter
-    if formatted_values:
-        return formatted_values[0] if (attr_type and attr_type.single_value) else formatted_values
-    else:  # RFCs states that attributes must always have values, but AD return empty values in DirSync
-        return []
+    return formatter, True if (attr_type and attr_type.single_value) else False
 
 
-def find_attribute_validator(schema, name, custom_validator):
+def _resolve_attribute_validator(schema, name, custom_validator):
     if schema and schema.attribute_types and name in schema.attribute_types:
         attr_type = schema.attribute_types[name]
     else:
@@ -236,3 +244,22 @@ def find_attribute_validator(schema, name, custom_validator):
         else:
             validator = attribute_helpers[1]
     return validator
+
+
+def format_attribute_values(schema, name, values, custom_formatter):
+    if not values:  # RFCs states that attributes must always have values, but a flaky server returns empty values too
+        return []
+
+    if not isinstance(values, SEQUENCE_TYPES):
+        values = [values]
+
+    formatter, single_value = _get_attribute_helpers(schema, name, custom_formatter, _resolve_attribute_formatter)
+    formatted_values = [formatter(raw_value) for raw_value in values]  # executes formatter
+    if formatted_values:
+        return formatted_values[0] if single_value else formatted_values
+    else:  # RFCs states that attributes must always have values, but AD return empty values in DirSync
+        return []
+
+
+def find_attribute_validator(schema, name, custom_validator):
+    return _get_attribute_helpers(schema, name, custom_validator, _resolve_attribute_validator)
@@ -26,6 +26,7 @@
 from os import linesep
 import re
 import json
+from threading import Lock
 
 from .oid import CLASS_ABSTRACT, CLASS_STRUCTURAL, CLASS_AUXILIARY, ATTRIBUTE_USER_APPLICATION, \
     ATTRIBUTE_DIRECTORY_OPERATION, ATTRIBUTE_DISTRIBUTED_OPERATION, ATTRIBUTE_DSA_OPERATION
@@ -290,34 +291,49 @@ class SchemaInfo(BaseServerInfo):
     as defined in RFC4512. Unknown attributes are stored in the "other" dict
     """
 
-    def __init__(self, schema_entry, attributes, raw_attributes):
+    def __init__(self, schema_entry, attributes, raw_attributes, lazy=None):
         BaseServerInfo.__init__(self, raw_attributes)
+        if lazy is None:
+            lazy = get_config_parameter('LAZY_SCHEMA_PARSING')
         self.schema_entry = schema_entry
         self.create_time_stamp = attributes.pop('createTimestamp', None)
         self.modify_time_stamp = attributes.pop('modifyTimestamp', None)
-        self.attribute_types = AttributeTypeInfo.from_definition(attributes.pop('attributeTypes', []))
-        self.object_classes = ObjectClassInfo.from_definition(attributes.pop('objectClasses', []))
-        self.matching_rules = MatchingRuleInfo.from_definition(attributes.pop('matchingRules', []))
-        self.matching_rule_uses = MatchingRuleUseInfo.from_definition(attributes.pop('matchingRuleUse', []))
-        self.dit_content_rules = DitContentRuleInfo.from_definition(attributes.pop('dITContentRules', []))
-        self.dit_structure_rules = DitStructureRuleInfo.from_definition(attributes.pop('dITStructureRules', []))
-        self.name_forms = NameFormInfo.from_definition(attributes.pop('nameForms', []))
-        self.ldap_syntaxes = LdapSyntaxInfo.from_definition(attributes.pop('ldapSyntaxes', []))
+        self.attribute_types = AttributeTypeInfo.from_definition(attributes.pop('attributeTypes', []), lazy)
+        self.object_classes = ObjectClassInfo.from_definition(attributes.pop('objectClasses', []), lazy)
+        self.matching_rules = MatchingRuleInfo.from_definition(attributes.pop('matchingRules', []), lazy)
+        self.matching_rule_uses = MatchingRuleUseInfo.from_definition(attributes.pop('matchingRuleUse', []), lazy)
+        self.dit_content_rules = DitContentRuleInfo.from_definition(attributes.pop('dITContentRules', []), lazy)
+        self.dit_structure_rules = DitStructureRuleInfo.from_definition(attributes.pop('dITStructureRules', []), lazy)
+        self.name_forms = NameFormInfo.from_definition(attributes.pop('nameForms', []), lazy)
+        self.ldap_syntaxes = LdapSyntaxInfo.from_definition(attributes.pop('ldapSyntaxes', []), lazy)
         self.other = attributes  # remaining schema definition attributes not in RFC4512
+        self.attribute_helpers_cache = dict()  # formatters and validators resolved for attribute names
+        self.attribute_names_cache = None  # raw attribute names -> attribute names, populated when first used
+        self.compiled_filters_cache = None  # compiled search filters, created when the first filter is compiled
 
         # links attributes to class objects
         if self.object_classes and self.attribute_types:
-            for object_class in self.object_classes:  # CaseInsensitiveDict return keys while iterating
-                for attribute in self.object_classes[object_class].must_contain:
-                    try:
-                        self.attribute_types[attribute].mandatory_in.append(object_class)
-                    except KeyError:
-                        pass
-                for attribute in self.object_classes[object_class].may_contain:
-                    try:
-                        self.attribute_types[attribute].optional_in.append(object_class)
-                    except KeyError:
-                        pass
+            if lazy:  # linked when the first attribute type is parsed
+                self.attribute_types.link_object_classes(self.object_classes)
+            else:
+                for object_class in self.object_classes:  # CaseInsensitiveDict return keys while iterating
+                    for attribute in self.object_classes[object_class].must_contain:
+                        try:
+                            self.attribute_types[attribute].mandatory_in.append(object_class)
+                        except KeyError:
+                            pass
+                    for attribute in self.object_classes[object_class].may_contain:
+                        try:
+                            self.attribute_types[attribute].optional_in.append(object_class)
+                        except KeyError:
+                            pass
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['attribute_helpers_cache'] = dict()  # helpers are resolved again when the schema is loaded
+        state['attribute_names_cache'] = None
+        state['compiled_filters_cache'] = None
+        return state
 
     def is_valid(self):
         if self.object_classes or self.attribute_types or self.matching_rules or self.matching_rule_uses or self.dit_content_rules or self.dit_structure_rules or self.name_forms or self.ldap_syntaxes:
@@ -425,118 +441,38 @@ class BaseObjectInfo(object):
         return r
 
     @classmethod
-    def from_definition(cls, definitions):
+    def from_definition(cls, definitions, lazy=False):
+        """
+        Returns a dict of the definitions by name (or oid if the definition has no name)
+        If lazy is True the definitions are only indexed by oid and name and are parsed when first looked up
+        """
         conf_case_insensitive_schema = get_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES')
         conf_ignore_malformed_schema = get_config_parameter('IGNORE_MALFORMED_SCHEMA')
 
-        ret_dict = CaseInsensitiveWithAliasDict() if conf_case_insensitive_schema else dict()
+        if lazy:
+            ret_dict = LazyCaseInsensitiveDefinitionsDict() if conf_case_insensitive_schema else LazyDefinitionsDict()
+        else:
+            ret_dict = CaseInsensitiveWithAliasDict() if conf_case_insensitive_schema else dict()
 
         if not definitions:
             return ret_dict
 
+        if cls not in _DEFINITION_KEYWORDS:
+            raise LDAPSchemaError('unknown schema definition class')
+
         for object_definition in definitions:
-            object_definition = to_unicode(object_definition.strip(), from_server=True)
-            if object_definition[0] == '(' and object_definition[-1] == ')':
-                if cls is MatchingRuleInfo:
-                    pattern = '| SYNTAX '
-                elif cls is ObjectClassInfo:
-                    pattern = '| SUP | ABSTRACT| STRUCTURAL| AUXILIARY| MUST | MAY '
-                elif cls is AttributeTypeInfo:
-                    pattern = '| SUP | EQUALITY | ORDERING | SUBSTR | SYNTAX | SINGLE-VALUE| COLLECTIVE| NO-USER-MODIFICATION| USAGE '
-                elif cls is MatchingRuleUseInfo:
-                    pattern = '| APPLIES '
-                elif cls is LdapSyntaxInfo:
-                    pattern = ''
-                elif cls is DitContentRuleInfo:
-                    pattern = '| AUX | MUST | MAY | NOT '
-                elif cls is DitStructureRuleInfo:
-                    pattern = '| FORM | SUP '
-                elif cls is NameFormInfo:
-                    pattern = '| OC | MUST | MAY '
-                else:
-                    raise LDAPSchemaError('unknown schema definition class')
-
-                splitted = re.split('( NAME | DESC | OBSOLETE| X-| E-' + pattern + ')', object_definition[1:-1])
-                values = splitted[::2]
-                separators = splitted[1::2]
-                separators.insert(0, 'OID')
-                defs = list(zip(separators, values))
-                object_def = cls()
-                for d in defs:
-                    key = d[0].strip()
-                    value = d[1].strip()
-                    if key == 'OID':
-                        object_def.oid = value
-                    elif key == 'NAME':
-                        object_def.name = quoted_string_to_list(value)
-                    elif key == 'DESC':
-                        object_def.description = value.strip("'")
-                    elif key == 'OBSOLETE':
-                        object_def.obsolete = True
-                    elif key == 'SYNTAX':
-                        object_def.syntax = oids_string_to_list(value)
-                    elif key == 'SUP':
-                        object_def.superior = oids_string_to_list(value)
-                    elif key == 'ABSTRACT':
-                        object_def.kind = CLASS_ABSTRACT
-                    elif key == 'STRUCTURAL':
-                        object_def.kind = CLASS_STRUCTURAL
-                    elif key == 'AUXILIARY':
-                        object_def.kind = CLASS_AUXILIARY
-                    elif key == 'MUST':
-                        object_def.must_contain = oids_string_to_list(value)
-                    elif key == 'MAY':
-                        object_def.may_contain = oids_string_to_list(value)
-                    elif key == 'EQUALITY':
-                        object_def.equality = oids_string_to_list(value)
-                    elif key == 'ORDERING':
-                        object_def.ordering = oids_string_to_list(value)
-                    elif key == 'SUBSTR':
-                        object_def.substr = oids_string_to_list(value)
-                    elif key == 'SINGLE-VALUE':
-                        object_def.single_value = True
-                    elif key == 'COLLECTIVE':
-                        object_def.collective = True
-                    elif key == 'NO-USER-MODIFICATION':
-                        object_def.no_user_modification = True
-                    elif key == 'USAGE':
-                        object_def.usage = attribute_usage_to_constant(value)
-                    elif key == 'APPLIES':
-                        object_def.apply_to = oids_string_to_list(value)
-                    elif key == 'AUX':
-                        object_def.auxiliary_classes = oids_string_to_list(value)
-                    elif key == 'FORM':
-                        object_def.name_form = oids_string_to_list(value)
-                    elif key == 'OC':
-                        object_def.object_class = oids_string_to_list(value)
-                    elif key == 'NOT':
-                        object_def.not_contains = oids_string_to_list(value)
-                    elif key == 'X-':
-                        if not object_def.extensions:
-                            object_def.extensions = []
-                        object_def.extensions.append(extension_to_tuple('X-' + value))
-                    elif key == 'E-':
-                        if not object_def.experimental:
-                            object_def.experimental = []
-                        object_def.experimental.append(extension_to_tuple('E-' + value))
-                    else:
+            if not isinstance(object_definition, str) or str is bytes:  # bytes from the server or Python 2 strings
+                object_definition = to_unicode(object_definition, from_server=True)
+            object_definition = object_definition.strip()
+            if object_definition and object_definition[0] == '(' and object_definition[-1] == ')':
+                object_def = _UnparsedDefinition.from_definition(cls, object_definition) if lazy else None
+                if object_def is None:
+                    object_def = cls.from_raw_definition(object_definition)
+                    if object_def is None:
                         if not conf_ignore_malformed_schema:
-                            raise LDAPSchemaError('malformed schema definition key:' + key + ' - use get_info=NONE in Server definition')
+                            raise LDAPSchemaError('malformed schema definition, use get_info=NONE in Server definition')
                         else:
-                            return CaseInsensitiveWithAliasDict() if conf_case_insensitive_schema else dict()
-                object_def.raw_definition = object_definition
-                if hasattr(object_def, 'syntax') and object_def.syntax and len(object_def.syntax) == 1:
-                    object_def.min_length = None
-                    if object_def.syntax[0].endswith('}'):
-                        try:
-                            object_def.min_length = int(object_def.syntax[0][object_def.syntax[0].index('{') + 1:-1])
-                            object_def.syntax[0] = object_def.syntax[0][:object_def.syntax[0].index('{')]
-                        except Exception:
-                            pass
-                    else:
-                        object_def.min_length = None
-                    object_def.syntax[0] = object_def.syntax[0].strip("'")
-                    object_def.syntax = object_def.syntax[0]
+                            return ret_dict.__class__()
                 if hasattr(object_def, 'name') and object_def.name:
                     if conf_case_insensitive_schema:
                         ret_dict[object_def.name[0]] = object_def
@@ -551,9 +487,197 @@ class BaseObjectInfo(object):
                 if not conf_ignore_malformed_schema:
                     raise LDAPSchemaError('malformed schema definition, use get_info=NONE in Server definition')
                 else:
-                    return CaseInsensitiveWithAliasDict() if conf_case_insensitive_schema else dict()
+                    return ret_dict.__class__()
         return ret_dict
 
+    @classmethod
+    def from_raw_definition(cls, object_definition):
+        """
+        Parses a single definition (with the enclosing parenthesis), returns None if the definition is malformed
+        """
+        object_def = cls.parse_definition(object_definition[1:-1])
+        if object_def is None:  # definitions not understood by the tokenizer are split on the keywords
+            object_def = cls.split_definition(object_definition[1:-1])
+            if object_def is None:
+                return None
+        object_def.raw_definition = object_definition
+        if hasattr(object_def, 'syntax') and object_def.syntax and len(object_def.syntax) == 1:
+            object_def.min_length = None
+            if object_def.syntax[0].endswith('}'):
+                try:
+                    object_def.min_length = int(object_def.syntax[0][object_def.syntax[0].index('{') + 1:-1])
+                    object_def.syntax[0] = object_def.syntax[0][:object_def.syntax[0].index('{')]
+                except Exception:
+                    pass
+            else:
+                object_def.min_length = None
+            object_def.syntax[0] = object_def.syntax[0].strip("'")
+            object_def.syntax = object_def.syntax[0]
+        return object_def
+
+    @classmethod
+    def parse_definition(cls, definition):
+        """
+        Parses the definition (without the enclosing parenthesis) in a single pass over its words
+        Returns None if the definition is not in the form expected by RFC4512, so it can be parsed as before
+        """
+        if '  ' in definition or '\t' in definition or '\n' in definition or '\r' in definition:  # values are rebuilt joining the words with a single space
+            return None
+        words = definition.split()
+        if not words or words[0][0] in _VALUE_DELIMITERS:  # the oid must be the first word
+            return None
+        keywords = _DEFINITION_KEYWORDS[cls]
+        values = {'oid': words[0]}
+        index = 1
+        last = len(words)
+        while index < last:
+            keyword = words[index]
+            index += 1
+            if keyword in keywords:
+                attribute, value_type = keywords[keyword]
+                if value_type is _FLAG:
+                    values[attribute] = _FLAG_VALUES[keyword]
+                    continue
+            elif keyword[:2] in _EXTENSION_PREFIXES:
+                attribute = 'extensions' if keyword[0] == 'X' else 'experimental'
+                value_type = _EXTENSION
+            else:
+                return None
+
+            # reads the value, a quoted string or a parenthesized list can span many words
+            if index == last:
+                if value_type is not _EXTENSION:
+                    return None
+                value = ''
+            else:
+                value = words[index]
+                closing = _VALUE_DELIMITERS.get(value[0])
+                if closing:
+                    if len(value) == 1 or value[-1] != closing:
+                        end = index + 1
+                        while end < last and words[end][-1] != closing:
+                            end += 1
+                        if end == last:  # unbalanced quote or parenthesis
+                            return None
+                        value = ' '.join(words[index:end + 1])
+                        index = end
+                    index += 1
+                elif value_type is _EXTENSION and (value in keywords or value[:2] in _EXTENSION_PREFIXES):  # extension without value
+                    value = ''
+                else:
+                    index += 1
+
+            if value_type is _OIDS:
+                if value[0] == '(':
+                    values[attribute] = [element.strip() for element in value[1:-1].split('$') if element.strip()]
+                else:
+                    values[attribute] = [value]
+            elif value_type is _NAMES:
+                values[attribute] = [value[1:-1].strip()] if value[0] == "'" and value.count("'") == 2 and value[1:-1].strip() else quoted_string_to_list(value)
+            elif value_type is _DESCRIPTION:
+                values[attribute] = value.strip("'")
+            elif value_type is _USAGE:
+                values[attribute] = attribute_usage_to_constant(value)
+            else:  # extension
+                if attribute not in values:
+                    values[attribute] = []
+                values[attribute].append((keyword, [value[1:-1].strip()] if value and value[0] == "'" and value.count("'") == 2 and value[1:-1].strip() else quoted_string_to_list(value)))
+        object_def = cls()
+        object_def.__dict__.update(values)
+        return object_def
+
+    @classmethod
+    def split_definition(cls, definition):
+        """
+        Parses the definition (without the enclosing parenthesis) splitting it on the keywords of the definition class
+        Returns None if the definition has an unknown keyword
+        """
+        if cls is MatchingRuleInfo:
+            pattern = '| SYNTAX '
+        elif cls is ObjectClassInfo:
+            pattern = '| SUP | ABSTRACT| STRUCTURAL| AUXILIARY| MUST | MAY '
+        elif cls is AttributeTypeInfo:
+            pattern = '| SUP | EQUALITY | ORDERING | SUBSTR | SYNTAX | SINGLE-VALUE| COLLECTIVE| NO-USER-MODIFICATION| USAGE '
+        elif cls is MatchingRuleUseInfo:
+            pattern = '| APPLIES '
+        elif cls is LdapSyntaxInfo:
+            pattern = ''
+        elif cls is DitContentRuleInfo:
+            pattern = '| AUX | MUST | MAY | NOT '
+        elif cls is DitStructureRuleInfo:
+            pattern = '| FORM | SUP '
+        elif cls is NameFormInfo:
+            pattern = '| OC | MUST | MAY '
+        else:
+            raise LDAPSchemaError('unknown schema definition class')
+
+        splitted = re.split('( NAME | DESC | OBSOLETE| X-| E-' + pattern + ')', definition)
+        values = splitted[::2]
+        separators = splitted[1::2]
+        separators.insert(0, 'OID')
+        defs = list(zip(separators, values))
+        object_def = cls()
+        for d in defs:
+            key = d[0].strip()
+            value = d[1].strip()
+            if key == 'OID':
+                object_def.oid = value
+            elif key == 'NAME':
+                object_def.name = quoted_string_to_list(value)
+            elif key == 'DESC':
+                object_def.description = value.strip("'")
+            elif key == 'OBSOLETE':
+                object_def.obsolete = True
+            elif key == 'SYNTAX':
+                object_def.syntax = oids_string_to_list(value)
+            elif key == 'SUP':
+                object_def.superior = oids_string_to_list(value)
+            elif key == 'ABSTRACT':
+                object_def.kind = CLASS_ABSTRACT
+            elif key == 'STRUCTURAL':
+                object_def.kind = CLASS_STRUCTURAL
+            elif key == 'AUXILIARY':
+                object_def.kind = CLASS_AUXILIARY
+            elif key == 'MUST':
+                object_def.must_contain = oids_string_to_list(value)
+            elif key == 'MAY':
+                object_def.may_contain = oids_string_to_list(value)
+            elif key == 'EQUALITY':
+                object_def.equality = oids_string_to_list(value)
+            elif key == 'ORDERING':
+                object_def.ordering = oids_string_to_list(value)
+            elif key == 'SUBSTR':
+                object_def.substr = oids_string_to_list(value)
+            elif key == 'SINGLE-VALUE':
+                object_def.single_value = True
+            elif key == 'COLLECTIVE':
+                object_def.collective = True
+            elif key == 'NO-USER-MODIFICATION':
+                object_def.no_user_modification = True
+            elif key == 'USAGE':
+                object_def.usage = attribute_usage_to_constant(value)
+            elif key == 'APPLIES':
+                object_def.apply_to = oids_string_to_list(value)
+            elif key == 'AUX':
+                object_def.auxiliary_classes = oids_string_to_list(value)
+            elif key == 'FORM':
+                object_def.name_form = oids_string_to_list(value)
+            elif key == 'OC':
+                object_def.object_class = oids_string_to_list(value)
+            elif key == 'NOT':
+                object_def.not_contains = oids_string_to_list(value)
+            elif key == 'X-':
+                if not object_def.extensions:
+                    object_def.extensions = []
+                object_def.extensions.append(extension_to_tuple('X-' + value))
+            elif key == 'E-':
+                if not object_def.experimental:
+                    object_def.experimental = []
+                object_def.experimental.append(extension_to_tuple('E-' + value))
+            else:
+                return None
+        return object_def
+
 
 class MatchingRuleInfo(BaseObjectInfo):
     """
@@ -848,3 +972,226 @@ class NameFormInfo(BaseObjectInfo):
         r += (linesep + '  Must contain: ' + list_to_string(self.must_contain)) if self.must_contain else ''
         r += (linesep + '  May contain: ' + list_to_string(self.may_contain)) if self.may_contain else ''
         return 'DIT content rule' + BaseObjectInfo.__repr__(self).replace('<__desc__>', r)
+
+
+# value types of the definition keywords
+_FLAG = 'flag'
+_OIDS = 'oids'
+_NAMES = 'names'
+_DESCRIPTION = 'description'
+_USAGE = 'usage'
+_EXTENSION = 'extension'
+
+_VALUE_DELIMITERS = {"'": "'", '(': ')'}  # opening and closing characters of values that can contain spaces
+_EXTENSION_PREFIXES = ('X-', 'E-')
+
+_FLAG_VALUES = {'OBSOLETE': True,
+                'ABSTRACT': CLASS_ABSTRACT,
+                'STRUCTURAL': CLASS_STRUCTURAL,
+                'AUXILIARY': CLASS_AUXILIARY,
+                'SINGLE-VALUE': True,
+                'COLLECTIVE': True,
+                'NO-USER-MODIFICATION': True}
+
+_COMMON_KEYWORDS = {'NAME': ('name', _NAMES),
+                    'DESC': ('description', _DESCRIPTION),
+                    'OBSOLETE': ('obsolete', _FLAG)}
+
+
+def _keywords(**keywords):
+    definition_keywords = dict(_COMMON_KEYWORDS)
+    for keyword in keywords:
+        definition_keywords[keyword.replace('_', '-')] = keywords[keyword]
+    return definition_keywords
+
+
+# keywords allowed in each definition class, with the attribute they set
+_DEFINITION_KEYWORDS = {MatchingRuleInfo: _keywords(SYNTAX=('syntax', _OIDS)),
+                        ObjectClassInfo: _keywords(SUP=('superior', _OIDS),
+                                                   ABSTRACT=('kind', _FLAG),
+                                                   STRUCTURAL=('kind', _FLAG),
+                                                   AUXILIARY=('kind', _FLAG),
+                                                   MUST=('must_contain', _OIDS),
+                                                   MAY=('may_contain', _OIDS)),
+                        AttributeTypeInfo: _keywords(SUP=('superior', _OIDS),
+                                                     EQUALITY=('equality', _OIDS),
+                                                     ORDERING=('ordering', _OIDS),
+                                                     SUBSTR=('substr', _OIDS),
+                                                     SYNTAX=('syntax', _OIDS),
+                                                     SINGLE_VALUE=('single_value', _FLAG),
+                                                     COLLECTIVE=('collective', _FLAG),
+                                                     NO_USER_MODIFICATION=('no_user_modification', _FLAG),
+                                                     USAGE=('usage', _USAGE)),
+                        MatchingRuleUseInfo: _keywords(APPLIES=('apply_to', _OIDS)),
+                        LdapSyntaxInfo: _keywords(),
+                        DitContentRuleInfo: _keywords(AUX=('auxiliary_classes', _OIDS),
+                                                      MUST=('must_contain', _OIDS),
+                                                      MAY=('may_contain', _OIDS),
+                                                      NOT=('not_contains', _OIDS)),
+                        DitStructureRuleInfo: _keywords(FORM=('name_form', _OIDS),
+                                                        SUP=('superior', _OIDS)),
+                        NameFormInfo: _keywords(OC=('object_class', _OIDS),
+                                                MUST=('must_contain', _OIDS),
+                                                MAY=('may_contain', _OIDS))}
+
+
+# oid and names of a definition, the names must follow the oid as in RFC4512
+_DEFINITION_INDEX = re.compile(r"\s*(\S+)(?:\s+NAME\s+(?:'([^'\s]+)'|\(\s*((?:'[^'\s]+'\s*)+)\))(?=\s|$))?")
+_linking_lock = Lock()
+
+
+class _UnparsedDefinition(object):
+    """
+    A definition indexed by oid and name only, parsed when first looked up in a lazy definitions dict
+    """
+    __slots__ = ('object_class', 'raw_definition', 'oid', 'name', 'parsed', 'mandatory_in', 'optional_in')
+
+    def __init__(self, object_class, raw_definition, oid, name):
+        self.object_class = object_class
+        self.raw_definition = raw_definition
+        self.oid = oid
+        self.name = name
+        self.parsed = None
+        self.mandatory_in = None  # object classes linked before the definition is parsed
+        self.optional_in = None
+
+    def __repr__(self):
+        return '<unparsed ' + self.object_class.__name__ + ' ' + self.raw_definition + '>'
+
+    @classmethod
+    def from_definition(cls, object_class, object_definition):
+        """
+        Returns None if the oid and the names can't be read without parsing the definition
+        """
+        match = _DEFINITION_INDEX.match(object_definition, 1, len(object_definition) - 1)
+        if not match:
+            return None
+        oid, name, names = match.groups()
+        if name:
+            names = [name]
+        elif names:
+            names = [name for name in names.split("'") if name.strip()]
+        elif 'NAME' in object_definition:  # names not following the oid
+            return None
+        return cls(object_class, object_definition, oid, names)
+
+    def parse(self):
+        if self.parsed is None:
+            object_def = self.object_class.from_raw_definition(self.raw_definition)
+            if object_def is None:
+                return None
+            if self.name:  # the names are the same objects returned by get_attribute_names()
+                object_def.name = self.name
+            if self.mandatory_in:
+                object_def.mandatory_in = self.mandatory_in
+            if self.optional_in:
+                object_def.optional_in = self.optional_in
+            self.parsed = object_def
+        return self.parsed
+
+
+class _LazyDefinitionsMixin(object):
+    """
+    Definitions are stored unparsed and parsed when first looked up, so only the definitions used are parsed
+    Iteration returns the keys without parsing, values() and items() parse all the definitions
+    """
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        self._linked_classes = None
+        super(_LazyDefinitionsMixin, self).__init__(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = super(_LazyDefinitionsMixin, self).__getitem__(key)
+        if value.__class__ is _UnparsedDefinition:
+            if self._linked_classes is not None:
+                self._link_object_classes()
+            object_def = value.parse()
+            if object_def is None:
+                if not get_config_parameter('IGNORE_MALFORMED_SCHEMA'):
+                    raise LDAPSchemaError('malformed schema definition, use get_info=NONE in Server definition')
+                del self[key]
+                raise KeyError(key)
+            super(_LazyDefinitionsMixin, self).__setitem__(key, object_def)
+            value = object_def
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        self.parse_all()
+        return super(_LazyDefinitionsMixin, self).values()
+
+    def items(self):
+        self.parse_all()
+        return super(_LazyDefinitionsMixin, self).items()
+
+    def copy(self):
+        self.parse_all()
+        return super(_LazyDefinitionsMixin, self).copy()
+
+    def __repr__(self):
+        self.parse_all()
+        return super(_LazyDefinitionsMixin, self).__repr__()
+
+    def __str__(self):
+        self.parse_all()
+        return super(_LazyDefinitionsMixin, self).__str__()
+
+    def parse_all(self):
+        for key in list(self.keys()):
+            try:
+                self[key]
+            except KeyError:  # malformed definition ignored
+                pass
+
+    def definitions(self):
+        """
+        Returns the definitions without parsing them, unparsed definitions have only the oid and name attributes
+        """
+        return super(_LazyDefinitionsMixin, self).values()
+
+    def link_object_classes(self, object_classes):
+        """
+        The attribute types are linked to the object classes that contain them when the first attribute type is parsed
+        """
+        self._linked_classes = object_classes
+
+    def _link_object_classes(self):
+        with _linking_lock:
+            object_classes = self._linked_classes
+            if object_classes is None:  # linked by another thread
+                return
+            for object_class in object_classes:  # CaseInsensitiveDict return keys while iterating
+                for attribute in object_classes[object_class].must_contain:
+                    try:
+                        attribute_type = super(_LazyDefinitionsMixin, self).__getitem__(attribute)
+                    except KeyError:
+                        continue
+                    if attribute_type.mandatory_in is None:
+                        attribute_type.mandatory_in = []
+                    attribute_type.mandatory_in.append(object_class)
+                for attribute in object_classes[object_class].may_contain:
+                    try:
+                        attribute_type = super(_LazyDefinitionsMixin, self).__getitem__(attribute)
+                    except KeyError:
+                        continue
+                    if attribute_type.optional_in is None:
+                        attribute_type.optional_in = []
+                    attribute_type.optional_in.append(object_class)
+            self._linked_classes = None
+
+
+class LazyDefinitionsDict(_LazyDefinitionsMixin, dict):
+    __slots__ = ('_linked_classes', )
+
+    def __reduce__(self):  # keeps the definitions unparsed when pickled
+        return self.__class__, (), (None, {'_linked_classes': self._linked_classes}), None, iter(dict.items(self))
+
+
+class LazyCaseInsensitiveDefinitionsDict(_LazyDefinitionsMixin, CaseInsensitiveWithAliasDict):
+    __slots__ = ('_linked_classes', )
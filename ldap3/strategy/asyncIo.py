@@ -0,0 +1,509 @@
+"""
+"""
+
+# Created on 2025.03.02
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import socket
+from select import select
+from time import monotonic
+
+try:
+    from ssl import SSLWantReadError, SSLWantWriteError
+    _WOULD_BLOCK = (BlockingIOError, InterruptedError, SSLWantReadError, SSLWantWriteError)
+except ImportError:
+    _WOULD_BLOCK = (BlockingIOError, InterruptedError)
+
+from .. import get_config_parameter, DIGEST_MD5, ENCRYPT, ANONYMOUS, SIMPLE
+from ..core.exceptions import LDAPSSLConfigurationError, LDAPStartTLSError, LDAPOperationResult, LDAPConfigurationError, \
+    LDAPSessionTerminatedByServerError, LDAPSocketReceiveError, LDAPSocketSendError, LDAPResponseTimeoutError, \
+    communication_exception_factory
+from ..core.results import RESULT_SUCCESS, RESULT_COMPARE_TRUE, RESULT_REFERRAL
+from ..strategy.base import BaseStrategy, ReceiveBuffer, RESPONSE_COMPLETE, SESSION_TERMINATED_BY_SERVER
+from ..operation.bind import bind_operation, bind_request_to_dict
+from ..protocol.rfc4511 import LDAPMessage
+from ..utils.log import log, log_enabled, format_ldap_message, ERROR, BASIC, PROTOCOL, NETWORK, EXTENDED
+from ..utils.asn1 import encode, decoder, decode_message_fast
+
+
+def _get_running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:  # Python < 3.7
+        loop = asyncio.get_event_loop()
+        return loop if loop.is_running() else None
+    except RuntimeError:  # no event loop running in this thread
+        return None
+
+
+# noinspection PyProtectedMember
+class AsyncIoStrategy(BaseStrategy):
+    """
+    This strategy is asynchronous and is driven by the asyncio event loop running in the calling thread
+    The socket is non blocking and is watched by the event loop, no thread is started for receiving data
+    Responses are framed with compute_ldap_message_size() and decoded with the fast decoder as soon as they are received
+    Operations are awaited with the coroutines of the strategy (connect, bind, search, add, modify, ...), each returning
+    a tuple (status, result, response, request) as the thread safe strategies do
+    Standard Connection methods send the request and return the messageId; get_response() can be used as in the ASYNC
+    strategy but it waits synchronously on the socket, blocking the event loop until the response is complete
+    Opening of the socket, multi-step binds (SASL and NTLM), StartTls, reading of server info and referrals are performed
+    in the default executor of the event loop: the socket is detached from the loop and the other coroutines wait for the
+    end of the blocking step before sending their requests or reading their responses
+    Signing and confidentiality layers are not available for this strategy
+    Response appear in strategy._responses dictionary
+    """
+
+    def __init__(self, ldap_connection):
+        BaseStrategy.__init__(self, ldap_connection)
+        self.sync = False
+        self.no_real_dsa = False
+        self.pooled = False
+        self.can_stream = False
+        self.socket_size = ldap_connection.socket_size or get_config_parameter('SOCKET_SIZE')
+        self.loop = None
+        self._responses = None
+        self._waiters = dict()
+        self._blocking_step = None  # future of the step running in the executor, if any
+        self._unprocessed = ReceiveBuffer(self.socket_size)
+        self._send_buffer = b''
+        self._exception = None
+
+    def open(self, reset_usage=True, read_server_info=True):
+        """
+        Open connection and set the socket in non blocking mode
+        The socket is watched by the event loop running in the current thread, if any
+        """
+        self._responses = dict()
+        BaseStrategy.open(self, reset_usage, read_server_info)
+
+        if read_server_info:
+            try:
+                self.connection.refresh_server_info()
+            except LDAPOperationResult:  # catch errors from server if raise_exception = True
+                self.connection.server._dsa_info = None
+                self.connection.server._schema_info = None
+
+    def _start_listen(self):
+        if not self.connection.listening and not self.connection.closed:
+            self.connection.socket.setblocking(False)
+            self._unprocessed.clear()
+            self._send_buffer = b''
+            self._exception = None
+            self.connection.listening = True
+            loop = _get_running_loop()
+            if loop:
+                self._attach(loop)
+
+    def _stop_listen(self):
+        if self._send_buffer and self.connection.socket:  # try to send pending data, i.e. the unbind request
+            try:
+                self.connection.socket.send(self._send_buffer)
+            except (OSError, socket.error):
+                pass
+            self._send_buffer = b''
+        self._detach()
+        self.connection.listening = False
+        self._wake_waiters()
+
+    def _attach(self, loop):
+        """
+        Register the socket in the event loop
+        """
+        if self.loop is not loop:
+            self._detach()
+            self.loop = loop
+            self.loop.add_reader(self.connection.socket.fileno(), self._on_readable)
+            if self._send_buffer:
+                self.loop.add_writer(self.connection.socket.fileno(), self._on_writable)
+            if log_enabled(NETWORK):
+                log(NETWORK, 'socket attached to event loop <%s> for <%s>', self.loop, self.connection)
+
+    def _detach(self):
+        """
+        Unregister the socket from the event loop
+        """
+        if self.loop:
+            if self.connection.socket:
+                try:
+                    self.loop.remove_reader(self.connection.socket.fileno())
+                    self.loop.remove_writer(self.connection.socket.fileno())
+                except (OSError, ValueError, RuntimeError):  # socket already closed or loop closed
+                    pass
+            self.loop = None
+
+    def _ensure_loop(self):
+        if self.connection.listening and not self._exception:
+            self._attach(_get_running_loop())
+
+    def _abort(self, exception):
+        """
+        Stop receiving from the socket and wake up all the coroutines waiting for a response, the exception is raised when
+        the response is requested
+        """
+        if self._exception is None:
+            self._exception = exception
+        self._detach()
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        if self._blocking_step:  # waiters are woken in the event loop thread at the end of the blocking step
+            return
+        waiters = self._waiters
+        self._waiters = dict()
+        for waiter in waiters.values():
+            if not waiter.done():
+                waiter.set_result(True)
+
+    def _on_readable(self):
+        """
+        Callback executed by the event loop when data is available on the socket
+        """
+        try:
+            self._read_ready()
+        except Exception as e:
+            if log_enabled(ERROR):
+                log(ERROR, '<%s> for <%s>', str(e), self.connection)
+            self._abort(e)
+
+    def _on_writable(self):
+        """
+        Callback executed by the event loop when the socket can accept data to send
+        """
+        try:
+            self._write_ready()
+        except Exception as e:
+            if log_enabled(ERROR):
+                log(ERROR, '<%s> for <%s>', str(e), self.connection)
+            self._abort(e)
+
+    def _read_ready(self):
+        """
+        Reads all the available data from the socket and process the complete messages
+        """
+        while self.connection.socket:
+            try:
+                received = self._unprocessed.receive(self.connection.socket, self.socket_size)
+            except _WOULD_BLOCK:
+                break
+            except (OSError, socket.error) as e:
+                self.connection.last_error = 'error receiving data: ' + str(e)
+                if log_enabled(ERROR):
+                    log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                raise communication_exception_factory(LDAPSocketReceiveError, type(e)(str(e)))(self.connection.last_error)
+            if not received:  # socket closed by server
+                self._abort(LDAPSessionTerminatedByServerError('session terminated by server'))
+                break
+        self._process_messages()
+
+    def _write_ready(self):
+        """
+        Sends as much pending data as the socket can accept without blocking
+        """
+        while self._send_buffer and self.connection.socket:
+            try:
+                sent = self.connection.socket.send(self._send_buffer)
+            except _WOULD_BLOCK:
+                break
+            except (OSError, socket.error) as e:
+                self.connection.last_error = 'socket sending error' + str(e)
+                if log_enabled(ERROR):
+                    log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                raise communication_exception_factory(LDAPSocketSendError, type(e)(str(e)))(self.connection.last_error)
+            self._send_buffer = self._send_buffer[sent:]
+
+        if self.loop and self.connection.socket:
+            if self._send_buffer:
+                self.loop.add_writer(self.connection.socket.fileno(), self._on_writable)
+            else:
+                self.loop.remove_writer(self.connection.socket.fileno())
+
+    def _process_messages(self):
+        """
+        Computes the length of the received messages and decodes them, messages are appended to strategy._responses
+        """
+        while self._unprocessed:
+            length = self._unprocessed.message_size()
+            if length == -1 or len(self._unprocessed) < length:
+                break
+            if self.connection.usage:
+                self.connection._usage.update_received_message(length)
+                if log_enabled(NETWORK):
+                    log(NETWORK, 'received %d bytes via <%s>', length, self.connection)
+            message = self._unprocessed.pop(length)
+            if self.connection.fast_decoder:
+                ldap_resp = decode_message_fast(message)
+                dict_response = self.decode_response_fast(ldap_resp)
+            else:
+                ldap_resp = decoder.decode(message, asn1Spec=LDAPMessage())[0]
+                dict_response = self.decode_response(ldap_resp)
+            message_id = int(ldap_resp['messageID'])
+            if log_enabled(NETWORK):
+                log(NETWORK, 'received 1 ldap message via <%s>', self.connection)
+            if log_enabled(EXTENDED):
+                log(EXTENDED, 'ldap message received via <%s>:%s', self.connection, format_ldap_message(ldap_resp, '<<'))
+            if dict_response['type'] == 'extendedResp' and (dict_response['responseName'] == '1.3.6.1.4.1.1466.20037' or hasattr(self.connection, '_awaiting_for_async_start_tls')):
+                if dict_response['result'] == 0:  # StartTls in progress
+                    if self.connection.server.tls:
+                        self.connection.socket.setblocking(True)  # the handshake is performed synchronously
+                        try:
+                            self.connection.server.tls._start_tls(self.connection)
+                        finally:
+                            self.connection.socket.setblocking(False)
+                    else:
+                        self.connection.last_error = 'no Tls object defined in Server'
+                        if log_enabled(ERROR):
+                            log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                        raise LDAPSSLConfigurationError(self.connection.last_error)
+                else:
+                    self.connection.last_error = 'asynchronous StartTls failed'
+                    if log_enabled(ERROR):
+                        log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                    raise LDAPStartTLSError(self.connection.last_error)
+                del self.connection._awaiting_for_async_start_tls
+            if message_id != 0:  # 0 is reserved for 'Unsolicited Notification' from server as per RFC4511 (paragraph 4.4)
+                if message_id in self._responses:
+                    self._responses[message_id].append(dict_response)
+                else:
+                    self._responses[message_id] = [dict_response]
+                if dict_response['type'] not in ['searchResEntry', 'searchResRef', 'intermediateResponse']:
+                    self._responses[message_id].append(RESPONSE_COMPLETE)
+                    if not self._blocking_step:  # else the message is received in the executor, waiter is resolved at the end of the step
+                        waiter = self._waiters.pop(message_id, None)
+                        if waiter and not waiter.done():
+                            waiter.set_result(True)
+            else:  # Unsolicited Notification
+                if dict_response['responseName'] == '1.3.6.1.4.1.1466.20036':  # Notice of Disconnection as per RFC4511 (paragraph 4.4.1)
+                    self._abort(LDAPSessionTerminatedByServerError('session terminated by server'))
+                else:
+                    self.connection.last_error = 'unknown unsolicited notification from server'
+                    if log_enabled(ERROR):
+                        log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                    self._abort(LDAPSocketReceiveError(self.connection.last_error))
+                break
+
+    def sending(self, ldap_message):
+        """
+        Encodes the message and sends it without blocking, data not accepted by the socket is sent when the socket is writable
+        """
+        if (self.connection.sasl_mechanism == DIGEST_MD5 and self.connection._digest_md5_kic or self.connection.session_security == ENCRYPT) and not self.connection.sasl_in_progress:
+            self.connection.last_error = 'signing and confidentiality layers are not available for the ASYNCIO strategy'
+            if log_enabled(ERROR):
+                log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+            raise LDAPConfigurationError(self.connection.last_error)
+        if log_enabled(NETWORK):
+            log(NETWORK, 'sending 1 ldap message for <%s>', self.connection)
+        encoded_message = encode(ldap_message)
+        self._send_buffer += encoded_message
+        self._write_ready()
+        if log_enabled(EXTENDED):
+            log(EXTENDED, 'ldap message sent via <%s>:%s', self.connection, format_ldap_message(ldap_message, '>>'))
+        if log_enabled(NETWORK):
+            log(NETWORK, 'sent %d bytes via <%s>', len(encoded_message), self.connection)
+        if self.connection.usage:
+            self.connection._usage.update_transmitted_message(self.connection.request, len(encoded_message))
+
+    def _response_complete(self, message_id):
+        return message_id in self._responses and self._responses[message_id][-1] == RESPONSE_COMPLETE
+
+    def _get_response(self, message_id, timeout):
+        """
+        Returns the response for message_id. If the response is not complete waits synchronously on the socket,
+        blocking the event loop, until the response is received or the timeout expires
+        """
+        if not self._response_complete(message_id) and not self._exception:
+            timeout_time = monotonic() + timeout
+            while not self._response_complete(message_id) and not self._exception and self.connection.socket:
+                remaining = timeout_time - monotonic()
+                if remaining <= 0:
+                    return None
+                readable, writable, _ = select([self.connection.socket], [self.connection.socket] if self._send_buffer else [], [], remaining)
+                if writable:
+                    self._write_ready()
+                if readable:
+                    self._read_ready()
+
+        if self._response_complete(message_id):
+            return self._responses.pop(message_id)
+        elif isinstance(self._exception, LDAPSessionTerminatedByServerError):
+            return SESSION_TERMINATED_BY_SERVER
+        elif self._exception:
+            raise self._exception
+        return None
+
+    def post_send_search(self, message_id):
+        """
+        Clears connection.response and returns messageId
+        """
+        self.connection.response = None
+        self.connection.request = None
+        self.connection.result = None
+        return message_id
+
+    def post_send_single_response(self, message_id):
+        """
+        Clears connection.response and returns messageId.
+        """
+        self.connection.response = None
+        self.connection.request = None
+        self.connection.result = None
+        return message_id
+
+    async def _run_blocking(self, function, *args):
+        """
+        Runs a blocking step of the connection (open, multi-step bind, StartTls, ...) in the default executor of the
+        event loop. The socket is detached from the event loop while the step is running
+        """
+        loop = _get_running_loop()
+        await self._wait_blocking_step()
+        self._blocking_step = loop.create_future()
+        self._detach()
+        try:
+            return await loop.run_in_executor(None, function, *args)
+        finally:
+            blocking_step = self._blocking_step
+            self._blocking_step = None
+            blocking_step.set_result(True)
+            self._ensure_loop()
+            self._resolve_waiters()
+
+    async def _wait_blocking_step(self):
+        while self._blocking_step:
+            await asyncio.shield(self._blocking_step)
+
+    def _resolve_waiters(self):
+        """
+        Wakes up the coroutines whose responses were received by a blocking step
+        """
+        for message_id in list(self._waiters):
+            if self._response_complete(message_id) or self._exception or not self.connection.listening:
+                waiter = self._waiters.pop(message_id)
+                if not waiter.done():
+                    waiter.set_result(True)
+
+    async def wait_for_response(self, message_id, timeout=None):
+        """
+        Awaits the response for message_id without blocking the event loop
+        Returns a tuple (response, result, request) as get_response() with get_request=True
+        """
+        if timeout is None:
+            timeout = get_config_parameter('RESPONSE_WAITING_TIMEOUT')
+        await self._wait_blocking_step()
+        self._ensure_loop()
+        if not self._response_complete(message_id) and not self._exception and self.connection.listening:
+            if message_id not in self._waiters:
+                self._waiters[message_id] = self.loop.create_future()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._waiters[message_id]), timeout)
+            except asyncio.TimeoutError:
+                self._waiters.pop(message_id, None)
+                if log_enabled(ERROR):
+                    log(ERROR, 'socket timeout, no response from server for <%s>', self.connection)
+                raise LDAPResponseTimeoutError('no response from server')
+            await self._wait_blocking_step()
+
+        if self.connection.auto_referrals and self._response_complete(message_id) and self._responses[message_id][-2]['result'] == RESULT_REFERRAL:
+            return await self._run_blocking(self.get_response, message_id, 0, True)  # referrals are followed with new connections
+        return self.get_response(message_id, 0, get_request=True)  # the response is already received, no wait on the socket
+
+    async def _operation(self, send, *args, success=RESULT_SUCCESS, **kwargs):
+        await self._wait_blocking_step()
+        response, result, request = await self.wait_for_response(send(*args, **kwargs))
+        if result['type'] == 'searchResDone':
+            status = True if len(response) > 0 else False
+        else:
+            status = True if result['result'] == success else False
+        return status, result, response, request
+
+    async def connect(self, read_server_info=True):
+        """
+        Opens the connection. The socket is connected in the default executor of the event loop
+        """
+        if not self.connection.closed:
+            self.close()
+        await self._run_blocking(self.connection.open, True, False)
+        if read_server_info:
+            await self._run_blocking(self.connection.refresh_server_info)
+        return not self.connection.closed
+
+    async def bind(self, read_server_info=True, controls=None):
+        """
+        Binds with the authentication method and the user defined in the connection
+        Multi-step binds (SASL and NTLM) are performed in the default executor of the event loop
+        """
+        if self.connection.authentication not in [ANONYMOUS, SIMPLE]:
+            return await self._run_blocking(self.connection.bind, read_server_info, controls), self.connection.result, None, None
+
+        if log_enabled(BASIC):
+            log(BASIC, 'start BIND operation via <%s>', self.connection)
+        self.connection.last_error = None
+        if self.connection.closed:  # try to open connection if closed
+            await self.connect(read_server_info=False)
+        request = bind_operation(self.connection.version,
+                                 self.connection.authentication,
+                                 self.connection.user,
+                                 '' if self.connection.authentication == ANONYMOUS else self.connection.password,
+                                 auto_encode=self.connection.auto_encode)
+        if log_enabled(PROTOCOL):
+            log(PROTOCOL, 'BIND request <%s> sent via <%s>', bind_request_to_dict(request), self.connection)
+        status, result, response, request = await self._operation(lambda: self.connection.post_send_single_response(self.connection.send('bindRequest', request, controls)))
+        self.connection.bound = status
+        if not self.connection.bound and result['description'] and not self.connection.last_error:
+            self.connection.last_error = result['description']
+        if read_server_info and self.connection.bound:
+            await self._run_blocking(self.connection.refresh_server_info)
+        self.connection._entries = []
+        if log_enabled(BASIC):
+            log(BASIC, 'done BIND operation, result <%s>', self.connection.bound)
+        return status, result, response, request
+
+    async def unbind(self, controls=None):
+        await self._wait_blocking_step()
+        self.connection.unbind(controls)
+        return True, None, None, None
+
+    async def search(self, *args, **kwargs):
+        return await self._operation(self.connection.search, *args, **kwargs)
+
+    async def add(self, *args, **kwargs):
+        return await self._operation(self.connection.add, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        return await self._operation(self.connection.delete, *args, **kwargs)
+
+    async def modify(self, *args, **kwargs):
+        return await self._operation(self.connection.modify, *args, **kwargs)
+
+    async def modify_dn(self, *args, **kwargs):
+        return await self._operation(self.connection.modify_dn, *args, **kwargs)
+
+    async def compare(self, *args, **kwargs):
+        return await self._operation(self.connection.compare, *args, success=RESULT_COMPARE_TRUE, **kwargs)
+
+    async def extended(self, *args, **kwargs):
+        return await self._operation(self.connection.extended, *args, **kwargs)
+
+    async def start_tls(self, read_server_info=True):
+        """
+        StartTls handshake is performed in the default executor of the event loop
+        """
+        return await self._run_blocking(self.connection.start_tls, read_server_info), self.connection.result, None, None
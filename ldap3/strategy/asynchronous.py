@@ -28,11 +28,10 @@ import socket
 
 from .. import get_config_parameter, DIGEST_MD5, ENCRYPT
 from ..core.exceptions import LDAPSSLConfigurationError, LDAPStartTLSError, LDAPOperationResult, LDAPSignatureVerificationFailedError, LDAPConfigurationError
-from ..strategy.base import BaseStrategy, RESPONSE_COMPLETE
+from ..strategy.base import BaseStrategy, ReceiveBuffer, RESPONSE_COMPLETE
 from ..protocol.rfc4511 import LDAPMessage
 from ..utils.log import log, log_enabled, format_ldap_message, ERROR, NETWORK, EXTENDED
 from ..utils.asn1 import decoder, decode_message_fast
-from ..protocol.sasl.digestMd5 import md5_hmac
 
 
 # noinspection PyProtectedMember
@@ -56,17 +55,18 @@ class AsyncStrategy(BaseStrategy):
         def __init__(self, ldap_connection):
             Thread.__init__(self)
             self.connection = ldap_connection
-            self.socket_size = get_config_parameter('SOCKET_SIZE')
+            self.socket_size = ldap_connection.socket_size or get_config_parameter('SOCKET_SIZE')
 
         def run(self):
             """
             Waits for data on socket, computes the length of the message and waits for enough bytes to decode the message
             Message are appended to strategy._responses
             """
-            unprocessed = b''
+            unprocessed = ReceiveBuffer(self.socket_size)
             get_more_data = True
             listen = True
             data = b''
+            received = 0
             sasl_total_bytes_recieved = 0
             sasl_received_data = b''  # used to verify the signature, typo GC
             sasl_next_packet = b''
@@ -76,8 +76,14 @@ class AsyncStrategy(BaseStrategy):
 
             while listen:
                 if get_more_data:
+                    sasl_layer = self.connection.sasl_mechanism == DIGEST_MD5 and self.connection._digest_md5_kis and not self.connection.sasl_in_progress
+                    received = 0
                     try:
-                        data = self.connection.socket.recv(self.socket_size)
+                        if sasl_layer:
+                            data = self.connection.socket.recv(self.socket_size)
+                            received = len(data)
+                        else:  # data is received directly in the buffer
+                            received = unprocessed.receive(self.connection.socket, self.socket_size)
                     except (OSError, socket.error, AttributeError):
                         if self.connection.receive_timeout:  # a receive timeout has been detected - keep kistening on the socket
                             continue
@@ -85,11 +91,11 @@ class AsyncStrategy(BaseStrategy):
                         if log_enabled(ERROR):
                             log(ERROR, '<%s> for <%s>', str(e), self.connection)
                         raise  # unexpected exception - re-raise
-                    if len(data) > 0:
+                    if received > 0:
                         # If we are using DIGEST-MD5 and LDAP signing is set : verify & remove the signature from the message
                         if self.connection._digest_md5_kcs_cipher or self.connection.session_security == ENCRYPT:
                             raise LDAPConfigurationError("Confidentiality layers are only available for synchronous strategies")
-                        if self.connection.sasl_mechanism == DIGEST_MD5 and self.connection._digest_md5_kis and not self.connection.sasl_in_progress:
+                        if sasl_layer:
                             data = sasl_next_packet + data
 
                             if sasl_received_data == b'' or sasl_next_packet:
@@ -113,18 +119,17 @@ class AsyncStrategy(BaseStrategy):
                                 sasl_signature = sasl_received_data[sasl_buffer_length - 10:]
                                 sasl_received_data = sasl_received_data[:sasl_buffer_length - 10]  # retrieve encoded_message
                                 kis = self.connection._digest_md5_kis  # renamed to lowercase GC
+                                from ..protocol.sasl.digestMd5 import md5_hmac  # SASL mechanisms are imported when used
                                 calculated_signature = bytes.fromhex(md5_hmac(kis, sasl_sec_num + sasl_received_data)[0:20])
                                 if sasl_signature != calculated_signature:
                                     raise LDAPSignatureVerificationFailedError("Signature verification failed for the recieved LDAP message number " + str(int.from_bytes(sasl_sec_num, 'big')) + ". Expected signature " + calculated_signature.hex() + " but got " + sasl_signature.hex() + ".")
                                 sasl_total_bytes_recieved = 0
-                                unprocessed += sasl_received_data
+                                unprocessed.append(sasl_received_data)
                                 sasl_received_data = b''
-                        else:
-                            unprocessed += data
                         data = b''
                     else:
                         listen = False
-                length = BaseStrategy.compute_ldap_message_size(unprocessed)
+                length = unprocessed.message_size()
                 if length == -1 or len(unprocessed) < length:
                     get_more_data = True
                 elif len(unprocessed) >= length:  # add message to message list
@@ -132,11 +137,12 @@ class AsyncStrategy(BaseStrategy):
                         self.connection._usage.update_received_message(length)
                         if log_enabled(NETWORK):
                             log(NETWORK, 'received %d bytes via <%s>', length, self.connection)
+                    message = unprocessed.pop(length)
                     if self.connection.fast_decoder:
-                        ldap_resp = decode_message_fast(unprocessed[:length])
+                        ldap_resp = decode_message_fast(message)
                         dict_response = self.connection.strategy.decode_response_fast(ldap_resp)
                     else:
-                        ldap_resp = decoder.decode(unprocessed[:length], asn1Spec=LDAPMessage())[0]
+                        ldap_resp = decoder.decode(message, asn1Spec=LDAPMessage())[0]
                         dict_response = self.connection.strategy.decode_response(ldap_resp)
                     message_id = int(ldap_resp['messageID'])
                     if log_enabled(NETWORK):
@@ -170,7 +176,6 @@ class AsyncStrategy(BaseStrategy):
 
                         if self.connection.strategy.can_stream:  # for AsyncStreamStrategy, used for PersistentSearch
                             self.connection.strategy.accumulate_stream(message_id, dict_response)
-                        unprocessed = unprocessed[length:]
                         get_more_data = False if unprocessed else True
                         listen = True if self.connection.listening or unprocessed else False
                     else:  # Unsolicited Notification
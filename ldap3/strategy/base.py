@@ -58,18 +58,84 @@ from ..operation.abandon import abandon_request_to_dict
 from ..core.tls import Tls
 from ..protocol.oid import Oids
 from ..protocol.rfc2696 import RealSearchControlValue
-from ..protocol.microsoft import DirSyncControlResponseValue
 from ..utils.log import log, log_enabled, ERROR, BASIC, PROTOCOL, NETWORK, EXTENDED, format_ldap_message
 from ..utils.asn1 import encode, decoder, ldap_result_to_dict_fast, decode_sequence
 from ..utils.conv import to_unicode
-from ..protocol.sasl.digestMd5 import md5_h, md5_hmac
-from ..protocol.sasl.kerberos import posix_gssapi_unavailable
 
 SESSION_TERMINATED_BY_SERVER = 'TERMINATED_BY_SERVER'
 TRANSACTION_ERROR = 'TRANSACTION_ERROR'
 RESPONSE_COMPLETE = 'RESPONSE_FROM_SERVER_COMPLETE'
 
 
+class ReceiveBuffer(object):
+    """
+    Receive buffer for LDAP messages. Data is read from the socket directly into a preallocated bytearray with recv_into()
+    and complete messages are extracted moving a read offset, so unprocessed data is not copied at each receive
+    """
+
+    def __init__(self, size):
+        self.buffer = bytearray(size)
+        self.start = 0  # offset of the first unprocessed byte
+        self.end = 0  # offset of the first free byte
+
+    def __len__(self):
+        return self.end - self.start
+
+    def _reserve(self, size):
+        """
+        Ensures that size bytes are available at the end of the buffer, moving unprocessed data at the beginning or growing the buffer
+        """
+        if len(self.buffer) - self.end < size:
+            if self.start:
+                self.buffer[:self.end - self.start] = self.buffer[self.start:self.end]
+                self.end -= self.start
+                self.start = 0
+            if len(self.buffer) - self.end < size:
+                self.buffer.extend(bytearray(max(size, len(self.buffer))))
+
+    def receive(self, sock, size):
+        """
+        Receives at most size bytes from the socket into the buffer
+        Returns the number of bytes received, 0 if the socket has been closed
+        """
+        self._reserve(size)
+        with memoryview(self.buffer) as view:
+            received = sock.recv_into(view[self.end:self.end + size], size)
+        self.end += received
+        return received
+
+    def append(self, data):
+        """
+        Appends data already received, i.e. after removing a SASL security layer
+        """
+        self._reserve(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def message_size(self):
+        """
+        Returns the size of the first unprocessed LDAP message or -1 if too few data have been received
+        """
+        with memoryview(self.buffer) as view:
+            return BaseStrategy.compute_ldap_message_size(view[self.start:self.end])
+
+    def pop(self, length):
+        """
+        Returns the first length unprocessed bytes and moves the read offset
+        """
+        with memoryview(self.buffer) as view:
+            message = bytes(view[self.start:self.start + length])
+        self.start += length
+        if self.start == self.end:  # all data processed, reuse the buffer from the beginning
+            self.start = 0
+            self.end = 0
+        return message
+
+    def clear(self):
+        self.start = 0
+        self.end = 0
+
+
 # noinspection PyProtectedMember
 class BaseStrategy(object):
     """
@@ -79,6 +145,7 @@ class BaseStrategy(object):
     def __init__(self, ldap_connection):
         self.connection = ldap_connection
         self._outstanding = None
+        self._pool_requests = dict()  # statistics of the requests sent to a server of a server pool
         self._referrals = []
         self.sync = None  # indicates a synchronous connection
         self.no_real_dsa = None  # indicates a connection to a fake LDAP server
@@ -184,6 +251,8 @@ class BaseStrategy(object):
         self.connection.tls_started = False
         self._outstanding = None
         self._referrals = []
+        for message_id in list(self._pool_requests):  # requests without a response
+            self._pool_request_completed(message_id, discard=True)
 
         if not self.connection.strategy.no_real_dsa:
             self.connection.server.current_address = None
@@ -280,6 +349,9 @@ class BaseStrategy(object):
                 _cleanup_socket()
                 raise communication_exception_factory(LDAPSocketOpenError, type(e)(str(e)))(self.connection.last_error)
 
+        if self.connection.tcp_keepalive and self.connection.socket.family != getattr(socket, 'AF_UNIX', None):
+            self._set_tcp_keepalive()
+
         if use_ssl:
             try:
                 self.connection.server.tls.wrap_socket(self.connection, do_handshake=True)
@@ -296,6 +368,31 @@ class BaseStrategy(object):
 
         self.connection.closed = False
 
+    def _set_tcp_keepalive(self):
+        """
+        Lets the operating system probe the idle connection, so a dead peer is detected and firewalls don't drop the connection
+        Probes start after tcp_keepalive seconds of inactivity and are sent every TCP_KEEPALIVE_INTERVAL seconds, after
+        TCP_KEEPALIVE_PROBES unanswered probes the connection is closed
+        """
+        idle = int(self.connection.tcp_keepalive)
+        interval = int(get_config_parameter('TCP_KEEPALIVE_INTERVAL'))
+        try:
+            self.connection.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux
+                self.connection.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+            elif hasattr(socket, 'TCP_KEEPALIVE'):  # macOS
+                self.connection.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle)
+            elif hasattr(socket, 'SIO_KEEPALIVE_VALS'):  # Windows
+                self.connection.socket.ioctl(socket.SIO_KEEPALIVE_VALS, (1, idle * 1000, interval * 1000))
+            if hasattr(socket, 'TCP_KEEPINTVL'):
+                self.connection.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+            if hasattr(socket, 'TCP_KEEPCNT'):
+                self.connection.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, int(get_config_parameter('TCP_KEEPALIVE_PROBES')))
+        except (socket.error, ValueError) as e:
+            self.connection.last_error = 'unable to set tcp keepalive for socket connection: ' + str(e)
+            if log_enabled(ERROR):
+                log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+
     def _close_socket(self):
         """
         Try to close a socket
@@ -343,6 +440,10 @@ class BaseStrategy(object):
             self.connection.request = BaseStrategy.decode_request(message_type, request, controls)
             self._outstanding[message_id] = self.connection.request
             self.sending(ldap_message)
+            if self.connection.server_pool and message_type not in ('unbindRequest', 'abandonRequest'):
+                pool_request = self.connection.server_pool.request_started(self.connection)
+                if pool_request:
+                    self._pool_requests[message_id] = pool_request
         else:
             self.connection.last_error = 'unable to send message, socket is not open'
             if log_enabled(ERROR):
@@ -413,6 +514,7 @@ class BaseStrategy(object):
                 if log_enabled(PROTOCOL):
                     log(PROTOCOL, 'operation result <%s> for <%s>', result, self.connection)
                 self._outstanding.pop(message_id)
+                self._pool_request_completed(message_id)
                 self.connection.result = result.copy()
                 raise LDAPOperationResult(result=result['result'], description=result['description'], dn=result['dn'], message=result['message'], response_type=result['type'])
 
@@ -459,6 +561,7 @@ class BaseStrategy(object):
                                     ...
 
             request = self._outstanding.pop(message_id)
+            self._pool_request_completed(message_id)
         else:
             if log_enabled(ERROR):
                 log(ERROR, 'message id not in outstanding queue for <%s>', self.connection)
@@ -469,6 +572,17 @@ class BaseStrategy(object):
         else:
             return response, result
 
+    def _pool_request_completed(self, message_id, discard=False):
+        """
+        Updates the statistics of the server in the server pool when the response of a request is received
+        """
+        pool_request = self._pool_requests.pop(message_id, None)
+        if pool_request:
+            if discard:
+                pool_request[0].request_discarded()
+            else:
+                pool_request[0].request_completed(pool_request[1])
+
     @staticmethod
     def compute_ldap_message_size(data):
         """
@@ -605,6 +719,7 @@ class BaseStrategy(object):
             control_value['size'] = int(control_resp['size'])
             control_value['cookie'] = bytes(control_resp['cookie'])
         elif control_type == '1.2.840.113556.1.4.841':  # DirSync AD
+            from ..protocol.microsoft import DirSyncControlResponseValue  # Microsoft controls are imported when used
             control_resp, unprocessed = decoder.decode(control_value, asn1Spec=DirSyncControlResponseValue())
             control_value = dict()
             control_value['more_results'] = bool(control_resp['MoreResults'])  # more_result if nonzero
@@ -795,6 +910,7 @@ class BaseStrategy(object):
                                                  raise_exceptions=self.connection.raise_exceptions,
                                                  fast_decoder=self.connection.fast_decoder,
                                                  receive_timeout=self.connection.receive_timeout,
+                                                 socket_size=self.connection.socket_size,
                                                  sasl_mechanism=self.connection.sasl_mechanism,
                                                  sasl_credentials=self.connection.sasl_credentials)
 
@@ -890,6 +1006,7 @@ class BaseStrategy(object):
                 # If we are using DIGEST-MD5 and LDAP signing is enabled: add a signature to the message
                 sec_num = self.connection._digest_md5_sec_num  # added underscore GC
                 kic = self.connection._digest_md5_kic  # lowercase GC
+                from ..protocol.sasl.digestMd5 import md5_hmac  # SASL mechanisms are imported when used
                 signature = bytes.fromhex(md5_hmac(kic, int(sec_num).to_bytes(4, 'big') + encoded_message)[0:20])
                 payload = encoded_message + signature
                 if self.connection._digest_md5_kcc_cipher:
@@ -905,6 +1022,7 @@ class BaseStrategy(object):
                     encoded_message = int(len(encoded_message)).to_bytes(4, 'big') + encoded_message
                 elif self.connection.sasl_mechanism == GSSAPI:
                     # winkerberos does not support GSS_WRAP_size_limit
+                    from ..protocol.sasl.kerberos import posix_gssapi_unavailable
                     if posix_gssapi_unavailable:
                         import winkerberos
                         winkerberos.authGSSClientWrap(self.connection.krb_ctx, base64.b64encode(encoded_message).decode('utf-8'), None, 1)
@@ -30,7 +30,7 @@ from random import SystemRandom
 
 from pyasn1.type.univ import OctetString
 
-from .. import SEQUENCE_TYPES, ALL_ATTRIBUTES
+from .. import SEQUENCE_TYPES, ALL_ATTRIBUTES, get_config_parameter
 from ..operation.bind import bind_request_to_dict
 from ..operation.delete import delete_request_to_dict
 from ..operation.add import add_request_to_dict
@@ -47,6 +47,7 @@ from ..core.results import RESULT_SUCCESS, RESULT_OPERATIONS_ERROR, RESULT_UNAVA
     RESULT_INVALID_CREDENTIALS, RESULT_NO_SUCH_OBJECT, RESULT_ENTRY_ALREADY_EXISTS, RESULT_COMPARE_TRUE, \
     RESULT_COMPARE_FALSE, RESULT_NO_SUCH_ATTRIBUTE, RESULT_UNWILLING_TO_PERFORM, RESULT_PROTOCOL_ERROR, RESULT_CONSTRAINT_VIOLATION, RESULT_NOT_ALLOWED_ON_RDN
 from ..utils.ciDict import CaseInsensitiveDict
+from ..utils.lruCache import LruCache
 from ..utils.dn import to_dn, safe_dn, safe_rdn
 from ..protocol.sasl.sasl import validate_simple_password
 from ..protocol.formatters.standard import find_attribute_validator, format_attribute_values
@@ -119,6 +120,15 @@ SEARCH_CONTROLS = ['1.2.840.113556.1.4.319'  # simple paged search [RFC 2696]
 SERVER_ENCODING = 'utf-8'
 
 
+def decode_value(value):
+    if isinstance(value, bytes):
+        try:
+            return value.decode(SERVER_ENCODING)
+        except UnicodeDecodeError:  # tries the additional encodings
+            pass
+    return to_unicode(value, SERVER_ENCODING)
+
+
 def random_cookie():
     return to_raw(SystemRandom().random())[-6:]
 
@@ -154,6 +164,159 @@ class PagedSearchSet(object):
         return response, result
 
 
+class DitIndex(object):
+    """
+    Indexes of the mock DIT: a parent -> children DN tree for scoped searches and per-attribute presence
+    and normalized equality indexes. DNs and attribute names are indexed case-insensitively, values are
+    normalized as in MockBaseStrategy._check_equality. update() must be called for each dn added, modified or removed
+    """
+
+    def __init__(self, dit):
+        self.dit = dit
+        self._entries = dict()  # lowercase dn -> (dn, indexed attributes, indexed (attribute, value) keys)
+        self._children = dict()  # lowercase parent dn -> set of lowercase children dn (both real and intermediate)
+        self._parents = dict()  # lowercase dn -> lowercase parent dn
+        self._presence = dict()  # attribute -> set of dn
+        self._equality = dict()  # attribute -> {normalized value -> set of dn}
+        for dn in dit:
+            self.update(dn)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def attribute_key(attribute):
+        return attribute.split(';')[0].strip().lower()  # same key of CaseInsensitiveDict
+
+    @staticmethod
+    def value_key(value):
+        try:
+            return decode_value(value).lower()
+        except UnicodeError:  # binary value, only exact matching
+            return value
+
+    @staticmethod
+    def _parent(ci_dn):
+        position = ci_dn.find(',')  # dn is already escaped by safe_dn(), the first unescaped comma ends the rdn
+        while position != -1:
+            if (position - len(ci_dn[:position].rstrip('\\'))) % 2 == 0:
+                return ci_dn[position + 1:]
+            position = ci_dn.find(',', position + 1)
+        return ''
+
+    def update(self, dn):
+        """
+        Refreshes the indexes of dn: the entry is reindexed if present in the DIT, else removed from the indexes
+        """
+        ci_dn = dn.lower()
+        previous = self._entries.pop(ci_dn, None)
+        if previous:
+            for attribute in previous[1]:
+                self._presence[attribute].discard(previous[0])
+                if not self._presence[attribute]:
+                    del self._presence[attribute]
+            for attribute, key in previous[2]:
+                dns = self._equality[attribute][key]
+                dns.discard(previous[0])
+                if not dns:
+                    del self._equality[attribute][key]
+                    if not self._equality[attribute]:
+                        del self._equality[attribute]
+
+        if dn in self.dit:
+            name = previous[0] if previous else dn  # the DIT keeps the original case of the dn
+            attributes = []
+            keys = set()
+            for attribute, values in self.dit[dn].items():
+                attribute = self.attribute_key(attribute)
+                attributes.append(attribute)
+                self._presence.setdefault(attribute, set()).add(name)
+                if not isinstance(values, SEQUENCE_TYPES):
+                    values = [values]
+                for value in values:
+                    key = self.value_key(value)
+                    if (attribute, key) not in keys:
+                        keys.add((attribute, key))
+                        self._equality.setdefault(attribute, dict()).setdefault(key, set()).add(name)
+            self._entries[ci_dn] = (name, attributes, keys)
+            if not previous:
+                self._link(ci_dn)
+        elif previous:
+            self._unlink(ci_dn)
+
+    def _link(self, ci_dn):
+        while ci_dn and ci_dn not in self._parents:  # adds intermediate nodes missing in the DIT up to the root
+            parent = self._parent(ci_dn)
+            self._parents[ci_dn] = parent
+            self._children.setdefault(parent, set()).add(ci_dn)
+            ci_dn = parent
+
+    def _unlink(self, ci_dn):
+        while ci_dn and ci_dn not in self._entries and not self._children.get(ci_dn):  # removes unused intermediate nodes
+            self._children.pop(ci_dn, None)
+            parent = self._parents.pop(ci_dn)
+            self._children[parent].discard(ci_dn)
+            ci_dn = parent
+
+    def exists(self, base, scope):
+        """
+        Checks if the search base is in the DIT, an intermediate dn with entries below is valid for non base searches
+        """
+        ci_base = base.lower()
+        if ci_base in self._entries:
+            return True
+        if scope == 0:
+            return False
+        return True if self._children.get(ci_base) else False
+
+    def in_scope(self, dn, base, scope):
+        ci_dn = dn.lower()
+        ci_base = base.lower()
+        if scope == 0:  # base object
+            return ci_dn == ci_base
+        elif scope == 1:  # single level
+            return self._parents.get(ci_dn) == ci_base
+        while ci_dn != ci_base:  # whole subtree, walks up to the root
+            if not ci_dn:
+                return False
+            ci_dn = self._parents.get(ci_dn, '')
+        return True
+
+    def scope(self, base, scope):
+        """
+        Returns the dn of the entries in the scope of the search base
+        """
+        ci_base = base.lower()
+        candidates = []
+        if scope == 0:  # base object
+            if ci_base in self._entries:
+                candidates.append(self._entries[ci_base][0])
+        elif scope == 1:  # single level
+            for child in self._children.get(ci_base, ()):
+                if child in self._entries:
+                    candidates.append(self._entries[child][0])
+        elif scope == 2:  # whole subtree
+            nodes = [ci_base]
+            while nodes:
+                node = nodes.pop()
+                if node in self._entries:
+                    candidates.append(self._entries[node][0])
+                nodes.extend(self._children.get(node, ()))
+        return candidates
+
+    def present(self, attribute):
+        return self._presence.get(self.attribute_key(attribute), set())
+
+    def equal(self, attribute, values):
+        values_index = self._equality.get(self.attribute_key(attribute), dict())
+        matched = set()
+        for value in values:
+            key = self.value_key(value)
+            if key in values_index:
+                matched.update(values_index[key])
+        return matched
+
+
 class MockBaseStrategy(object):
     """
     Base class for connection strategy
@@ -169,9 +332,15 @@ class MockBaseStrategy(object):
         self.operational_attributes = ['entryDN']
         self.add_entry('cn=schema', [], validate=False)  # add default entry for schema
         self._paged_sets = []  # list of paged search in progress
+        self._filter_cache = LruCache(get_config_parameter('MOCK_FILTER_CACHE_SIZE'))
         if log_enabled(BASIC):
             log(BASIC, 'instantiated <%s>: <%s>', self.__class__.__name__, self)
 
+    def _get_dit_index(self):
+        if getattr(self.connection.server, 'dit_index', None) is None or self.connection.server.dit_index.dit is not self.connection.server.dit:  # rebuilds index if DIT has been replaced
+            self.connection.server.dit_index = DitIndex(self.connection.server.dit)
+        return self.connection.server.dit_index
+
     def _start_listen(self):
         self.connection.listening = True
         self.connection.closed = False
@@ -248,6 +417,7 @@ class MockBaseStrategy(object):
                             new_entry[rdn[0]].append(raw_rdn)
                 new_entry['entryDN'] = [to_raw(escaped_dn)]
                 self.connection.server.dit[escaped_dn] = new_entry
+                self._get_dit_index().update(escaped_dn)
                 return True
             return False
 
@@ -256,6 +426,7 @@ class MockBaseStrategy(object):
             escaped_dn = safe_dn(dn)
             if escaped_dn in self.connection.server.dit:
                 del self.connection.server.dit[escaped_dn]
+                self._get_dit_index().update(escaped_dn)
                 return True
             return False
 
@@ -351,6 +522,7 @@ class MockBaseStrategy(object):
         dn = safe_dn(request['entry'])
         if dn in self.connection.server.dit:
             del self.connection.server.dit[dn]
+            self._get_dit_index().update(dn)
             result_code = RESULT_SUCCESS
             message = ''
         else:
@@ -455,6 +627,8 @@ class MockBaseStrategy(object):
                 result_code = RESULT_SUCCESS
                 message = 'entry moved'
                 moved_entry['entryDN'] = [to_raw(new_dn)]
+                self._get_dit_index().update(dn)
+                self._get_dit_index().update(new_dn)
             elif new_rdn and not new_superior:  # performs rename
                 new_dn = safe_dn(new_rdn + ',' + safe_dn(dn_components[1:]))
                 self.connection.server.dit[new_dn] = self.connection.server.dit[dn].copy()
@@ -464,6 +638,8 @@ class MockBaseStrategy(object):
 
                 for rdn in safe_rdn(new_dn, decompose=True):  # adds rdns to entry attributes
                     renamed_entry[rdn[0]] = [to_raw(rdn[1])]
+                self._get_dit_index().update(dn)
+                self._get_dit_index().update(new_dn)
 
                 result_code = RESULT_SUCCESS
                 message = 'entry rdn renamed'
@@ -576,6 +752,7 @@ class MockBaseStrategy(object):
 
             if result_code:  # an error has happened, restores the original dn
                 self.connection.server.dit[dn] = original_entry
+            self._get_dit_index().update(dn)
         else:
             result_code = RESULT_NO_SUCH_OBJECT
             message = 'object not found'
@@ -673,25 +850,18 @@ class MockBaseStrategy(object):
 
         attributes = [attr.lower() for attr in request['attributes']]
 
-        filter_root = parse_filter(request['filter'], self.connection.server.schema, auto_escape=True, auto_encode=False, validator=self.connection.server.custom_validator, check_names=self.connection.check_names)
-        candidates = []
-        if scope == 0:  # base object
-            if base in self.connection.server.dit or base.lower() == 'cn=schema':
-                candidates.append(base)
-        elif scope == 1:  # single level
-            for entry in self.connection.server.dit:
-                if entry.lower().endswith(base.lower()) and ',' not in entry[:-len(base) - 1]:  # only leafs without commas in the remaining dn
-                    candidates.append(entry)
-        elif scope == 2:  # whole subtree
-            for entry in self.connection.server.dit:
-                if entry.lower().endswith(base.lower()):
-                    candidates.append(entry)
-
-        if not candidates:  # incorrect base
+        filter_root, predicate = self.compile_filter(request['filter'])
+        dit_index = self._get_dit_index()
+        if not dit_index.exists(base, scope):  # incorrect base
             result_code = RESULT_NO_SUCH_OBJECT
             message = 'incorrect base object'
         else:
-            matched = self.evaluate_filter_node(filter_root, candidates)
+            candidates = self._index_candidates(filter_root) if scope == 2 else None  # base and single level scopes are already narrow
+            if candidates is None:  # filter can't be resolved with the indexes
+                candidates = dit_index.scope(base, scope)
+            else:
+                candidates = [candidate for candidate in candidates if dit_index.in_scope(candidate, base, scope)]
+            matched = [candidate for candidate in candidates if predicate(self.connection.server.dit[candidate]) is True]
             if self.connection.raise_exceptions and 0 < request['sizeLimit'] < len(matched):
                 result_code = 4
                 message = 'size limit exceeded'
@@ -765,66 +935,111 @@ class MockBaseStrategy(object):
                 'responseValue': response_value
                 }
 
-    def evaluate_filter_node(self, node, candidates):
-        """After evaluation each 2 sets are added to each MATCH node, one for the matched object and one for unmatched object.
-        The unmatched object set is needed if a superior node is a NOT that reverts the evaluation. The BOOLEAN nodes mix the sets
-        returned by the MATCH nodes"""
-        node.matched = set()
-        node.unmatched = set()
+    def _equality_values(self, attr_name, attr_value):
+        values = [ldap_escape_to_bytes(attr_value)]  # same values checked by equal()
+        try:
+            values.append(self._prepare_value(attr_name, attr_value))
+        except LDAPInvalidValueError:  # value not valid for the attribute syntax, only the escaped value can match
+            pass
+        return values
 
-        if node.elements:
+    def _index_candidates(self, node):
+        """Returns a superset of the entries matched by the filter node using the DIT indexes,
+        None if the node can't be resolved by the indexes (so all the entries in the search scope are candidates)"""
+        if node.tag == ROOT:
+            return self._index_candidates(node.elements[0])
+        elif node.tag == AND:
+            candidates = None
             for element in node.elements:
-                self.evaluate_filter_node(element, candidates)
-
+                element_candidates = self._index_candidates(element)
+                if element_candidates is not None and (candidates is None or len(element_candidates) < len(candidates)):
+                    candidates = element_candidates
+            return candidates
+        elif node.tag == OR:
+            candidates = set()
+            for element in node.elements:
+                element_candidates = self._index_candidates(element)
+                if element_candidates is None:
+                    return None
+                candidates.update(element_candidates)
+            return candidates
+        elif node.tag == MATCH_PRESENT:
+            return self._get_dit_index().present(node.assertion['attr'])
+        elif node.tag == MATCH_EQUAL or node.tag == MATCH_APPROX:
+            return self._get_dit_index().equal(node.assertion['attr'], node.values if hasattr(node, 'values') else self._equality_values(node.assertion['attr'], node.assertion['value']))
+        return None
+
+    def compile_filter(self, search_filter):
+        """Parses the filter string and compiles it to a predicate. Compiled filters are kept in a LRU cache,
+        returns the filter tree (used for the index lookup) and the predicate"""
+        key = (search_filter, self.connection.check_names)
+        compiled = self._filter_cache.get(key)
+        if compiled is None:
+            filter_root = parse_filter(search_filter, self.connection.server.schema, auto_escape=True, auto_encode=False, validator=self.connection.server.custom_validator, check_names=self.connection.check_names)
+            compiled = (filter_root, self._compile_filter_node(filter_root))
+            self._filter_cache.set(key, compiled)
+        return compiled
+
+    def _compile_filter_node(self, node):
+        """Returns a function that evaluates the filter node against an entry with the three-valued logic of RFC 4511:
+        True, False or None (Undefined). AND and OR stop at the first False or True element"""
         if node.tag == ROOT:
-            return node.elements[0].matched
+            return self._compile_filter_node(node.elements[0])
         elif node.tag == AND:
-            first_element = node.elements[0]
-            node.matched.update(first_element.matched)
-            node.unmatched.update(first_element.unmatched)
+            predicates = [self._compile_filter_node(element) for element in node.elements]
 
-            for element in node.elements[1:]:
-                node.matched.intersection_update(element.matched)
-                node.unmatched.intersection_update(element.unmatched)
+            def evaluate_and(entry):
+                evaluation = True
+                for predicate in predicates:
+                    element_evaluation = predicate(entry)
+                    if element_evaluation is False:
+                        return False
+                    if element_evaluation is None:
+                        evaluation = None
+                return evaluation
+            return evaluate_and
         elif node.tag == OR:
-            for element in node.elements:
-                node.matched.update(element.matched)
-                node.unmatched.update(element.unmatched)
+            predicates = [self._compile_filter_node(element) for element in node.elements]
+
+            def evaluate_or(entry):
+                evaluation = False
+                for predicate in predicates:
+                    element_evaluation = predicate(entry)
+                    if element_evaluation is True:
+                        return True
+                    if element_evaluation is None:
+                        evaluation = None
+                return evaluation
+            return evaluate_or
         elif node.tag == NOT:
-            node.matched = node.elements[0].unmatched
-            node.unmatched = node.elements[0].matched
-        elif node.tag == MATCH_GREATER_OR_EQUAL:
-            attr_name = node.assertion['attr']
-            attr_value = node.assertion['value']
-            for candidate in candidates:
-                if attr_name in self.connection.server.dit[candidate]:
-                    for value in self.connection.server.dit[candidate][attr_name]:
-                        if value.isdigit() and attr_value.isdigit():  # int comparison
-                            if int(value) >= int(attr_value):
-                                node.matched.add(candidate)
-                            else:
-                                node.unmatched.add(candidate)
-                        else:
-                            if to_unicode(value, SERVER_ENCODING).lower() >= to_unicode(attr_value, SERVER_ENCODING).lower():  # case insensitive string comparison
-                                node.matched.add(candidate)
-                            else:
-                                node.unmatched.add(candidate)
-        elif node.tag == MATCH_LESS_OR_EQUAL:
+            predicate = self._compile_filter_node(node.elements[0])
+
+            def evaluate_not(entry):
+                evaluation = predicate(entry)
+                return None if evaluation is None else not evaluation
+            return evaluate_not
+        elif node.tag == MATCH_GREATER_OR_EQUAL or node.tag == MATCH_LESS_OR_EQUAL:
             attr_name = node.assertion['attr']
             attr_value = node.assertion['value']
-            for candidate in candidates:
-                if attr_name in self.connection.server.dit[candidate]:
-                    for value in self.connection.server.dit[candidate][attr_name]:
-                        if value.isdigit() and attr_value.isdigit():  # int comparison
-                            if int(value) <= int(attr_value):
-                                node.matched.add(candidate)
-                            else:
-                                node.unmatched.add(candidate)
-                        else:
-                            if to_unicode(value, SERVER_ENCODING).lower() <= to_unicode(attr_value, SERVER_ENCODING).lower():  # case insentive string comparison
-                                node.matched.add(candidate)
-                            else:
-                                node.unmatched.add(candidate)
+            int_value = int(attr_value) if attr_value.isdigit() else None
+            unicode_value = to_unicode(attr_value, SERVER_ENCODING).lower()
+            greater = node.tag == MATCH_GREATER_OR_EQUAL
+
+            def evaluate_ordering(entry):
+                try:
+                    values = entry[attr_name]
+                except KeyError:  # ordering of a missing attribute is undefined
+                    return None
+                for value in values:
+                    if int_value is not None and value.isdigit():  # int comparison
+                        if (int(value) >= int_value) if greater else (int(value) <= int_value):
+                            return True
+                    else:
+                        value = decode_value(value).lower()  # case insensitive string comparison
+                        if (value >= unicode_value) if greater else (value <= unicode_value):
+                            return True
+                return False
+            return evaluate_ordering
         elif node.tag == MATCH_EXTENSIBLE:
             self.connection.last_error = 'Extensible match not allowed in Mock strategy'
             if log_enabled(ERROR):
@@ -832,11 +1047,7 @@ class MockBaseStrategy(object):
             raise LDAPDefinitionError(self.connection.last_error)
         elif node.tag == MATCH_PRESENT:
             attr_name = node.assertion['attr']
-            for candidate in candidates:
-                if attr_name in self.connection.server.dit[candidate]:
-                    node.matched.add(candidate)
-                else:
-                    node.unmatched.add(candidate)
+            return lambda entry: attr_name in entry
         elif node.tag == MATCH_SUBSTRING:
             attr_name = node.assertion['attr']
             # rebuild the original substring filter
@@ -856,23 +1067,39 @@ class MockBaseStrategy(object):
                 substring_filter += '.*'
 
             regex_filter = re.compile(substring_filter, flags=re.UNICODE | re.IGNORECASE)  # unicode AND ignorecase
-            for candidate in candidates:
-                if attr_name in self.connection.server.dit[candidate]:
-                    for value in self.connection.server.dit[candidate][attr_name]:
-                        if regex_filter.match(to_unicode(value, SERVER_ENCODING)):
-                            node.matched.add(candidate)
-                        else:
-                            node.unmatched.add(candidate)
-                else:
-                    node.unmatched.add(candidate)
+
+            def evaluate_substring(entry):
+                try:
+                    values = entry[attr_name]
+                except KeyError:
+                    return False
+                for value in values:
+                    if regex_filter.match(decode_value(value)):
+                        return True
+                return False
+            return evaluate_substring
         elif node.tag == MATCH_EQUAL or node.tag == MATCH_APPROX:
             attr_name = node.assertion['attr']
-            attr_value = node.assertion['value']
-            for candidate in candidates:
-                if attr_name in self.connection.server.dit[candidate] and self.equal(candidate, attr_name, attr_value):
-                    node.matched.add(candidate)
-                else:
-                    node.unmatched.add(candidate)
+            node.values = self._equality_values(attr_name, node.assertion['value'])  # used by the index lookup
+            keys = set(DitIndex.value_key(value) for value in node.values)
+
+            def evaluate_equality(entry):
+                try:
+                    values = entry[attr_name]
+                except KeyError:
+                    return False
+                if not isinstance(values, SEQUENCE_TYPES):
+                    values = [values]
+                for value in values:
+                    if DitIndex.value_key(value) in keys:
+                        return True
+                return False
+            return evaluate_equality
+
+    def evaluate_filter_node(self, node, candidates):
+        """Returns the set of candidates (dn of entries in the DIT) matched by the filter node"""
+        predicate = self._compile_filter_node(node)
+        return set(candidate for candidate in candidates if predicate(self.connection.server.dit[candidate]) is True)
 
     def equal(self, dn, attribute_type, value_to_check):
         # value is the value to match
@@ -25,8 +25,9 @@
 
 from datetime import datetime
 from os import linesep
-from threading import Thread, Lock
-from time import sleep
+from threading import Thread, Lock, Event
+from select import select
+import socket
 
 from .. import RESTARTABLE, get_config_parameter, AUTO_BIND_DEFAULT, AUTO_BIND_NONE, AUTO_BIND_NO_TLS, AUTO_BIND_TLS_AFTER_BIND, AUTO_BIND_TLS_BEFORE_BIND
 from .base import BaseStrategy
@@ -43,10 +44,15 @@ BOGUS_EXTENDED = -3
 BOGUS_ABANDON = -4
 
 try:
-    from queue import Queue, Empty
+    from queue import Queue
 except ImportError:  # Python 2
     # noinspection PyUnresolvedReferences
-    from Queue import Queue, Empty
+    from Queue import Queue
+
+try:
+    from time import monotonic  # Python 3
+except ImportError:
+    from time import time as monotonic  # Python 2
 
 
 # noinspection PyProtectedMember
@@ -81,6 +87,11 @@ class ReusableStrategy(BaseStrategy):
     class ConnectionPool(object):
         """
         Container for the Connection Threads
+        The pool starts with pool_size workers and grows up to pool_max_size workers when requests are waiting in the queue
+        and no worker is available. Workers idle for more than REUSABLE_THREADED_IDLE_TIMEOUT seconds are terminated until
+        the pool shrinks to pool_min_size workers. A maintenance thread renews the connections of the workers when their
+        lifetime expires, so connections are not recreated while executing a request. The maintenance thread is started only
+        for elastic pools and pools with keepalive, in fixed size pools the workers renew their expired connections
         """
         def __new__(cls, connection):
             if connection.pool_name in ReusableStrategy.pools:  # returns existing connection pool
@@ -92,9 +103,14 @@ class ReusableStrategy(BaseStrategy):
                     pool.keepalive = connection.pool_keepalive
                 if connection.pool_lifetime and pool.lifetime != connection.pool_lifetime:  # change keepalive
                     pool.lifetime = connection.pool_lifetime
-                if connection.pool_size and pool.pool_size != connection.pool_size:  # if pool size has changed terminate and recreate the connections
-                    pool.terminate_pool()
-                    pool.pool_size = connection.pool_size
+                if connection.pool_size or connection.pool_min_size or connection.pool_max_size:  # sizes are taken from the new connection
+                    if connection.pool_size and pool.pool_size != connection.pool_size:  # if pool size has changed terminate and recreate the connections
+                        pool.terminate_pool()
+                        pool.pool_size = connection.pool_size
+                    pool.min_size = connection.pool_min_size
+                    pool.max_size = connection.pool_max_size
+                    pool.set_sizes()
+                pool.update_maintenance_thread()
                 return pool
             else:
                 return object.__new__(cls)
@@ -105,17 +121,32 @@ class ReusableStrategy(BaseStrategy):
                 self.master_connection = connection
                 self.workers = []
                 self.pool_size = connection.pool_size or get_config_parameter('REUSABLE_THREADED_POOL_SIZE')
+                self.min_size = connection.pool_min_size
+                self.max_size = connection.pool_max_size
+                self.set_sizes()
                 self.lifetime = connection.pool_lifetime or get_config_parameter('REUSABLE_THREADED_LIFETIME')
                 self.keepalive = connection.pool_keepalive
                 self.request_queue = Queue()
+                self.pending_requests = 0  # requests in the queue, without the terminate signals
                 self.open_pool = False
                 self.bind_pool = False
                 self.tls_pool = False
                 self._incoming = dict()
+                self._events = dict()
                 self.counter = 0
                 self.terminated_usage = ConnectionUsage() if connection._usage else None
                 self.terminated = False
                 self.pool_lock = Lock()
+                self.maintenance_thread = None
+                # metrics
+                self.requests_served = 0
+                self.queue_wait_time = 0.0  # seconds spent by the requests in the queue
+                self.service_time = 0.0  # seconds spent by the workers executing the requests
+                self.workers_time = 0.0  # seconds of life of the terminated workers
+                self.peak_size = 0
+                self.scale_ups = 0
+                self.scale_downs = 0
+                self.renewals = 0
                 ReusableStrategy.pools[self.name] = self
                 self.started = False
                 if log_enabled(BASIC):
@@ -125,11 +156,23 @@ class ReusableStrategy(BaseStrategy):
             s = 'POOL: ' + str(self.name) + ' - status: ' + ('started' if self.started else 'terminated')
             s += ' - responses in queue: ' + str(len(self._incoming))
             s += ' - pool size: ' + str(self.pool_size)
+            s += ' - min size: ' + str(self.min_size)
+            s += ' - max size: ' + str(self.max_size)
             s += ' - lifetime: ' + str(self.lifetime)
             s += ' - keepalive: ' + str(self.keepalive)
             s += ' - open: ' + str(self.open_pool)
             s += ' - bind: ' + str(self.bind_pool)
             s += ' - tls: ' + str(self.tls_pool) + linesep
+            s += 'METRICS: workers: ' + str(len(self.workers))
+            s += ' - peak workers: ' + str(self.peak_size)
+            s += ' - requests in queue: ' + str(self.pending_requests)
+            s += ' - requests served: ' + str(self.requests_served)
+            s += ' - average queue wait time: ' + '%.6f' % self.average_queue_wait_time
+            s += ' - average service time: ' + '%.6f' % self.average_service_time
+            s += ' - utilization: ' + '%.2f' % self.utilization
+            s += ' - scale ups: ' + str(self.scale_ups)
+            s += ' - scale downs: ' + str(self.scale_downs)
+            s += ' - renewals: ' + str(self.renewals) + linesep
             s += 'MASTER CONN: ' + str(self.master_connection) + linesep
             s += 'WORKERS:'
             if self.workers:
@@ -143,8 +186,33 @@ class ReusableStrategy(BaseStrategy):
         def __repr__(self):
             return self.__str__()
 
+        def set_sizes(self):
+            """
+            Keeps min_size <= pool_size <= max_size, a pool without min and max sizes has a fixed size
+            """
+            self.min_size = max(1, min(self.min_size or self.pool_size, self.pool_size))
+            self.max_size = max(self.max_size or self.pool_size, self.pool_size)
+
+        @property
+        def average_queue_wait_time(self):
+            return self.queue_wait_time / self.requests_served if self.requests_served else 0.0
+
+        @property
+        def average_service_time(self):
+            return self.service_time / self.requests_served if self.requests_served else 0.0
+
+        @property
+        def utilization(self):
+            """
+            Fraction of the workers time spent executing requests
+            """
+            workers_time = self.workers_time + sum(worker.age for worker in self.workers[:])
+            return self.service_time / workers_time if workers_time else 0.0
+
         def get_info_from_server(self):
-            for worker in self.workers:
+            with self.pool_lock:  # workers are added and removed by the maintenance thread
+                workers = self.workers[:]
+            for worker in workers:
                 with worker.worker_lock:
                     if not worker.connection.server.schema or not worker.connection.server.info:
                         worker.get_info_from_server = True
@@ -152,7 +220,9 @@ class ReusableStrategy(BaseStrategy):
                         worker.get_info_from_server = False
 
         def rebind_pool(self):
-            for worker in self.workers:
+            with self.pool_lock:
+                workers = self.workers[:]
+            for worker in workers:
                 with worker.worker_lock:
                     worker.connection.rebind(self.master_connection.user,
                                              self.master_connection.password,
@@ -168,33 +238,235 @@ class ReusableStrategy(BaseStrategy):
                         worker.thread.start()
                 self.started = True
                 self.terminated = False
+                self.update_maintenance_thread()
                 if log_enabled(BASIC):
                     log(BASIC, 'worker started for pool <%s>', self)
                 return True
             return False
 
+        def update_maintenance_thread(self):
+            """
+            Starts the maintenance thread when the pool is elastic or keeps alive its connections, stops it otherwise
+            """
+            if self.started and (self.min_size < self.max_size or self.keepalive):
+                if not self.maintenance_thread:
+                    self.maintenance_thread = ReusableStrategy.PoolMaintenanceThread(self)
+                    self.maintenance_thread.start()
+            elif self.maintenance_thread:
+                self.maintenance_thread.stop()
+                self.maintenance_thread = None
+
+        def queue_request(self, counter, message_type, request, controls):
+            with self.pool_lock:
+                self.pending_requests += 1
+            self.request_queue.put((counter, message_type, request, controls, monotonic()))
+
+        def request_dequeued(self):
+            with self.pool_lock:
+                self.pending_requests -= 1
+
         def create_pool(self):
             if log_enabled(BASIC):
                 log(BASIC, 'created pool <%s>', self)
             self.workers = [ReusableStrategy.PooledConnectionWorker(self.master_connection, self.request_queue) for _ in range(self.pool_size)]
+            self.peak_size = max(self.peak_size, len(self.workers))
+
+        def scale_up(self):
+            """
+            Adds a worker when requests are waiting in the queue and all the workers are busy. The connection of the new
+            worker is created in the worker thread
+            """
+            if self.started and len(self.workers) < self.max_size and self.pending_requests > len([worker for worker in self.workers[:] if not worker.busy]):
+                with self.pool_lock:
+                    if len(self.workers) >= self.max_size:
+                        return
+                    worker = ReusableStrategy.PooledConnectionWorker(self.master_connection, self.request_queue, deferred=True)
+                    self.workers.append(worker)
+                    self.scale_ups += 1
+                    self.peak_size = max(self.peak_size, len(self.workers))
+                worker.thread.start()
+                if log_enabled(BASIC):
+                    log(BASIC, 'worker added to pool <%s>, %d workers in pool', self.name, len(self.workers))
+
+        def reap_idle_workers(self):
+            """
+            Terminates the workers idle for more than REUSABLE_THREADED_IDLE_TIMEOUT seconds while the pool is larger than min_size
+            """
+            conf_idle_timeout = get_config_parameter('REUSABLE_THREADED_IDLE_TIMEOUT')
+            with self.pool_lock:
+                idle_workers = len([worker for worker in self.workers if not worker.busy and worker.idle_time >= conf_idle_timeout])
+                to_terminate = min(idle_workers, len(self.workers) - self.min_size - self.pending_requests)
+            for _ in range(to_terminate):  # any idle worker terminates when receiving the signal
+                self.request_queue.put((TERMINATE_REUSABLE, None, None, None, None))
+            if to_terminate > 0:
+                self.scale_downs += to_terminate
+                if log_enabled(BASIC):
+                    log(BASIC, '%d idle workers terminated in pool <%s>', to_terminate, self.name)
+
+        def renew_connections(self):
+            """
+            Replaces the connections whose lifetime is expired
+            """
+            for worker in self.workers[:]:
+                if worker.connection is not None and worker.running and (datetime.now() - worker.creation_time).seconds >= self.lifetime:
+                    self.renew_connection(worker)
+
+        def renew_connection(self, worker):
+            """
+            Replaces the connection of the worker. The new connection is opened before the swap, so the worker waits
+            only if the connection is replaced while a request is executed
+            """
+            old_connection = worker.connection
+            try:
+                connection = worker.new_connection(replace=False)
+                worker.ready_connection(connection)
+            except LDAPExceptionError as e:
+                if log_enabled(ERROR):
+                    log(ERROR, 'unable to renew connection for worker <%s> in pool <%s>: <%s>', worker, self.name, e)
+                return False
+            with worker.worker_lock:
+                worker.connection = connection
+                worker.creation_time = datetime.now()
+                worker.last_activity_time = monotonic()
+                if worker.get_info_from_server:
+                    connection.refresh_server_info()
+                    worker.get_info_from_server = False
+            if self.master_connection.usage and old_connection.usage:
+                self.terminated_usage += old_connection.usage
+            try:
+                old_connection.unbind()
+            except LDAPExceptionError:
+                pass
+            self.renewals += 1
+            if log_enabled(BASIC):
+                log(BASIC, 'connection renewed for worker in pool <%s>', self.name)
+            return True
+
+        def check_idle_connections(self):
+            """
+            Checks the connections of the idle workers in a single pass: connections closed by the server are renewed and
+            connections idle for more than keepalive seconds receive an Abandon(0) operation, an harmless operation used
+            to not let the server close the connection. Workers executing a request are not checked
+            """
+            idle_workers = []
+            for worker in self.workers[:]:
+                if worker.running and not worker.busy and worker.connection is not None and not worker.connection.closed and worker.connection.socket:
+                    if worker.worker_lock.acquire(False):  # the worker is not executing a request
+                        idle_workers.append(worker)
+            dead_workers = []
+            try:
+                if not idle_workers:
+                    return
+                try:
+                    readable = select([worker.connection.socket for worker in idle_workers], [], [], 0)[0]
+                except (socket.error, ValueError):
+                    readable = [worker.connection.socket for worker in idle_workers]
+                for worker in idle_workers:
+                    if worker.connection.socket in readable:  # an idle connection is readable only when closed by the server
+                        try:
+                            # peeks the raw socket, also when wrapped in tls
+                            dead = not socket.socket.recv(worker.connection.socket, 1, socket.MSG_PEEK)
+                        except (socket.error, ValueError):
+                            dead = True
+                        if dead:
+                            dead_workers.append(worker)
+                            continue
+                    if self.keepalive and monotonic() - worker.last_activity_time >= self.keepalive:
+                        try:
+                            worker.connection.abandon(0)
+                            worker.last_activity_time = monotonic()
+                        except LDAPExceptionError:
+                            dead_workers.append(worker)
+            finally:
+                for worker in idle_workers:
+                    worker.worker_lock.release()
+            for worker in dead_workers:
+                if log_enabled(BASIC):
+                    log(BASIC, 'connection closed by server for worker in pool <%s>', self.name)
+                try:
+                    worker.connection.strategy.close()
+                except LDAPExceptionError:
+                    pass
+                self.renew_connection(worker)
+
+        def worker_terminated(self, worker):
+            with self.pool_lock:
+                if worker in self.workers:
+                    self.workers.remove(worker)
+                self.workers_time += worker.age
+
+        def next_counter(self):
+            """
+            Returns a new counter and creates the event signalled when its response is ready
+            """
+            with self.pool_lock:
+                self.counter += 1
+                if self.counter > LDAP_MAX_INT:
+                    self.counter = 1
+                self._events[self.counter] = Event()
+                return self.counter
+
+        def set_response(self, counter, response):
+            """
+            Stores the response in the _incoming dict and wakes up the thread waiting for it
+            The event is removed when the waiting thread gives up, so late responses are dropped
+            """
+            with self.pool_lock:
+                if counter in self._events:
+                    self._incoming[counter] = response
+                    self._events[counter].set()
+                elif log_enabled(ERROR):
+                    log(ERROR, 'dropped late response for request <%s> in <%s>', counter, self)
 
         def terminate_pool(self):
             if not self.terminated:
                 if log_enabled(BASIC):
                     log(BASIC, 'terminating pool <%s>', self)
                 self.started = False
+                if self.maintenance_thread:
+                    self.maintenance_thread.stop()
+                    self.maintenance_thread = None
                 self.request_queue.join()  # waits for all queue pending operations
                 for _ in range(len([worker for worker in self.workers if worker.thread.is_alive()])):  # put a TERMINATE signal on the queue for each active thread
-                    self.request_queue.put((TERMINATE_REUSABLE, None, None, None))
+                    self.request_queue.put((TERMINATE_REUSABLE, None, None, None, None))
                 self.request_queue.join()  # waits for all queue terminate operations
                 self.terminated = True
                 if log_enabled(BASIC):
                     log(BASIC, 'pool terminated for <%s>', self)
 
+    class PoolMaintenanceThread(Thread):
+        """
+        The thread that resizes the pool, renews the expired connections and keeps alive the idle connections every
+        REUSABLE_THREADED_MAINTENANCE_INTERVAL seconds, or more frequently if the pool keepalive is shorter
+        """
+        def __init__(self, pool):
+            Thread.__init__(self)
+            self.daemon = True
+            self.pool = pool
+            self.stop_event = Event()
+
+        @property
+        def interval(self):
+            conf_maintenance_interval = get_config_parameter('REUSABLE_THREADED_MAINTENANCE_INTERVAL')
+            return min(conf_maintenance_interval, self.pool.keepalive) if self.pool.keepalive else conf_maintenance_interval
+
+        def run(self):
+            while not self.stop_event.wait(self.interval):
+                try:
+                    self.pool.reap_idle_workers()
+                    self.pool.renew_connections()
+                    self.pool.check_idle_connections()
+                except Exception as e:  # the maintenance thread must not die
+                    if log_enabled(ERROR):
+                        log(ERROR, 'error <%s> in maintenance of pool <%s>', e, self.pool.name)
+
+        def stop(self):
+            self.stop_event.set()
+
     class PooledConnectionThread(Thread):
         """
         The thread that holds the Reusable connection and receive operation request via the queue
-        Result are sent back in the pool._incoming list when ready
+        Result are sent back in the pool._incoming list when ready and the event for the request is signalled
         """
         def __init__(self, worker, master_connection):
             Thread.__init__(self)
@@ -209,16 +481,23 @@ class ReusableStrategy(BaseStrategy):
             self.worker.running = True
             terminate = False
             pool = self.master_connection.strategy.pool
-            while not terminate:
+            if self.worker.connection is None:  # worker added to an elastic pool
                 try:
-                    counter, message_type, request, controls = pool.request_queue.get(block=True, timeout=self.master_connection.strategy.pool.keepalive)
-                except Empty:  # issue an Abandon(0) operation to keep the connection live - Abandon(0) is a harmless operation
-                    if not self.worker.connection.closed:
-                        self.worker.connection.abandon(0)
-                    continue
+                    self.worker.new_connection()
+                except LDAPExceptionError as e:
+                    if log_enabled(ERROR):
+                        log(ERROR, 'unable to create connection for new worker in pool <%s>: <%s>', pool.name, e)
+                    self.worker.running = False
+                    pool.worker_terminated(self.worker)
+                    return
+            while not terminate:
+                counter, message_type, request, controls, queued_time = pool.request_queue.get(block=True)  # idle connections are kept alive by the maintenance thread
+                if counter != TERMINATE_REUSABLE:
+                    pool.request_dequeued()
 
                 with self.worker.worker_lock:
                     self.worker.busy = True
+                    start_time = monotonic()
                     if counter == TERMINATE_REUSABLE:
                         terminate = True
                         if self.worker.connection.bound:
@@ -229,7 +508,7 @@ class ReusableStrategy(BaseStrategy):
                             except LDAPExceptionError:
                                 pass
                     else:
-                        if (datetime.now() - self.worker.creation_time).seconds >= self.master_connection.strategy.pool.lifetime:  # destroy and create a new connection
+                        if (datetime.now() - self.worker.creation_time).seconds >= pool.lifetime + (2 * get_config_parameter('REUSABLE_THREADED_MAINTENANCE_INTERVAL') if pool.maintenance_thread else 0):  # not renewed by maintenance thread, destroy and create a new connection
                             try:
                                 self.worker.connection.unbind()
                             except LDAPExceptionError:
@@ -239,15 +518,7 @@ class ReusableStrategy(BaseStrategy):
                                 log(BASIC, 'thread respawn')
                         if message_type not in ['bindRequest', 'unbindRequest']:
                             try:
-                                if pool.open_pool and self.worker.connection.closed:
-                                    self.worker.connection.open(read_server_info=False)
-                                    if pool.tls_pool and not self.worker.connection.tls_started:
-                                        self.worker.connection.start_tls(read_server_info=False)
-                                    if pool.bind_pool and not self.worker.connection.bound:
-                                        self.worker.connection.bind(read_server_info=False)
-                                elif pool.open_pool and not self.worker.connection.closed:  # connection already open, issues a start_tls
-                                    if pool.tls_pool and not self.worker.connection.tls_started:
-                                        self.worker.connection.start_tls(read_server_info=False)
+                                self.worker.ready_connection(self.worker.connection)
                                 if self.worker.get_info_from_server and counter:
                                     self.worker.connection.refresh_server_info()
                                     self.worker.get_info_from_server = False
@@ -258,12 +529,10 @@ class ReusableStrategy(BaseStrategy):
                                 else:
                                     response = self.worker.connection.post_send_single_response(self.worker.connection.send(message_type, request, controls))
                                 result = self.worker.connection.result
-                                with pool.pool_lock:
-                                    pool._incoming[counter] = (response, result, BaseStrategy.decode_request(message_type, request, controls))
+                                pool.set_response(counter, (response, result, BaseStrategy.decode_request(message_type, request, controls)))
                             except LDAPOperationResult as e:  # raise_exceptions has raised an exception. It must be redirected to the original connection thread
-                                with pool.pool_lock:
-                                    pool._incoming[counter] = (e, None, None)
-                                    # pool._incoming[counter] = (type(e)(str(e)), None, None)
+                                pool.set_response(counter, (e, None, None))
+                                # pool._incoming[counter] = (type(e)(str(e)), None, None)
                             # except LDAPOperationResult as e:  # raise_exceptions has raised an exception. It must be redirected to the original connection thread
                             #     exc = e
                             # with pool.pool_lock:
@@ -271,8 +540,10 @@ class ReusableStrategy(BaseStrategy):
                             #         pool._incoming[counter] = (exc, None, None)
                             #     else:
                             #         pool._incoming[counter] = (response, result, BaseStrategy.decode_request(message_type, request, controls))
+                            self.worker.request_served(start_time - queued_time, monotonic() - start_time)
 
                     self.worker.busy = False
+                    self.worker.last_task_time = self.worker.last_activity_time = monotonic()
                     pool.request_queue.task_done()
                     self.worker.task_counter += 1
             if log_enabled(BASIC):
@@ -280,12 +551,14 @@ class ReusableStrategy(BaseStrategy):
             if self.master_connection.usage:
                 pool.terminated_usage += self.worker.connection.usage
             self.worker.running = False
+            pool.worker_terminated(self.worker)
 
     class PooledConnectionWorker(object):
         """
         Container for the restartable connection. it includes a thread and a lock to execute the connection in the pool
+        With deferred=True the connection is created in the worker thread
         """
-        def __init__(self, connection, request_queue):
+        def __init__(self, connection, request_queue, deferred=False):
             self.master_connection = connection
             self.request_queue = request_queue
             self.running = False
@@ -294,7 +567,13 @@ class ReusableStrategy(BaseStrategy):
             self.connection = None
             self.creation_time = None
             self.task_counter = 0
-            self.new_connection()
+            self.start_time = monotonic()
+            self.last_task_time = self.start_time
+            self.last_activity_time = self.start_time  # last request or keepalive sent on the connection
+            self.queue_wait_time = 0.0
+            self.service_time = 0.0
+            if not deferred:
+                self.new_connection()
             self.thread = ReusableStrategy.PooledConnectionThread(self, self.master_connection)
             self.worker_lock = Lock()
             if log_enabled(BASIC):
@@ -304,53 +583,108 @@ class ReusableStrategy(BaseStrategy):
             s = 'CONN: ' + str(self.connection) + linesep + '       THREAD: '
             s += 'running' if self.running else 'halted'
             s += ' - ' + ('busy' if self.busy else 'available')
-            s += ' - ' + ('created at: ' + self.creation_time.isoformat())
-            s += ' - time to live: ' + str(self.master_connection.strategy.pool.lifetime - (datetime.now() - self.creation_time).seconds)
+            if self.creation_time:
+                s += ' - ' + ('created at: ' + self.creation_time.isoformat())
+                s += ' - time to live: ' + str(self.master_connection.strategy.pool.lifetime - (datetime.now() - self.creation_time).seconds)
             s += ' - requests served: ' + str(self.task_counter)
+            s += ' - queue wait time: ' + '%.6f' % self.queue_wait_time
+            s += ' - service time: ' + '%.6f' % self.service_time
+            s += ' - utilization: ' + '%.2f' % self.utilization
 
             return s
 
-        def new_connection(self):
+        @property
+        def age(self):
+            return monotonic() - self.start_time
+
+        @property
+        def idle_time(self):
+            return 0.0 if self.busy else monotonic() - self.last_task_time
+
+        @property
+        def utilization(self):
+            """
+            Fraction of the worker life spent executing requests
+            """
+            age = self.age
+            return self.service_time / age if age else 0.0
+
+        def request_served(self, queue_wait_time, service_time):
+            self.queue_wait_time += queue_wait_time
+            self.service_time += service_time
+            pool = self.master_connection.strategy.pool
+            with pool.pool_lock:
+                pool.requests_served += 1
+                pool.queue_wait_time += queue_wait_time
+                pool.service_time += service_time
+
+        def ready_connection(self, connection):
+            """
+            Opens, secures and binds the connection as requested for the pool
+            """
+            pool = self.master_connection.strategy.pool
+            if pool.open_pool and connection.closed:
+                connection.open(read_server_info=False)
+                if pool.tls_pool and not connection.tls_started:
+                    connection.start_tls(read_server_info=False)
+                if pool.bind_pool and not connection.bound:
+                    connection.bind(read_server_info=False)
+            elif pool.open_pool and not connection.closed:  # connection already open, issues a start_tls
+                if pool.tls_pool and not connection.tls_started:
+                    connection.start_tls(read_server_info=False)
+
+        def new_connection(self, replace=True):
+            """
+            Creates the connection of the worker. With replace=False the new connection is returned without replacing
+            the connection of the worker
+            """
             from ..core.connection import Connection
             # noinspection PyProtectedMember
-            self.creation_time = datetime.now()
-            self.connection = Connection(server=self.master_connection.server_pool if self.master_connection.server_pool else self.master_connection.server,
-                                         user=self.master_connection.user,
-                                         password=self.master_connection.password,
-                                         auto_bind=AUTO_BIND_NONE,  # do not perform auto_bind because it reads again the schema
-                                         version=self.master_connection.version,
-                                         authentication=self.master_connection.authentication,
-                                         client_strategy=RESTARTABLE,
-                                         auto_referrals=self.master_connection.auto_referrals,
-                                         auto_range=self.master_connection.auto_range,
-                                         sasl_mechanism=self.master_connection.sasl_mechanism,
-                                         sasl_credentials=self.master_connection.sasl_credentials,
-                                         check_names=self.master_connection.check_names,
-                                         collect_usage=self.master_connection._usage,
-                                         read_only=self.master_connection.read_only,
-                                         raise_exceptions=self.master_connection.raise_exceptions,
-                                         lazy=False,
-                                         fast_decoder=self.master_connection.fast_decoder,
-                                         receive_timeout=self.master_connection.receive_timeout,
-                                         return_empty_attributes=self.master_connection.empty_attributes)
+            connection = Connection(server=self.master_connection.server_pool if self.master_connection.server_pool else self.master_connection.server,
+                                    user=self.master_connection.user,
+                                    password=self.master_connection.password,
+                                    auto_bind=AUTO_BIND_NONE,  # do not perform auto_bind because it reads again the schema
+                                    version=self.master_connection.version,
+                                    authentication=self.master_connection.authentication,
+                                    client_strategy=RESTARTABLE,
+                                    auto_referrals=self.master_connection.auto_referrals,
+                                    auto_range=self.master_connection.auto_range,
+                                    sasl_mechanism=self.master_connection.sasl_mechanism,
+                                    sasl_credentials=self.master_connection.sasl_credentials,
+                                    check_names=self.master_connection.check_names,
+                                    collect_usage=self.master_connection._usage,
+                                    read_only=self.master_connection.read_only,
+                                    raise_exceptions=self.master_connection.raise_exceptions,
+                                    lazy=False,
+                                    fast_decoder=self.master_connection.fast_decoder,
+                                    receive_timeout=self.master_connection.receive_timeout,
+                                    socket_size=self.master_connection.socket_size,
+                                    return_empty_attributes=self.master_connection.empty_attributes,
+                                    tcp_keepalive=self.master_connection.tcp_keepalive)
 
             # simulates auto_bind, always with read_server_info=False
             if self.master_connection.auto_bind and self.master_connection.auto_bind not in [AUTO_BIND_NONE, AUTO_BIND_DEFAULT]:
                 if log_enabled(BASIC):
-                    log(BASIC, 'performing automatic bind for <%s>', self.connection)
-                self.connection.open(read_server_info=False)
+                    log(BASIC, 'performing automatic bind for <%s>', connection)
+                connection.open(read_server_info=False)
                 if self.master_connection.auto_bind == AUTO_BIND_NO_TLS:
-                    self.connection.bind(read_server_info=False)
+                    connection.bind(read_server_info=False)
                 elif self.master_connection.auto_bind == AUTO_BIND_TLS_BEFORE_BIND:
-                    self.connection.start_tls(read_server_info=False)
-                    self.connection.bind(read_server_info=False)
+                    connection.start_tls(read_server_info=False)
+                    connection.bind(read_server_info=False)
                 elif self.master_connection.auto_bind == AUTO_BIND_TLS_AFTER_BIND:
-                    self.connection.bind(read_server_info=False)
-                    self.connection.start_tls(read_server_info=False)
+                    connection.bind(read_server_info=False)
+                    connection.start_tls(read_server_info=False)
 
             if self.master_connection.server_pool:
-                self.connection.server_pool = self.master_connection.server_pool
-                self.connection.server_pool.initialize(self.connection)
+                connection.server_pool = self.master_connection.server_pool
+                connection.server_pool.initialize(connection)
+
+            if replace:
+                self.creation_time = datetime.now()
+                self.last_activity_time = monotonic()
+                self.connection = connection
+            return connection
 
     # ReusableStrategy methods
     def __init__(self, ldap_connection):
@@ -406,12 +740,10 @@ class ReusableStrategy(BaseStrategy):
                 self.pool.tls_pool = True
                 counter = BOGUS_EXTENDED
             else:
-                with self.pool.pool_lock:
-                    self.pool.counter += 1
-                    if self.pool.counter > LDAP_MAX_INT:
-                        self.pool.counter = 1
-                    counter = self.pool.counter
-                self.pool.request_queue.put((counter, message_type, request, controls))
+                counter = self.pool.next_counter()
+                self.pool.queue_request(counter, message_type, request, controls)
+                if self.pool.max_size > len(self.pool.workers):
+                    self.pool.scale_up()
             return counter
         if log_enabled(ERROR):
             log(ERROR, 'reusable connection pool not started')
@@ -445,7 +777,6 @@ class ReusableStrategy(BaseStrategy):
         return result
 
     def get_response(self, counter, timeout=None, get_request=False):
-        sleeptime = get_config_parameter('RESPONSE_SLEEPTIME')
         request=None
         if timeout is None:
             timeout = get_config_parameter('RESPONSE_WAITING_TIMEOUT')
@@ -463,19 +794,17 @@ class ReusableStrategy(BaseStrategy):
             result = {'result': 0, 'referrals': None, 'responseName': '1.3.6.1.4.1.1466.20037', 'type': 'extendedResp', 'description': 'success', 'responseValue': 'None', 'dn': '', 'message': '<bogus StartTls response>'}
             self.connection.starting_tls = False
         else:
-            response = None
-            result = None
-            while timeout >= 0:  # waiting for completed message to appear in _incoming
-                try:
-                    with self.connection.strategy.pool.pool_lock:
-                        response, result, request = self.connection.strategy.pool._incoming.pop(counter)
-                except KeyError:
-                    sleep(sleeptime)
-                    timeout -= sleeptime
-                    continue
-                break
-
-            if timeout <= 0:
+            pool = self.connection.strategy.pool
+            with pool.pool_lock:
+                event = pool._events.get(counter)
+            if event is not None and event.wait(timeout):  # waiting for completed message to appear in _incoming
+                with pool.pool_lock:
+                    pool._events.pop(counter, None)
+                    response, result, request = pool._incoming.pop(counter)
+            else:
+                with pool.pool_lock:  # a response stored after the wait timed out is discarded with the event
+                    pool._events.pop(counter, None)
+                    pool._incoming.pop(counter, None)
                 if log_enabled(ERROR):
                     log(ERROR, 'no response from worker threads in Reusable connection')
                 raise LDAPResponseTimeoutError('no response from worker threads in Reusable connection')
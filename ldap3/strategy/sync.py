@@ -25,14 +25,14 @@
 
 import socket, base64
 
-from .. import SEQUENCE_TYPES, get_config_parameter, DIGEST_MD5, NTLM, ENCRYPT, GSSAPI
-from ..core.exceptions import LDAPSocketReceiveError, communication_exception_factory, LDAPExceptionError, LDAPExtensionError, LDAPOperationResult, LDAPSignatureVerificationFailedError
-from ..strategy.base import BaseStrategy, SESSION_TERMINATED_BY_SERVER, RESPONSE_COMPLETE, TRANSACTION_ERROR
+from .. import SEQUENCE_TYPES, get_config_parameter, DIGEST_MD5, NTLM, ENCRYPT, GSSAPI, ALL_ATTRIBUTES, ALL_OPERATIONAL_ATTRIBUTES, NO_ATTRIBUTES
+from ..core.results import DO_NOT_RAISE_EXCEPTIONS
+from ..core.exceptions import LDAPSocketReceiveError, communication_exception_factory, LDAPExceptionError, LDAPExtensionError, LDAPOperationResult, LDAPSignatureVerificationFailedError, \
+    LDAPSessionTerminatedByServerError, LDAPTransactionError
+from ..strategy.base import BaseStrategy, ReceiveBuffer, SESSION_TERMINATED_BY_SERVER, RESPONSE_COMPLETE, TRANSACTION_ERROR
 from ..protocol.rfc4511 import LDAPMessage
-from ..utils.log import log, log_enabled, ERROR, NETWORK, EXTENDED, format_ldap_message
+from ..utils.log import log, log_enabled, ERROR, PROTOCOL, NETWORK, EXTENDED, format_ldap_message
 from ..utils.asn1 import decoder, decode_message_fast
-from ..protocol.sasl.digestMd5 import md5_hmac
-from ..protocol.sasl.kerberos import posix_gssapi_unavailable
 
 LDAP_MESSAGE_TEMPLATE = LDAPMessage()
 
@@ -52,7 +52,11 @@ class SyncStrategy(BaseStrategy):
         self.no_real_dsa = False
         self.pooled = False
         self.can_stream = False
-        self.socket_size = get_config_parameter('SOCKET_SIZE')
+        self.socket_size = ldap_connection.socket_size or get_config_parameter('SOCKET_SIZE')
+        self.pipelining = False  # set by Pipeline and search_generator while sending requests, responses are collected later
+        self._responses = dict()  # responses received for pipelined or streamed requests while waiting for another message
+        self._abandoned = set()  # messageIds of abandoned streamed searches, their remaining responses are discarded
+        self._unprocessed = ReceiveBuffer(self.socket_size)  # data received after the last complete message
 
     def open(self, reset_usage=True, read_server_info=True):
         BaseStrategy.open(self, reset_usage, read_server_info)
@@ -66,16 +70,18 @@ class SyncStrategy(BaseStrategy):
     def _start_listen(self):
         if not self.connection.listening and not self.connection.closed:
             self.connection.listening = True
+            self._unprocessed.clear()
 
     def receiving(self):
         """
         Receives data over the socket
         Checks if the socket is closed
+        Returns the complete messages received, data of an incomplete message is kept for the next call
         """
         messages = []
         receiving = True
-        unprocessed = b''
-        data = b''
+        unprocessed = self._unprocessed
+        received = 0
         get_more_data = True
         # exc = None  # not needed here GC
         sasl_total_bytes_received = 0
@@ -86,8 +92,13 @@ class SyncStrategy(BaseStrategy):
         sasl_buffer_length = -1  # added, not initialized? GC
         while receiving:
             if get_more_data:
+                sasl_layer = (self.connection._digest_md5_kis or self.connection.session_security == ENCRYPT) and not self.connection.sasl_in_progress
                 try:
-                    data = self.connection.socket.recv(self.socket_size)
+                    if sasl_layer:
+                        data = self.connection.socket.recv(self.socket_size)
+                        received = len(data)
+                    else:  # data is received directly in the buffer
+                        received = unprocessed.receive(self.connection.socket, self.socket_size)
                 except (OSError, socket.error, AttributeError) as e:
                     self.connection.last_error = 'error receiving data: ' + str(e)
                     try:  # try to close the connection before raising exception
@@ -100,7 +111,7 @@ class SyncStrategy(BaseStrategy):
                     raise communication_exception_factory(LDAPSocketReceiveError, type(e)(str(e)))(self.connection.last_error)
 
                 # If we are using DIGEST-MD5 and LDAP signing is set : verify & remove the signature from the message
-                if (self.connection._digest_md5_kis or self.connection.session_security == ENCRYPT) and not self.connection.sasl_in_progress:
+                if sasl_layer:
                     data = sasl_next_packet + data
 
                     if sasl_received_data == b'' or sasl_next_packet:
@@ -129,6 +140,7 @@ class SyncStrategy(BaseStrategy):
                             sasl_signature = sasl_received_data[sasl_buffer_length - 10:]
                             sasl_received_data = sasl_received_data[:sasl_buffer_length - 10]  # retrieve encoded_message
                             kis = self.connection._digest_md5_kis  # renamed to lowercase GC
+                            from ..protocol.sasl.digestMd5 import md5_hmac  # SASL mechanisms are imported when used
                             calculated_signature = bytes.fromhex(md5_hmac(kis, sasl_sec_num + sasl_received_data)[0:20])
                             if sasl_signature != calculated_signature:
                                 raise LDAPSignatureVerificationFailedError("Signature verification failed for the recieved LDAP message number " + str(int.from_bytes(sasl_sec_num, 'big')) + ". Expected signature " + calculated_signature.hex() + " but got " + sasl_signature.hex() + ".")
@@ -137,6 +149,7 @@ class SyncStrategy(BaseStrategy):
                             sasl_received_data = self.connection.ntlm_client.unseal(sasl_received_data[:sasl_buffer_length])
                         
                         elif self.connection.sasl_mechanism == GSSAPI:
+                            from ..protocol.sasl.kerberos import posix_gssapi_unavailable
                             if posix_gssapi_unavailable:
                                 import winkerberos
                                 winkerberos.authGSSClientUnwrap(self.connection.krb_ctx, base64.b64encode(sasl_received_data[:sasl_buffer_length]).decode('utf-8'))
@@ -145,22 +158,19 @@ class SyncStrategy(BaseStrategy):
                                 sasl_received_data = self.connection.krb_ctx.unwrap(sasl_received_data[:sasl_buffer_length]).message
                         
                         sasl_total_bytes_received = 0
-                        unprocessed += sasl_received_data
+                        unprocessed.append(sasl_received_data)
                         sasl_received_data = b''
-                else:
-                    unprocessed += data
-            if len(data) > 0:
-                length = BaseStrategy.compute_ldap_message_size(unprocessed)
-                if length == -1:  # too few data to decode message length
-                    get_more_data = True
-                    continue
-                if len(unprocessed) < length:
-                    get_more_data = True
+            if received > 0:
+                length = unprocessed.message_size()
+                if length == -1 or len(unprocessed) < length:  # too few data to decode message length or incomplete message
+                    if messages and not sasl_layer:  # doesn't wait for the whole message, returns the messages already received
+                        receiving = False
+                    else:
+                        get_more_data = True
                 else:
                     if log_enabled(NETWORK):
-                        log(NETWORK, 'received %d bytes via <%s>', len(unprocessed[:length]), self.connection)
-                    messages.append(unprocessed[:length])
-                    unprocessed = unprocessed[length:]
+                        log(NETWORK, 'received %d bytes via <%s>', length, self.connection)
+                    messages.append(unprocessed.pop(length))
                     get_more_data = False
                     if len(unprocessed) == 0:
                         receiving = False
@@ -175,7 +185,10 @@ class SyncStrategy(BaseStrategy):
         """
         Executed after an Operation Request (except Search)
         Returns the result message or None
+        When pipelining returns the message_id, the response is collected later
         """
+        if self.pipelining:
+            return message_id
         responses, result = self.get_response(message_id)
         self.connection.result = result
         if result['type'] == 'intermediateResponse':  # checks that all responses are intermediates (there should be only one)
@@ -193,7 +206,10 @@ class SyncStrategy(BaseStrategy):
         """
         Executed after a search request
         Returns the result message and store in connection.response the objects found
+        When pipelining returns the message_id, the response is collected later
         """
+        if self.pipelining:
+            return message_id
         responses, result = self.get_response(message_id)
         self.connection.result = result
         if isinstance(responses, SEQUENCE_TYPES):
@@ -205,64 +221,134 @@ class SyncStrategy(BaseStrategy):
             log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
         raise LDAPSocketReceiveError(self.connection.last_error)
 
+    def _receive_responses(self):
+        """
+        Receives the available LDAP messages and stores them in self._responses by messageId
+        Returns SESSION_TERMINATED_BY_SERVER or TRANSACTION_ERROR when signaled by the server, else None
+        """
+        responses = self.receiving()
+        if not responses:
+            return SESSION_TERMINATED_BY_SERVER
+        for response in responses:
+            if len(response) > 0:
+                if self.connection.usage:
+                    self.connection._usage.update_received_message(len(response))
+                if self.connection.fast_decoder:
+                    ldap_resp = decode_message_fast(response)
+                    dict_response = self.decode_response_fast(ldap_resp)
+                else:
+                    ldap_resp, _ = decoder.decode(response, asn1Spec=LDAP_MESSAGE_TEMPLATE)  # unprocessed unused because receiving() waits for the whole message
+                    dict_response = self.decode_response(ldap_resp)
+                if log_enabled(EXTENDED):
+                    log(EXTENDED, 'ldap message received via <%s>:%s', self.connection, format_ldap_message(ldap_resp, '<<'))
+                message_id = int(ldap_resp['messageID'])
+                if message_id in self._responses:
+                    self._responses[message_id].append(dict_response)
+                    if dict_response['type'] not in ['searchResEntry', 'searchResRef', 'intermediateResponse']:
+                        self._responses[message_id].append(RESPONSE_COMPLETE)
+                elif message_id == 0:  # 0 is reserved for 'Unsolicited Notification' from server as per RFC4511 (paragraph 4.4)
+                    if dict_response['responseName'] == '1.3.6.1.4.1.1466.20036':  # Notice of Disconnection as per RFC4511 (paragraph 4.4.1)
+                        return SESSION_TERMINATED_BY_SERVER
+                    elif dict_response['responseName'] == '2.16.840.1.113719.1.27.103.4':  # Novell LDAP transaction error unsolicited notification
+                        return TRANSACTION_ERROR
+                    else:
+                        self.connection.last_error = 'unknown unsolicited notification from server'
+                        if log_enabled(ERROR):
+                            log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                        raise LDAPSocketReceiveError(self.connection.last_error)
+                elif message_id in self._abandoned:  # entries sent by the server before receiving the abandon request
+                    if dict_response['type'] not in ['searchResEntry', 'searchResRef', 'intermediateResponse']:
+                        self._abandoned.discard(message_id)
+                elif dict_response['type'] == 'extendedResp':
+                    self.connection.last_error = 'multiple extended responses to a single extended request'
+                    if log_enabled(ERROR):
+                        log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                    raise LDAPExtensionError(self.connection.last_error)
+                    # pass  # ignore message with invalid messageId when receiving multiple extendedResp. This is not allowed by RFC4511 but some LDAP server do it
+                else:
+                    self.connection.last_error = 'invalid messageId received'
+                    if log_enabled(ERROR):
+                        log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                    raise LDAPSocketReceiveError(self.connection.last_error)
+        return None
+
     def _get_response(self, message_id, timeout):
         """
         Performs the capture of LDAP response for SyncStrategy
+        Responses for other pipelined or streamed requests are stored in self._responses
         """
-        ldap_responses = []
-        response_complete = False
-        while not response_complete:
-            responses = self.receiving()
-            if responses:
-                for response in responses:
-                    if len(response) > 0:
-                        if self.connection.usage:
-                            self.connection._usage.update_received_message(len(response))
-                        if self.connection.fast_decoder:
-                            ldap_resp = decode_message_fast(response)
-                            dict_response = self.decode_response_fast(ldap_resp)
-                        else:
-                            ldap_resp, _ = decoder.decode(response, asn1Spec=LDAP_MESSAGE_TEMPLATE)  # unprocessed unused because receiving() waits for the whole message
-                            dict_response = self.decode_response(ldap_resp)
-                        if log_enabled(EXTENDED):
-                            log(EXTENDED, 'ldap message received via <%s>:%s', self.connection, format_ldap_message(ldap_resp, '<<'))
-                        if int(ldap_resp['messageID']) == message_id:
-                            ldap_responses.append(dict_response)
-                            if dict_response['type'] not in ['searchResEntry', 'searchResRef', 'intermediateResponse']:
-                                response_complete = True
-                        elif int(ldap_resp['messageID']) == 0:  # 0 is reserved for 'Unsolicited Notification' from server as per RFC4511 (paragraph 4.4)
-                            if dict_response['responseName'] == '1.3.6.1.4.1.1466.20036':  # Notice of Disconnection as per RFC4511 (paragraph 4.4.1)
-                                return SESSION_TERMINATED_BY_SERVER
-                            elif dict_response['responseName'] == '2.16.840.1.113719.1.27.103.4':  # Novell LDAP transaction error unsolicited notification
-                                return TRANSACTION_ERROR
-                            else:
-                                self.connection.last_error = 'unknown unsolicited notification from server'
-                                if log_enabled(ERROR):
-                                    log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
-                                raise LDAPSocketReceiveError(self.connection.last_error)
-                        elif int(ldap_resp['messageID']) != message_id and dict_response['type'] == 'extendedResp':
-                            self.connection.last_error = 'multiple extended responses to a single extended request'
-                            if log_enabled(ERROR):
-                                log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
-                            raise LDAPExtensionError(self.connection.last_error)
-                            # pass  # ignore message with invalid messageId when receiving multiple extendedResp. This is not allowed by RFC4511 but some LDAP server do it
-                        else:
-                            self.connection.last_error = 'invalid messageId received'
-                            if log_enabled(ERROR):
-                                log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
-                            raise LDAPSocketReceiveError(self.connection.last_error)
-                        # response = unprocessed
-                        # if response:  # if this statement is removed unprocessed data will be processed as another message
-                        #     self.connection.last_error = 'unprocessed substrate error'
-                        #     if log_enabled(ERROR):
-                        #         log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
-                        #     raise LDAPSocketReceiveError(self.connection.last_error)
-            else:
-                return SESSION_TERMINATED_BY_SERVER
-        ldap_responses.append(RESPONSE_COMPLETE)
+        ldap_responses = self._responses.setdefault(message_id, [])  # responses can be already received while waiting for another pipelined message
+        try:
+            while not ldap_responses or ldap_responses[-1] != RESPONSE_COMPLETE:
+                notification = self._receive_responses()
+                if notification:
+                    return notification
+        finally:
+            self._responses.pop(message_id, None)
 
         return ldap_responses
 
+    def stream_response(self, message_id):
+        """
+        Generator that yields the responses (entries, references and intermediate responses) of the message_id search
+        as soon as they are received. Data is read from the socket only when the next response is requested
+        The search result is stored in connection.result. If the generator is closed before the result is received
+        the search is abandoned and the remaining responses are discarded
+        The first value yielded is None, the caller must consume it to register the search before other operations
+        are sent, so the generator is closed and the search abandoned even if the responses are never requested
+        """
+        ldap_responses = self._responses.setdefault(message_id, [])
+        request = self._outstanding[message_id]
+        completed = False
+        try:
+            yield None
+            while True:
+                while ldap_responses:
+                    response = ldap_responses.pop(0)
+                    if response['type'] in ['searchResEntry', 'searchResRef', 'intermediateResponse']:
+                        if self.connection.empty_attributes and response['type'] == 'searchResEntry':
+                            for attribute_type in request['attributes']:
+                                if attribute_type not in response['raw_attributes'] and attribute_type not in (ALL_ATTRIBUTES, ALL_OPERATIONAL_ATTRIBUTES, NO_ATTRIBUTES):
+                                    response['raw_attributes'][attribute_type] = list()
+                                    response['attributes'][attribute_type] = list()
+                        yield response
+                    else:
+                        completed = True
+                        self.connection.result = response
+                        if self.connection.raise_exceptions and response['result'] not in DO_NOT_RAISE_EXCEPTIONS:
+                            if log_enabled(PROTOCOL):
+                                log(PROTOCOL, 'operation result <%s> for <%s>', response, self.connection)
+                            raise LDAPOperationResult(result=response['result'], description=response['description'], dn=response['dn'], message=response['message'], response_type=response['type'])
+                        break
+                if completed:
+                    break
+                notification = None
+                with self.connection.connection_lock:
+                    if not ldap_responses:  # responses may have been received by another thread
+                        notification = self._receive_responses()
+                if notification == SESSION_TERMINATED_BY_SERVER:
+                    try:  # try to close the session but don't raise any error if server has already closed the session
+                        self.close()
+                    except (socket.error, LDAPExceptionError):
+                        pass
+                    self.connection.last_error = 'session terminated by server'
+                    if log_enabled(ERROR):
+                        log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                    raise LDAPSessionTerminatedByServerError(self.connection.last_error)
+                elif notification == TRANSACTION_ERROR:  # Novell LDAP Transaction unsolicited notification
+                    self.connection.last_error = 'transaction error'
+                    if log_enabled(ERROR):
+                        log(ERROR, '<%s> for <%s>', self.connection.last_error, self.connection)
+                    raise LDAPTransactionError(self.connection.last_error)
+        finally:
+            self._responses.pop(message_id, None)
+            received = completed or (ldap_responses and ldap_responses[-1] == RESPONSE_COMPLETE)  # nothing to abandon when the result is already received
+            if not received and not self.connection.closed:
+                self._abandoned.add(message_id)
+                self.connection.abandon(message_id)
+            self._outstanding.pop(message_id, None)
+            self._pool_request_completed(message_id, discard=not received)
+
     def set_stream(self, value):
         raise NotImplementedError
 
@@ -28,10 +28,37 @@ try:
 except ImportError:
     from collections import MutableMapping, Mapping
 
-from .. import SEQUENCE_TYPES
+from .. import SEQUENCE_TYPES, STRING_TYPES
+
+_KEYS_CACHE_SIZE = 4096
+_keys_cache = dict()  # attribute name -> (interned key, ci_key), shared by all dictionaries so entries of a search reuse the same key objects
+_MISSING = object()
+
+
+def _fold_key(key):
+    if type(key) is str and ';' in key:
+        # remove transfer option (if any)
+        # eg. 'userCertificate;binary' -> 'userCertificate'
+        ci_key = key.split(';')[0]
+    else:
+        ci_key = key
+    ci_key = ci_key.strip().lower() if hasattr(ci_key, 'lower') else ci_key
+    return key, ci_key
+
+
+def register_attribute_name(name):
+    """
+    Keeps the folded attribute name in the cache shared by all the dictionaries
+    Only the attribute names decoded from the server responses are registered, other keys are folded when used
+    """
+    if isinstance(name, STRING_TYPES) and name not in _keys_cache and len(_keys_cache) < _KEYS_CACHE_SIZE:
+        _keys_cache[name] = _fold_key(name)
+    return name
 
 
 class CaseInsensitiveDict(MutableMapping):
+    __slots__ = ('_store', '_case_insensitive_keymap')
+
     def __init__(self, other=None, **kwargs):
         self._store = dict()  # store use the original key
         self._case_insensitive_keymap = dict()  # is a mapping ci_key -> key
@@ -41,19 +68,19 @@ class CaseInsensitiveDict(MutableMapping):
             self.update(other, **kwargs)
 
     def __contains__(self, item):
-        try:
-            self.__getitem__(item)
+        if item in self._store:
             return True
-        except KeyError:
+        try:
+            return self._ci_key(item) in self._case_insensitive_keymap
+        except TypeError:  # unhashable
             return False
 
     @staticmethod
     def _ci_key(key):
-        if type(key) is str and ';' in key:
-            # remove transfer option (if any)
-            # eg. 'userCertificate;binary' -> 'userCertificate'
-            key = key.split(';')[0]
-        return key.strip().lower() if hasattr(key, 'lower') else key
+        try:
+            return _keys_cache[key][1]
+        except KeyError:
+            return _fold_key(key)[1]
 
     def __delitem__(self, key):
         ci_key = self._ci_key(key)
@@ -61,7 +88,10 @@ class CaseInsensitiveDict(MutableMapping):
         del self._case_insensitive_keymap[ci_key]
 
     def __setitem__(self, key, item):
-        ci_key = self._ci_key(key)
+        try:
+            key, ci_key = _keys_cache[key]
+        except KeyError:
+            key, ci_key = _fold_key(key)
         if ci_key in self._case_insensitive_keymap:  # updates existing value
             self._store[self._case_insensitive_keymap[ci_key]] = item
         else:  # new key
@@ -69,7 +99,10 @@ class CaseInsensitiveDict(MutableMapping):
             self._case_insensitive_keymap[ci_key] = key
 
     def __getitem__(self, key):
-        return self._store[self._case_insensitive_keymap[self._ci_key(key)]]
+        value = self._store.get(key, _MISSING)  # key with the original case doesn't need folding
+        if value is _MISSING:
+            return self._store[self._case_insensitive_keymap[self._ci_key(key)]]
+        return value
 
     def __iter__(self):
         return self._store.__iter__()
@@ -112,6 +145,8 @@ class CaseInsensitiveDict(MutableMapping):
 
 
 class CaseInsensitiveWithAliasDict(CaseInsensitiveDict):
+    __slots__ = ('_aliases', '_alias_keymap')
+
     def __init__(self, other=None, **kwargs):
         self._aliases = dict()
         self._alias_keymap = dict()  # is a mapping key -> [alias1, alias2, ...]
@@ -120,6 +155,14 @@ class CaseInsensitiveWithAliasDict(CaseInsensitiveDict):
     def aliases(self):
         return self._aliases.keys()
 
+    def __contains__(self, item):
+        if CaseInsensitiveDict.__contains__(self, item):
+            return True
+        try:
+            return self._ci_key(item) in self._aliases
+        except TypeError:  # unhashable
+            return False
+
     def __setitem__(self, key, value):
         if isinstance(key, SEQUENCE_TYPES):
             ci_key = self._ci_key(key[0])
@@ -76,15 +76,25 @@ _ABSTRACTION_OPERATIONAL_ATTRIBUTE_PREFIX = 'OA_'
 
 # communication
 _POOLING_LOOP_TIMEOUT = 10  # number of seconds to wait before restarting a cycle to find an active server in the pool
+_POOLING_RESPONSE_TIME_WEIGHT = 0.2  # weight of the last response time in the average response time of a server in the pool
 _RESPONSE_SLEEPTIME = 0.05  # seconds to wait while waiting for a response in asynchronous strategies
 _RESPONSE_WAITING_TIMEOUT = 20  # waiting timeout for receiving a response in asynchronous strategies
 _SOCKET_SIZE = 4096  # socket byte size
+_PIPELINE_MAX_OUTSTANDING = 100  # maximum number of requests sent in a pipeline before waiting for the oldest response
 _CHECK_AVAILABILITY_TIMEOUT = 2.5  # default timeout for socket connect when checking availability
+_CHECK_AVAILABILITY_ATTEMPT_DELAY = 0.25  # seconds to wait before trying the next candidate address when checking availability
 _RESET_AVAILABILITY_TIMEOUT = 5  # default timeout for resetting the availability status when checking candidate addresses
 _RESTARTABLE_SLEEPTIME = 2  # time to wait in a restartable strategy before retrying the request
 _RESTARTABLE_TRIES = 3  # number of times to retry in a restartable strategy before giving up. Set to True for unlimited retries
 _REUSABLE_THREADED_POOL_SIZE = 5
 _REUSABLE_THREADED_LIFETIME = 3600  # 1 hour
+_REUSABLE_THREADED_IDLE_TIMEOUT = 300  # 5 minutes
+_REUSABLE_THREADED_MAINTENANCE_INTERVAL = 5  # seconds
+_TCP_KEEPALIVE_INTERVAL = 10  # seconds
+_TCP_KEEPALIVE_PROBES = 3
+_SCHEMA_CACHE_DIRECTORY = None  # directory of the parsed schemas cache, None to disable the cache
+_SCHEMA_CACHE_SERVERS = False
+_LAZY_SCHEMA_PARSING = False  # schema definitions are parsed when first used
 _DEFAULT_THREADED_POOL_NAME = 'REUSABLE_DEFAULT_POOL'
 _ADDRESS_INFO_REFRESH_TIME = 300  # seconds to wait before refreshing address info from dns
 _ADDITIONAL_SERVER_ENCODINGS = ['latin-1', 'koi8-r']  # some broken LDAP implementation may have different encoding than those expected by RFCs
@@ -92,6 +102,9 @@ _ADDITIONAL_CLIENT_ENCODINGS = ['utf-8']
 _IGNORE_MALFORMED_SCHEMA = False  # some flaky LDAP servers returns malformed schema. If True no expection is raised and schema is thrown away
 _DEFAULT_SERVER_ENCODING = 'utf-8'  # should always be utf-8
 _LDIF_LINE_LENGTH = 78  # as stated in RFC 2849
+_FILTER_CACHE_SIZE = 512  # number of compiled search filters kept in cache for each schema, read when the cache is created, 0 to disable the cache
+_MOCK_FILTER_CACHE_SIZE = 256  # number of compiled filters kept by each mock strategy
+_LAZY_ATTRIBUTE_DECODING = False  # if True attribute values of search entries are decoded only when read
 
 if stdin and hasattr(stdin, 'encoding') and stdin.encoding:
     _DEFAULT_CLIENT_ENCODING = stdin.encoding
@@ -104,14 +117,24 @@ PARAMETERS = ['CASE_INSENSITIVE_ATTRIBUTE_NAMES',
               'CASE_INSENSITIVE_SCHEMA_NAMES',
               'ABSTRACTION_OPERATIONAL_ATTRIBUTE_PREFIX',
               'POOLING_LOOP_TIMEOUT',
+              'POOLING_RESPONSE_TIME_WEIGHT',
               'RESPONSE_SLEEPTIME',
               'RESPONSE_WAITING_TIMEOUT',
               'SOCKET_SIZE',
+              'PIPELINE_MAX_OUTSTANDING',
               'CHECK_AVAILABILITY_TIMEOUT',
+              'CHECK_AVAILABILITY_ATTEMPT_DELAY',
               'RESTARTABLE_SLEEPTIME',
               'RESTARTABLE_TRIES',
               'REUSABLE_THREADED_POOL_SIZE',
               'REUSABLE_THREADED_LIFETIME',
+              'REUSABLE_THREADED_IDLE_TIMEOUT',
+              'REUSABLE_THREADED_MAINTENANCE_INTERVAL',
+              'TCP_KEEPALIVE_INTERVAL',
+              'TCP_KEEPALIVE_PROBES',
+              'SCHEMA_CACHE_DIRECTORY',
+              'SCHEMA_CACHE_SERVERS',
+              'LAZY_SCHEMA_PARSING',
               'DEFAULT_THREADED_POOL_NAME',
               'ADDRESS_INFO_REFRESH_TIME',
               'RESET_AVAILABILITY_TIMEOUT',
@@ -126,9 +149,21 @@ PARAMETERS = ['CASE_INSENSITIVE_ATTRIBUTE_NAMES',
               'IGNORE_MALFORMED_SCHEMA',
               'ATTRIBUTES_EXCLUDED_FROM_OBJECT_DEF',
               'IGNORED_MANDATORY_ATTRIBUTES_IN_OBJECT_DEF',
-              'LDIF_LINE_LENGTH'
+              'LDIF_LINE_LENGTH',
+              'FILTER_CACHE_SIZE',
+              'MOCK_FILTER_CACHE_SIZE',
+              'LAZY_ATTRIBUTE_DECODING'
               ]
 
+_config_version = 0  # changed by each set_config_parameter(), see get_config_version()
+
+
+def get_config_version():
+    """
+    Returns a number changed each time a parameter is set, caches of values computed from the parameters are keyed by it
+    """
+    return _config_version
+
 
 def get_config_parameter(parameter):
     if parameter == 'CASE_INSENSITIVE_ATTRIBUTE_NAMES':  # Boolean
@@ -139,14 +174,20 @@ def get_config_parameter(parameter):
         return _ABSTRACTION_OPERATIONAL_ATTRIBUTE_PREFIX
     elif parameter == 'POOLING_LOOP_TIMEOUT':  # Integer
         return _POOLING_LOOP_TIMEOUT
+    elif parameter == 'POOLING_RESPONSE_TIME_WEIGHT':  # Float
+        return _POOLING_RESPONSE_TIME_WEIGHT
     elif parameter == 'RESPONSE_SLEEPTIME':  # Integer
         return _RESPONSE_SLEEPTIME
     elif parameter == 'RESPONSE_WAITING_TIMEOUT':  # Integer
         return _RESPONSE_WAITING_TIMEOUT
     elif parameter == 'SOCKET_SIZE':  # Integer
         return _SOCKET_SIZE
+    elif parameter == 'PIPELINE_MAX_OUTSTANDING':  # Integer
+        return _PIPELINE_MAX_OUTSTANDING
     elif parameter == 'CHECK_AVAILABILITY_TIMEOUT':  # Integer
         return _CHECK_AVAILABILITY_TIMEOUT
+    elif parameter == 'CHECK_AVAILABILITY_ATTEMPT_DELAY':  # Float
+        return _CHECK_AVAILABILITY_ATTEMPT_DELAY
     elif parameter == 'RESTARTABLE_SLEEPTIME':  # Integer
         return _RESTARTABLE_SLEEPTIME
     elif parameter == 'RESTARTABLE_TRIES':  # Integer
@@ -155,6 +196,20 @@ def get_config_parameter(parameter):
         return _REUSABLE_THREADED_POOL_SIZE
     elif parameter == 'REUSABLE_THREADED_LIFETIME':  # Integer
         return _REUSABLE_THREADED_LIFETIME
+    elif parameter == 'REUSABLE_THREADED_IDLE_TIMEOUT':  # Integer
+        return _REUSABLE_THREADED_IDLE_TIMEOUT
+    elif parameter == 'REUSABLE_THREADED_MAINTENANCE_INTERVAL':  # Integer
+        return _REUSABLE_THREADED_MAINTENANCE_INTERVAL
+    elif parameter == 'TCP_KEEPALIVE_INTERVAL':  # Integer
+        return _TCP_KEEPALIVE_INTERVAL
+    elif parameter == 'TCP_KEEPALIVE_PROBES':  # Integer
+        return _TCP_KEEPALIVE_PROBES
+    elif parameter == 'SCHEMA_CACHE_DIRECTORY':  # String
+        return _SCHEMA_CACHE_DIRECTORY
+    elif parameter == 'SCHEMA_CACHE_SERVERS':  # Boolean
+        return _SCHEMA_CACHE_SERVERS
+    elif parameter == 'LAZY_SCHEMA_PARSING':  # Boolean
+        return _LAZY_SCHEMA_PARSING
     elif parameter == 'DEFAULT_THREADED_POOL_NAME':  # String
         return _DEFAULT_THREADED_POOL_NAME
     elif parameter == 'ADDRESS_INFO_REFRESH_TIME':  # Integer
@@ -209,6 +264,12 @@ def get_config_parameter(parameter):
             return [_IGNORED_MANDATORY_ATTRIBUTES_IN_OBJECT_DEF]
     elif parameter == 'LDIF_LINE_LENGTH':  # Integer
         return _LDIF_LINE_LENGTH
+    elif parameter == 'FILTER_CACHE_SIZE':  # Integer
+        return _FILTER_CACHE_SIZE
+    elif parameter == 'MOCK_FILTER_CACHE_SIZE':  # Integer
+        return _MOCK_FILTER_CACHE_SIZE
+    elif parameter == 'LAZY_ATTRIBUTE_DECODING':  # Boolean
+        return _LAZY_ATTRIBUTE_DECODING
 
     raise LDAPConfigurationParameterError('configuration parameter %s not valid' % parameter)
 
@@ -226,6 +287,9 @@ def set_config_parameter(parameter, value):
     elif parameter == 'POOLING_LOOP_TIMEOUT':
         global _POOLING_LOOP_TIMEOUT
         _POOLING_LOOP_TIMEOUT = value
+    elif parameter == 'POOLING_RESPONSE_TIME_WEIGHT':
+        global _POOLING_RESPONSE_TIME_WEIGHT
+        _POOLING_RESPONSE_TIME_WEIGHT = value
     elif parameter == 'RESPONSE_SLEEPTIME':
         global _RESPONSE_SLEEPTIME
         _RESPONSE_SLEEPTIME = value
@@ -235,9 +299,15 @@ def set_config_parameter(parameter, value):
     elif parameter == 'SOCKET_SIZE':
         global _SOCKET_SIZE
         _SOCKET_SIZE = value
+    elif parameter == 'PIPELINE_MAX_OUTSTANDING':
+        global _PIPELINE_MAX_OUTSTANDING
+        _PIPELINE_MAX_OUTSTANDING = value
     elif parameter == 'CHECK_AVAILABILITY_TIMEOUT':
         global _CHECK_AVAILABILITY_TIMEOUT
         _CHECK_AVAILABILITY_TIMEOUT = value
+    elif parameter == 'CHECK_AVAILABILITY_ATTEMPT_DELAY':
+        global _CHECK_AVAILABILITY_ATTEMPT_DELAY
+        _CHECK_AVAILABILITY_ATTEMPT_DELAY = value
     elif parameter == 'RESTARTABLE_SLEEPTIME':
         global _RESTARTABLE_SLEEPTIME
         _RESTARTABLE_SLEEPTIME = value
@@ -250,6 +320,27 @@ def set_config_parameter(parameter, value):
     elif parameter == 'REUSABLE_THREADED_LIFETIME':
         global _REUSABLE_THREADED_LIFETIME
         _REUSABLE_THREADED_LIFETIME = value
+    elif parameter == 'REUSABLE_THREADED_IDLE_TIMEOUT':
+        global _REUSABLE_THREADED_IDLE_TIMEOUT
+        _REUSABLE_THREADED_IDLE_TIMEOUT = value
+    elif parameter == 'REUSABLE_THREADED_MAINTENANCE_INTERVAL':
+        global _REUSABLE_THREADED_MAINTENANCE_INTERVAL
+        _REUSABLE_THREADED_MAINTENANCE_INTERVAL = value
+    elif parameter == 'TCP_KEEPALIVE_INTERVAL':
+        global _TCP_KEEPALIVE_INTERVAL
+        _TCP_KEEPALIVE_INTERVAL = value
+    elif parameter == 'TCP_KEEPALIVE_PROBES':
+        global _TCP_KEEPALIVE_PROBES
+        _TCP_KEEPALIVE_PROBES = value
+    elif parameter == 'SCHEMA_CACHE_DIRECTORY':
+        global _SCHEMA_CACHE_DIRECTORY
+        _SCHEMA_CACHE_DIRECTORY = value
+    elif parameter == 'SCHEMA_CACHE_SERVERS':
+        global _SCHEMA_CACHE_SERVERS
+        _SCHEMA_CACHE_SERVERS = value
+    elif parameter == 'LAZY_SCHEMA_PARSING':
+        global _LAZY_SCHEMA_PARSING
+        _LAZY_SCHEMA_PARSING = value
     elif parameter == 'DEFAULT_THREADED_POOL_NAME':
         global _DEFAULT_THREADED_POOL_NAME
         _DEFAULT_THREADED_POOL_NAME = value
@@ -295,5 +386,17 @@ def set_config_parameter(parameter, value):
     elif parameter == 'LDIF_LINE_LENGTH':
         global _LDIF_LINE_LENGTH
         _LDIF_LINE_LENGTH = value
+    elif parameter == 'FILTER_CACHE_SIZE':
+        global _FILTER_CACHE_SIZE
+        _FILTER_CACHE_SIZE = value
+    elif parameter == 'MOCK_FILTER_CACHE_SIZE':
+        global _MOCK_FILTER_CACHE_SIZE
+        _MOCK_FILTER_CACHE_SIZE = value
+    elif parameter == 'LAZY_ATTRIBUTE_DECODING':
+        global _LAZY_ATTRIBUTE_DECODING
+        _LAZY_ATTRIBUTE_DECODING = value
     else:
         raise LDAPConfigurationParameterError('unable to set configuration parameter %s' % parameter)
+
+    global _config_version
+    _config_version += 1
@@ -25,7 +25,6 @@
 
 from logging import getLogger, DEBUG
 from copy import deepcopy
-from pprint import pformat
 from ..protocol.rfc4511 import LDAPMessage
 
 # logging levels
@@ -191,6 +190,7 @@ def format_ldap_message(message, prefix):
         except Exception as e:
             formatted = ['pyasn1 exception', str(e)]
     else:
+        from pprint import pformat  # only needed when logging, pprint imports dataclasses and inspect
         formatted = pformat(message).split('\n')
 
     prefixed = ''
@@ -0,0 +1,81 @@
+"""
+"""
+
+# Created on 2025.03.10
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+
+from threading import Lock
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from .ordDict import OrderedDict  # for Python 2.6
+
+
+class LruCache(object):
+    """
+    Thread safe mapping that keeps at most maxsize items, discarding the least recently used ones
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+    def __repr__(self):
+        return 'LruCache(maxsize={0.maxsize!r}) - items: {1} - hits: {0.hits} - misses: {0.misses}'.format(self, len(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items[key] = value  # moves the item to the most recently used position
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if self.maxsize <= 0:  # caching disabled
+                self._items.clear()
+                return
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
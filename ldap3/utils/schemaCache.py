@@ -0,0 +1,263 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+from hashlib import sha1
+from importlib import import_module
+from tempfile import mkstemp
+from threading import Lock
+
+try:
+    import cPickle as pickle  # Python 2
+except ImportError:
+    import pickle
+
+from .. import get_config_parameter, set_config_parameter, OFFLINE_EDIR_8_8_8, OFFLINE_EDIR_9_1_4, OFFLINE_AD_2012_R2, OFFLINE_SLAPD_2_4, OFFLINE_DS389_1_3_3
+from ..version import __version__
+from ..protocol.rfc4512 import SchemaInfo, DsaInfo
+from ..core.exceptions import LDAPDefinitionError
+from .log import log, log_enabled, ERROR, BASIC
+
+SCHEMA_CACHE_FORMAT = 2  # increase when the pickled object graph changes
+DEFAULT_SCHEMA_CACHE_DIRECTORY = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'ldap3', 'schemas')
+
+# offline schema -> (module, schema variable, dsa info variable)
+OFFLINE_SCHEMAS = {OFFLINE_EDIR_8_8_8: ('edir888', 'edir_8_8_8_schema', 'edir_8_8_8_dsa_info'),
+                   OFFLINE_EDIR_9_1_4: ('edir914', 'edir_9_1_4_schema', 'edir_9_1_4_dsa_info'),
+                   OFFLINE_AD_2012_R2: ('ad2012R2', 'ad_2012_r2_schema', 'ad_2012_r2_dsa_info'),
+                   OFFLINE_SLAPD_2_4: ('slapd24', 'slapd_2_4_schema', 'slapd_2_4_dsa_info'),
+                   OFFLINE_DS389_1_3_3: ('ds389', 'ds389_1_3_3_schema', 'ds389_1_3_3_dsa_info')}
+
+# schemas read from servers in this process, shared by all the Server objects for the same server
+_server_schemas = dict()
+_server_schemas_lock = Lock()
+
+
+def cache_signature():
+    """
+    The parameters that change the parsed schema, a cache file created with a different signature is ignored
+    """
+    return (SCHEMA_CACHE_FORMAT,
+            __version__,
+            sys.version_info[:2],
+            bool(get_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES')),
+            bool(get_config_parameter('IGNORE_MALFORMED_SCHEMA')),
+            bool(get_config_parameter('LAZY_SCHEMA_PARSING')))
+
+
+def cache_file_name(name, directory=None):
+    directory = directory or get_config_parameter('SCHEMA_CACHE_DIRECTORY')
+    if not directory:
+        return None
+    signature = cache_signature()
+    return os.path.join(directory, '%s-%s-py%d%d-%s%s%s.pickle' % (name,
+                                                                    signature[1],
+                                                                    signature[2][0],
+                                                                    signature[2][1],
+                                                                    'ci' if signature[3] else 'cs',
+                                                                    '-im' if signature[4] else '',
+                                                                    '-lazy' if signature[5] else ''))
+
+
+def is_trusted_path(path):
+    """
+    A cache file is unpickled only if it and its directory are owned by the current user and not writable by group and
+    others, so no other user can put in the cache a file that would run code when loaded
+    """
+    if not hasattr(os, 'getuid'):  # Windows, access is controlled by the ACL of the user profile
+        return True
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def load_cached_info(name, directory=None):
+    """
+    Returns the (schema info, dsa info) tuple stored in the cache, None if not cached
+    """
+    file_name = cache_file_name(name, directory)
+    if not file_name or not os.path.isfile(file_name):
+        return None
+    if not is_trusted_path(os.path.dirname(file_name)) or not is_trusted_path(file_name):
+        if log_enabled(ERROR):
+            log(ERROR, 'schema cache file <%s> ignored, it or its directory is not owned by the current user or is writable by others', file_name)
+        return None
+    try:
+        with open(file_name, 'rb') as cache_file:
+            signature, schema_info, dsa_info = pickle.load(cache_file)
+    except Exception as e:  # a corrupted cache file is ignored and rewritten
+        if log_enabled(ERROR):
+            log(ERROR, 'unable to read schema cache file <%s>: <%s>', file_name, e)
+        return None
+    if signature != cache_signature() or not isinstance(schema_info, (SchemaInfo, type(None))) or not isinstance(dsa_info, (DsaInfo, type(None))):
+        return None
+    if log_enabled(BASIC):
+        log(BASIC, 'schema <%s> read from cache file <%s>', name, file_name)
+    return schema_info, dsa_info
+
+
+def store_cached_info(name, schema_info, dsa_info, directory=None):
+    """
+    Stores the (schema info, dsa info) tuple in the cache, the file is replaced atomically so concurrent
+    processes never read a partial file. Returns the cache file name, None if the cache is not available
+    """
+    file_name = cache_file_name(name, directory)
+    if not file_name:
+        return None
+    temp_name = None
+    try:
+        if not os.path.isdir(os.path.dirname(file_name)):
+            os.makedirs(os.path.dirname(file_name), 0o700)
+        handle, temp_name = mkstemp(dir=os.path.dirname(file_name), suffix='.tmp')
+        with os.fdopen(handle, 'wb') as cache_file:
+            pickle.dump((cache_signature(), schema_info, dsa_info), cache_file, pickle.HIGHEST_PROTOCOL)
+        try:
+            os.replace(temp_name, file_name)
+        except AttributeError:  # Python 2
+            if os.path.exists(file_name):
+                os.remove(file_name)
+            os.rename(temp_name, file_name)
+    except (OSError, IOError, pickle.PicklingError) as e:  # the cache is an optimization, a read only file system is not an error
+        if log_enabled(ERROR):
+            log(ERROR, 'unable to write schema cache file <%s>: <%s>', file_name, e)
+        if temp_name and os.path.exists(temp_name):
+            os.remove(temp_name)
+        return None
+    if log_enabled(BASIC):
+        log(BASIC, 'schema <%s> written to cache file <%s>', name, file_name)
+    return file_name
+
+
+def load_offline_info(offline_schema):
+    """
+    Returns the (schema info, dsa info) tuple for an offline schema, from the precompiled cache if present.
+    The JSON definition is parsed only when the schema is not cached yet
+    """
+    if offline_schema not in OFFLINE_SCHEMAS:
+        raise LDAPDefinitionError('unknown offline schema ' + str(offline_schema))
+    cached = load_cached_info(offline_schema)
+    if cached:
+        return cached
+    module_name, schema_name, dsa_info_name = OFFLINE_SCHEMAS[offline_schema]
+    module = import_module('..protocol.schemas.' + module_name, __package__)
+    schema_info = SchemaInfo.from_json(getattr(module, schema_name))
+    dsa_info = DsaInfo.from_json(getattr(module, dsa_info_name))
+    store_cached_info(offline_schema, schema_info, dsa_info)
+    return schema_info, dsa_info
+
+
+def precompile_offline_schemas(directory=None):
+    """
+    Writes the cache files of all the offline schemas, so applications don't parse them at startup, and turns on the
+    cache in this process. The directory defaults to SCHEMA_CACHE_DIRECTORY or, when the cache is off, to
+    DEFAULT_SCHEMA_CACHE_DIRECTORY. Other processes use the files when SCHEMA_CACHE_DIRECTORY is set to the same directory
+    Returns the list of written files
+    """
+    directory = directory or get_config_parameter('SCHEMA_CACHE_DIRECTORY') or DEFAULT_SCHEMA_CACHE_DIRECTORY
+    set_config_parameter('SCHEMA_CACHE_DIRECTORY', directory)
+    written = []
+    for offline_schema in OFFLINE_SCHEMAS:
+        module_name, schema_name, dsa_info_name = OFFLINE_SCHEMAS[offline_schema]
+        module = import_module('..protocol.schemas.' + module_name, __package__)
+        file_name = store_cached_info(offline_schema, SchemaInfo.from_json(getattr(module, schema_name)), DsaInfo.from_json(getattr(module, dsa_info_name)), directory)
+        if file_name:
+            written.append(file_name)
+    return written
+
+
+def schema_timestamps(raw_attributes):
+    """
+    Returns the (createTimestamp, modifyTimestamp) raw values of a subschema entry, None if the server doesn't return them
+    """
+    create_time_stamp = modify_time_stamp = None
+    for attribute in raw_attributes:
+        if attribute.lower() == 'createtimestamp':
+            create_time_stamp = list(raw_attributes[attribute]) or None
+        elif attribute.lower() == 'modifytimestamp':
+            modify_time_stamp = list(raw_attributes[attribute]) or None
+    if not create_time_stamp and not modify_time_stamp:
+        return None
+    return create_time_stamp, modify_time_stamp
+
+
+def server_cache_name(server, schema_entry):
+    """
+    The cache name of the schema of a server, the same for all the Server objects of the server
+    """
+    key = '%s:%s/%s' % (server.host.lower(), server.port, schema_entry.lower())
+    return 'server-' + sha1(key.encode('utf-8')).hexdigest()
+
+
+def has_cached_server_schema(name):
+    """
+    Returns True if the schema of the server is cached in this process or in the schema cache directory, the timestamps
+    of the subschema entry are read from the server only to check a cached schema
+    """
+    with _server_schemas_lock:
+        if name in _server_schemas:
+            return True
+    file_name = cache_file_name(name)
+    return bool(file_name) and os.path.isfile(file_name)
+
+
+def load_server_schema(name, timestamps):
+    """
+    Returns the schema read from the server if it has not changed since it has been cached, None otherwise
+    Schemas are looked for in this process first and then in the schema cache directory
+    """
+    with _server_schemas_lock:
+        schema_info = _server_schemas.get(name)
+    if schema_info is None:
+        cached = load_cached_info(name)
+        if cached:
+            schema_info = cached[0]
+    if schema_info is None or schema_timestamps(schema_info.raw) != timestamps:
+        return None
+    with _server_schemas_lock:
+        schema_info = _server_schemas.setdefault(name, schema_info)
+    return schema_info
+
+
+def store_server_schema(name, schema_info):
+    """
+    Stores the schema read from the server in this process and in the schema cache directory
+    Schemas without timestamps can't be checked for changes and are not cached
+    """
+    if not schema_timestamps(schema_info.raw):
+        return
+    with _server_schemas_lock:
+        _server_schemas[name] = schema_info
+    store_cached_info(name, schema_info, None)
+
+
+def clear_server_schemas():
+    """
+    Forgets the schemas read from servers in this process, cache files are not removed
+    """
+    with _server_schemas_lock:
+        _server_schemas.clear()
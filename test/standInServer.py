@@ -0,0 +1,192 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import socket
+from threading import Thread, Lock
+from time import sleep
+
+from pyasn1.codec.ber import encoder
+
+from ldap3.protocol.rfc4511 import LDAPMessage, ProtocolOp, MessageID, BindResponse, SearchResultEntry, SearchResultDone, ModifyResponse, \
+    ResultCode, LDAPDN, LDAPString, PartialAttributeList, PartialAttribute, AttributeDescription, Vals, AttributeValue
+from ldap3.strategy.base import BaseStrategy
+from ldap3.utils.asn1 import decoder
+
+RESULT_SUCCESS = 0
+RESULT_SIZE_LIMIT_EXCEEDED = 4
+RESULT_NO_SUCH_OBJECT = 32
+RESULT_INSUFFICIENT_ACCESS_RIGHTS = 50
+SCOPE_BASE = 0
+
+
+def encode_message(message_id, name, operation):
+    message = LDAPMessage()
+    message['messageID'] = MessageID(message_id)
+    message['protocolOp'] = ProtocolOp().setComponentByName(name, operation)
+    return encoder.encode(message)
+
+
+def encode_result(result_class, result_code=RESULT_SUCCESS):
+    result = result_class()
+    result['resultCode'] = ResultCode(result_code)
+    result['matchedDN'] = LDAPDN('')
+    result['diagnosticMessage'] = LDAPString('')
+    return result
+
+
+def encode_entry(dn, attributes):
+    entry = SearchResultEntry()
+    entry['object'] = LDAPDN(dn)
+    attribute_list = PartialAttributeList()
+    for position, (name, values) in enumerate(attributes.items()):
+        attribute = PartialAttribute()
+        attribute['type'] = AttributeDescription(name)
+        vals = Vals()
+        for index, value in enumerate(values):
+            vals.setComponentByPosition(index, AttributeValue(value))
+        attribute['vals'] = vals
+        attribute_list.setComponentByPosition(position, attribute)
+    entry['attributes'] = attribute_list
+    return entry
+
+
+class StandInServer(object):
+    """
+    LDAP server for the tests that run without a real server. It answers bind, search and modify requests from the entries
+    dict (dn -> attributes) and records the requests received. Abandon requests are recorded and not answered.
+    The requests after the bind are queued and answered together when batch requests are received or when no other request
+    is received in a short time, so the size of each answered batch tells if the client sent the requests without waiting
+    for the responses. With reverse=True a batch is answered starting from the last request, with delay the server waits
+    before answering each batch, with message_delay the messages of a search response are sent one at a time
+    """
+    def __init__(self, entries=None, failing_dn=None, batch=1, reverse=False, delay=0, message_delay=0):
+        self.entries = entries or dict()
+        self.message_delay = message_delay  # seconds between the messages of a search response
+        self.failing_dn = failing_dn  # modify of this dn fails
+        self.batch = batch
+        self.reverse = reverse
+        self.delay = delay
+        self.requests = []  # (operation, dn or abandoned message id) in the order answered
+        self.batches = []  # number of requests answered together
+        self.lock = Lock()
+        self.listening_socket = socket.socket()
+        self.listening_socket.bind(('127.0.0.1', 0))
+        self.listening_socket.listen(5)
+        self.port = self.listening_socket.getsockname()[1]
+        thread = Thread(target=self.accept)
+        thread.daemon = True
+        thread.start()
+
+    def close(self):
+        self.listening_socket.close()
+
+    def accept(self):
+        while True:
+            try:
+                client_socket, _ = self.listening_socket.accept()
+            except (OSError, socket.error):  # listening socket closed
+                return
+            thread = Thread(target=self.serve, args=(client_socket, ))
+            thread.daemon = True
+            thread.start()
+
+    def serve(self, client_socket):
+        client_socket.settimeout(0.2)
+        data = b''
+        queue = []
+        while True:
+            try:
+                received = client_socket.recv(4096)
+            except socket.timeout:
+                self.answer(client_socket, queue)
+                continue
+            except (OSError, socket.error):
+                return
+            if not received:
+                client_socket.close()
+                return
+            data += received
+            while True:
+                length = BaseStrategy.compute_ldap_message_size(data)
+                if length == -1 or len(data) < length:
+                    break
+                message, _ = decoder.decode(data[:length], asn1Spec=LDAPMessage())
+                data = data[length:]
+                operation = message['protocolOp'].getName()
+                if operation == 'bindRequest':
+                    client_socket.sendall(encode_message(int(message['messageID']), 'bindResponse', encode_result(BindResponse)))
+                elif operation == 'unbindRequest':
+                    client_socket.close()
+                    return
+                elif operation == 'abandonRequest':
+                    with self.lock:
+                        self.requests.append(('abandon', int(message['protocolOp'][operation])))
+                else:
+                    queue.append(message)
+                    if len(queue) >= self.batch:
+                        self.answer(client_socket, queue)
+
+    def answer(self, client_socket, queue):
+        if not queue:
+            return
+        if self.delay:
+            sleep(self.delay)
+        with self.lock:
+            self.batches.append(len(queue))
+        for message in reversed(queue) if self.reverse else queue:
+            message_id = int(message['messageID'])
+            operation = message['protocolOp'].getName()
+            if operation == 'searchRequest':
+                messages = self.search(message_id, message['protocolOp'][operation])
+                if self.message_delay:
+                    for encoded_message in messages:
+                        client_socket.sendall(encoded_message)
+                        sleep(self.message_delay)
+                else:
+                    client_socket.sendall(b''.join(messages))
+            elif operation == 'modifyRequest':
+                dn = str(message['protocolOp'][operation]['object'])
+                with self.lock:
+                    self.requests.append(('modify', dn))
+                client_socket.sendall(encode_message(message_id, 'modifyResponse', encode_result(ModifyResponse, RESULT_INSUFFICIENT_ACCESS_RIGHTS if dn == self.failing_dn else RESULT_SUCCESS)))
+        del queue[:]
+
+    def search(self, message_id, request):
+        base = str(request['baseObject'])
+        size_limit = int(request['sizeLimit'])
+        with self.lock:
+            self.requests.append(('search', base))
+        if int(request['scope']) == SCOPE_BASE:
+            found = [dn for dn in self.entries if dn.lower() == base.lower()]
+            if not found and base:
+                return [encode_message(message_id, 'searchResDone', encode_result(SearchResultDone, RESULT_NO_SUCH_OBJECT))]
+        else:
+            found = [dn for dn in self.entries if dn.lower().endswith(base.lower())]
+        result_code = RESULT_SUCCESS
+        if size_limit and len(found) > size_limit:
+            found = found[:size_limit]
+            result_code = RESULT_SIZE_LIMIT_EXCEEDED
+        return [encode_message(message_id, 'searchResEntry', encode_entry(dn, self.entries[dn])) for dn in found] + \
+               [encode_message(message_id, 'searchResDone', encode_result(SearchResultDone, result_code))]
@@ -0,0 +1,85 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import unittest
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
+
+from ldap3 import Server, Connection, ASYNCIO, BASE, DSA
+from test.standInServer import StandInServer
+
+ENTRIES = {'': {'namingContexts': ['o=test'], 'supportedLDAPVersion': ['3']},
+           'cn=user1,o=test': {'cn': ['user1']},
+           'cn=user2,o=test': {'cn': ['user2']}}
+DELAY = 0.3  # seconds waited by the server before answering each request
+TICK = 0.01
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        if sys.version_info < (3, 5):
+            self.skipTest('the ASYNCIO strategy needs Python 3.5+')
+        self.server = StandInServer(ENTRIES, delay=DELAY)
+        self.loop = asyncio.new_event_loop()
+        self.connection = Connection(Server('127.0.0.1', port=self.server.port, get_info=DSA), client_strategy=ASYNCIO)
+        self.ticks = 0
+
+    def tearDown(self):
+        if not self.connection.closed:
+            self.connection.unbind()
+        self.loop.close()
+        self.server.close()
+
+    # coroutines are run without async/await syntax, so this module can be collected by Python < 3.5
+    def tick(self):
+        self.ticks += 1
+        self.ticker = self.loop.call_later(TICK, self.tick)
+
+    def run_ticking(self, coroutine):
+        self.ticker = self.loop.call_soon(self.tick)
+        try:
+            return self.loop.run_until_complete(coroutine)
+        finally:
+            self.ticker.cancel()
+
+    def test_connect_reads_server_info_without_blocking_the_loop(self):
+        self.assertTrue(self.run_ticking(self.connection.strategy.connect()))
+        self.assertEqual(self.connection.server.info.naming_contexts, ['o=test'])
+        self.assertGreater(self.ticks, DELAY / TICK / 2)  # the loop kept running while waiting for the root DSE
+
+    def test_searches_during_bind_reading_server_info(self):
+        self.loop.run_until_complete(self.connection.strategy.connect(read_server_info=False))
+        operations = [asyncio.ensure_future(self.connection.strategy.bind(), loop=self.loop)]
+        operations.extend(asyncio.ensure_future(self.connection.strategy.search(dn, '(objectClass=*)', BASE), loop=self.loop) for dn in ['cn=user1,o=test', 'cn=user2,o=test'])
+        results = self.run_ticking(asyncio.gather(*operations))
+        self.assertTrue(results[0][0])
+        self.assertEqual(self.connection.server.info.naming_contexts, ['o=test'])
+        self.assertEqual([response[0]['dn'] for status, result, response, request in results[1:]], ['cn=user1,o=test', 'cn=user2,o=test'])
+        self.assertGreater(self.ticks, DELAY / TICK / 2)
+        self.assertEqual(self.connection.strategy._responses, dict())
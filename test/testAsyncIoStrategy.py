@@ -0,0 +1,77 @@
+"""
+"""
+
+# Created on 2025.03.02
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import unittest
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
+
+from test.config import test_server, test_user, test_password, test_base, test_server_type, test_strategy
+from ldap3 import Server, Connection, ASYNCIO, BASE, NONE, MOCK_SYNC, MOCK_ASYNC
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        if sys.version_info < (3, 5):
+            self.skipTest('the ASYNCIO strategy needs Python 3.5+')
+        if test_server_type == 'NONE' or test_strategy in [MOCK_SYNC, MOCK_ASYNC]:
+            self.skipTest('needs a real LDAP server')
+        self.loop = asyncio.new_event_loop()
+        self.connection = Connection(Server(test_server if not isinstance(test_server, (list, tuple)) else test_server[0], get_info=NONE), user=test_user, password=test_password, client_strategy=ASYNCIO)
+
+    def tearDown(self):
+        if not self.connection.closed:
+            self.connection.unbind()
+        self.loop.close()
+
+    # coroutines are run without async/await syntax, so this module can be collected by Python < 3.5
+    def test_asyncio_bind(self):
+        self.loop.run_until_complete(self.connection.strategy.connect(read_server_info=False))
+        status, result, response, request = self.loop.run_until_complete(self.connection.strategy.bind(read_server_info=False))
+        self.assertTrue(status)
+        self.assertEqual(result['description'], 'success')
+        self.assertTrue(self.connection.bound)
+
+    def test_asyncio_concurrent_searches(self):
+        self.loop.run_until_complete(self.connection.strategy.connect(read_server_info=False))
+        self.loop.run_until_complete(self.connection.strategy.bind(read_server_info=False))
+        searches = [asyncio.ensure_future(self.connection.strategy.search(test_base, '(objectClass=*)', BASE), loop=self.loop) for _ in range(10)]
+        results = self.loop.run_until_complete(asyncio.gather(*searches))
+        self.assertEqual(len(results), 10)
+        for status, result, response, request in results:
+            self.assertEqual(result['description'], 'success')
+            self.assertEqual(len(response), 1)
+        self.assertEqual(self.connection.strategy._responses, dict())
+
+    def test_asyncio_get_response(self):
+        self.connection.open(read_server_info=False)
+        self.connection.bind(read_server_info=False)
+        message_id = self.connection.search(test_base, '(objectClass=*)', BASE)
+        response, result = self.connection.get_response(message_id)
+        self.assertEqual(result['description'], 'success')
+        self.assertEqual(len(response), 1)
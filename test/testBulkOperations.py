@@ -0,0 +1,82 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from ldap3 import Server, Connection, SYNC, MODIFY_ADD, NONE
+from ldap3.extend.bulkOperations import read_entries, modify_entries
+from test.standInServer import StandInServer
+
+GROUPS = ['cn=group1,o=test', 'cn=group2,o=test', 'cn=group3,o=test']
+
+
+def group_entries(members):
+    return dict((group, {'member': members[group]} if group in members else dict()) for group in GROUPS)
+
+
+class Test(unittest.TestCase):
+    def connect(self, server):
+        self.server = server
+        self.connection = Connection(Server('127.0.0.1', port=server.port, get_info=NONE), client_strategy=SYNC, auto_bind=True)
+
+    def tearDown(self):
+        self.connection.unbind()
+        self.server.close()
+
+    def test_read_entries_pipelined(self):
+        server = StandInServer(group_entries({'cn=group1,o=test': ['cn=user1,o=test'], 'cn=group3,o=test': ['cn=user1,o=test', 'cn=user2,o=test']}), batch=len(GROUPS))
+        self.connect(server)
+        entries = read_entries(self.connection, GROUPS, ['member'])
+        self.assertEqual(server.batches, [3])  # all the searches are sent before the first response is read
+        self.assertEqual([dn for dn, _, _ in entries], GROUPS)
+        self.assertEqual(entries[0][2]['member'], ['cn=user1,o=test'])
+        self.assertEqual(entries[1][2]['member'], [])
+        self.assertEqual(entries[2][2]['member'], ['cn=user1,o=test', 'cn=user2,o=test'])
+
+    def test_modify_entries_pipelined(self):
+        server = StandInServer(group_entries(dict()), failing_dn='cn=group2,o=test', batch=len(GROUPS))
+        self.connect(server)
+        results = modify_entries(self.connection, [(group, {'member': (MODIFY_ADD, ['cn=user1,o=test'])}) for group in GROUPS], stop_at_first_error=False)
+        self.assertEqual(server.batches, [3])
+        self.assertEqual([result['description'] for result in results], ['success', 'insufficientAccessRights', 'success'])
+
+    def test_modify_entries_stop_at_first_error(self):
+        server = StandInServer(group_entries(dict()), failing_dn='cn=group2,o=test', batch=len(GROUPS))
+        self.connect(server)
+        results = modify_entries(self.connection, [(group, {'member': (MODIFY_ADD, ['cn=user1,o=test'])}) for group in GROUPS])
+        self.assertEqual(server.batches, [1, 1])  # each modify is sent after the previous response
+        self.assertEqual([result['description'] for result in results], ['success', 'insufficientAccessRights'])
+        self.assertEqual(server.requests, [('modify', 'cn=group1,o=test'), ('modify', 'cn=group2,o=test')])
+
+    def test_ad_add_members_to_groups(self):
+        server = StandInServer(group_entries({'cn=group1,o=test': ['cn=user1,o=test']}), failing_dn='cn=group2,o=test', batch=len(GROUPS))
+        self.connect(server)
+        self.assertFalse(self.connection.extend.microsoft.add_members_to_groups(['cn=user1,o=test', 'cn=user2,o=test'], GROUPS))
+        self.assertEqual(server.batches, [3, 1, 1])  # reads are pipelined, modifies stop at the first error
+        self.assertEqual(server.requests, [('search', 'cn=group1,o=test'),
+                                           ('search', 'cn=group2,o=test'),
+                                           ('search', 'cn=group3,o=test'),
+                                           ('modify', 'cn=group1,o=test'),
+                                           ('modify', 'cn=group2,o=test')])
@@ -24,8 +24,15 @@
 # If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
 
-from ldap3.utils.ciDict import CaseInsensitiveDict
+from ldap3.utils.ciDict import CaseInsensitiveDict, _keys_cache
+from ldap3.operation.search import decode_attribute_name
+
+ENTRY_ATTRIBUTE_NAMES = [b'objectClass', b'cn', b'sn', b'givenName', b'mail', b'telephoneNumber', b'uid', b'description', b'memberOf', b'displayName']
 
 
 class Test(unittest.TestCase):
@@ -319,3 +326,56 @@ class Test(unittest.TestCase):
         self.assertEqual(cid['userCertificate;binary'], value)
         self.assertEqual(cid['userCertificate'], value)
         self.assertEqual(cid['usercertificate'], value)
+
+    def test_keys_shared_between_dicts(self):
+        names = dict()
+        first = CaseInsensitiveDict()
+        second = CaseInsensitiveDict()
+        first[decode_attribute_name(b'givenName', names)] = 1
+        second[decode_attribute_name(b'givenName', names)] = 2
+        self.assertTrue(list(first.keys())[0] is list(second.keys())[0])
+        self.assertTrue(list(first.keys())[0] in _keys_cache)
+        self.assertFalse(hasattr(first, '__dict__'))
+
+    def test_arbitrary_keys_not_cached(self):
+        cid = CaseInsensitiveDict()
+        cid['notAnAttributeName'] = 1
+        self.assertEqual(cid['NOTANATTRIBUTENAME'], 1)
+        self.assertTrue('NotAnAttributeName' in cid)
+        self.assertFalse('notAnAttributeName' in _keys_cache)
+        self.assertFalse('NOTANATTRIBUTENAME' in _keys_cache)
+
+    def test_memory_per_100k_entries(self):
+        if not tracemalloc:
+            return
+
+        def two_dicts_entries(count):  # layout of entries without folded key sharing: two dicts and new key objects per entry
+            entries = []
+            for _ in range(count):
+                store = dict()
+                keymap = dict()
+                for name in ENTRY_ATTRIBUTE_NAMES:
+                    key = name.decode('utf-8')
+                    store[key] = None
+                    keymap[key.lower()] = key
+                entries.append((store, keymap))
+            return entries
+
+        def case_insensitive_entries(count):
+            names = dict()
+            entries = []
+            for _ in range(count):
+                entry = CaseInsensitiveDict()
+                for name in ENTRY_ATTRIBUTE_NAMES:
+                    entry[decode_attribute_name(name, names)] = None
+                entries.append(entry)
+            return entries
+
+        memory = []
+        for builder in (two_dicts_entries, case_insensitive_entries):
+            tracemalloc.start()
+            entries = builder(100000)
+            memory.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+            del entries
+        self.assertTrue(memory[1] < memory[0], 'memory per 100k entries: %d bytes (two dicts), %d bytes (CaseInsensitiveDict)' % tuple(memory))
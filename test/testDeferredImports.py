@@ -0,0 +1,59 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import subprocess
+import sys
+import unittest
+from os import path
+
+from ldap3 import Server, Connection, MOCK_SYNC, LDIF, SAFE_SYNC
+
+LOADED_MODULES = "import sys; %s; print(' '.join(sorted(sys.modules)))"
+
+
+def loaded_modules(statement):
+    process = subprocess.Popen([sys.executable, '-c', LOADED_MODULES % statement], cwd=path.dirname(path.dirname(path.abspath(__file__))), stdout=subprocess.PIPE, universal_newlines=True)
+    output, _ = process.communicate()
+    return output.split()
+
+
+class Test(unittest.TestCase):
+    def test_sync_connection_imports(self):
+        modules = loaded_modules("from ldap3 import Server, Connection; Connection(Server('localhost'))")
+        self.assertIn('ldap3.strategy.sync', modules)
+        for module in modules:
+            self.assertFalse(module.startswith(('ldap3.strategy.mock', 'ldap3.strategy.reusable', 'ldap3.strategy.asynchronous', 'ldap3.extend.microsoft', 'ldap3.extend.novell', 'ldap3.extend.standard', 'ldap3.protocol.sasl.digestMd5', 'ldap3.protocol.sasl.kerberos', 'Cryptodome')), module)
+
+    def test_deferred_imports(self):
+        modules = loaded_modules("from ldap3 import Server, Connection, MOCK_SYNC; connection = Connection(Server('localhost'), client_strategy=MOCK_SYNC); connection.extend.standard")
+        self.assertIn('ldap3.strategy.mockSync', modules)
+        self.assertNotIn('ldap3.extend.standard.whoAmI', modules)
+        modules = loaded_modules("from ldap3 import Server, Connection, MOCK_SYNC; connection = Connection(Server('localhost'), client_strategy=MOCK_SYNC); connection.open(); connection.extend.standard.who_am_i()")
+        self.assertIn('ldap3.extend.standard.whoAmI', modules)
+
+    def test_strategies(self):
+        for strategy in [MOCK_SYNC, LDIF, SAFE_SYNC]:
+            connection = Connection(Server('localhost'), client_strategy=strategy)
+            self.assertEqual(connection.strategy_type, strategy)
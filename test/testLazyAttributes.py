@@ -0,0 +1,94 @@
+"""
+"""
+
+# Created on 2025.03.12
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+from copy import deepcopy
+
+from ldap3 import set_config_parameter, get_config_parameter
+from ldap3.operation.search import search_result_entry_response_to_dict_fast, LazyAttributesDict, _UndecodedValues, get_attribute_names
+from ldap3.protocol.rfc4511 import LDAPMessage, ProtocolOp, SearchResultEntry, LDAPDN, PartialAttributeList, PartialAttribute, AttributeDescription, Vals, AttributeValue
+from ldap3.protocol.schemas.edir914 import edir_9_1_4_schema
+from ldap3.protocol.rfc4512 import SchemaInfo
+from ldap3.utils.asn1 import encode, decode_message_fast
+
+
+def entry_payload(attributes):
+    entry = SearchResultEntry()
+    entry['object'] = LDAPDN('cn=lazy,o=test')
+    attribute_list = PartialAttributeList()
+    for position, (name, values) in enumerate(attributes):
+        attribute = PartialAttribute()
+        attribute['type'] = AttributeDescription(name)
+        vals = Vals()
+        for value_position, value in enumerate(values):
+            vals.setComponentByPosition(value_position, AttributeValue(value))
+        attribute['vals'] = vals
+        attribute_list.setComponentByPosition(position, attribute)
+    entry['attributes'] = attribute_list
+    message = LDAPMessage()
+    message['messageID'] = 1
+    message['protocolOp'] = ProtocolOp().setComponentByName('searchResEntry', entry)
+    return decode_message_fast(encode(message))['payload']
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.schema = SchemaInfo.from_json(edir_9_1_4_schema)
+        self.payload = entry_payload([('cn', [b'lazy']), ('loginGraceLimit', [b'6']), ('description', [b'first', b'second'])])
+        self.lazy_attribute_decoding = get_config_parameter('LAZY_ATTRIBUTE_DECODING')
+
+    def tearDown(self):
+        set_config_parameter('LAZY_ATTRIBUTE_DECODING', self.lazy_attribute_decoding)
+
+    def decode(self, lazy):
+        set_config_parameter('LAZY_ATTRIBUTE_DECODING', lazy)
+        return search_result_entry_response_to_dict_fast(self.payload, self.schema, None, True)
+
+    def test_lazy_attributes_decoded_on_access(self):
+        entry = self.decode(True)
+        self.assertTrue(isinstance(entry['attributes'], LazyAttributesDict))
+        self.assertTrue(isinstance(entry['attributes']._store['loginGraceLimit'], _UndecodedValues))
+        self.assertEqual(entry['attributes']['LOGINGRACELIMIT'], 6)
+        self.assertEqual(entry['attributes']._store['loginGraceLimit'], 6)
+        self.assertTrue(isinstance(entry['attributes']._store['description'], _UndecodedValues))
+        self.assertTrue('description' in entry['attributes'])
+        self.assertEqual(len(entry['attributes']), 3)
+
+    def test_lazy_attributes_equal_to_eager(self):
+        eager = self.decode(False)
+        lazy = self.decode(True)
+        self.assertEqual(lazy['dn'], eager['dn'])
+        self.assertEqual(lazy['attributes'], eager['attributes'])
+        self.assertEqual(lazy['raw_attributes'], eager['raw_attributes'])
+        self.assertEqual(dict(lazy['attributes']), dict(eager['attributes']))
+        self.assertEqual(deepcopy(lazy['attributes']), eager['attributes'])
+
+    def test_attribute_names_shared_with_schema(self):
+        first = self.decode(False)
+        second = self.decode(True)
+        schema_name = self.schema.attribute_types['loginGraceLimit'].name[0]
+        self.assertTrue(get_attribute_names(self.schema)[b'loginGraceLimit'] is schema_name)
+        self.assertTrue([name for name in first['attributes'] if name == 'loginGraceLimit'][0] is schema_name)
+        self.assertTrue([name for name in second['raw_attributes'] if name == 'loginGraceLimit'][0] is schema_name)
@@ -22,7 +22,7 @@
 
 import unittest
 
-from ldap3 import SchemaInfo, DsaInfo, Server, Connection, MOCK_SYNC
+from ldap3 import SchemaInfo, DsaInfo, Server, Connection, MOCK_SYNC, LEVEL, SUBTREE, MODIFY_REPLACE
 from ldap3.operation import search
 from ldap3.core.exceptions import LDAPSizeLimitExceededResult
 from ldap3.protocol.schemas.edir914 import edir_9_1_4_schema, edir_9_1_4_dsa_info
@@ -63,6 +63,61 @@ class Test(unittest.TestCase):
 
         self.assertEqual(actual, expected)
 
+    def test_not_and_evaluates_correctly_when_no_entry_matches_both_operands(self):
+        actual = len(self._evaluate_filter('(!(&(revision=1)(userPassword=test2)))'))
+        expected = 4  # the three users and the schema entry
+
+        self.assertEqual(actual, expected)
+
+    def test_not_ordering_evaluates_undefined_when_attribute_is_missing(self):
+        actual = len(self._evaluate_filter('(!(revision>=2))'))
+        expected = 1
+
+        self.assertEqual(actual, expected)
+
+    def test_compiled_filter_is_cached(self):
+        hits = self.connection.strategy._filter_cache.hits
+        compiled = self.connection.strategy.compile_filter('(&(revision=1)(userPassword=test1))')
+        self.assertIs(self.connection.strategy.compile_filter('(&(revision=1)(userPassword=test1))'), compiled)
+        self.assertEqual(self.connection.strategy._filter_cache.hits, hits + 1)
+
+    def test_search_scope_uses_dit_tree(self):
+        connection = Connection(Server('MockTree'), user='cn=admin,o=tree', password='admin', client_strategy=MOCK_SYNC)
+        connection.strategy.add_entry('cn=admin,o=tree', {'userPassword': 'admin'})
+        connection.strategy.add_entry('ou=people,o=tree', {'description': 'people'})
+        connection.strategy.add_entry('cn=user1,ou=people,o=tree', {'sn': 'One'})
+        connection.strategy.add_entry('cn=user2,ou=people,o=tree', {'sn': 'Two'})
+        connection.strategy.add_entry('cn=user3,ou=missing,o=tree', {'sn': 'Three'})  # parent not in the DIT
+        connection.strategy.add_entry('cn=user4,ou=xo=tree', {'sn': 'Four'})  # not a descendant of o=tree
+        connection.bind()
+        connection.search('o=tree', '(entryDN=*)', search_scope=LEVEL)
+        self.assertEqual(sorted(entry['dn'] for entry in connection.response), ['cn=admin,o=tree', 'ou=people,o=tree'])
+        connection.search('o=tree', '(sn=*)', search_scope=SUBTREE)
+        self.assertEqual(len(connection.response), 3)
+        connection.search('ou=missing,o=tree', '(sn=*)', search_scope=SUBTREE)
+        self.assertEqual(len(connection.response), 1)
+        connection.delete('cn=user3,ou=missing,o=tree')
+        connection.search('ou=missing,o=tree', '(sn=*)', search_scope=SUBTREE)
+        self.assertEqual(connection.result['description'], 'noSuchObject')
+        connection.modify_dn('cn=user2,ou=people,o=tree', 'cn=user2', new_superior='o=tree')
+        connection.search('o=tree', '(sn=two)', search_scope=LEVEL)
+        self.assertEqual([entry['dn'] for entry in connection.response], ['cn=user2,o=tree'])
+        connection.unbind()
+
+    def test_equality_index_is_updated_on_modify(self):
+        connection = Connection(Server('MockIndex'), user='cn=admin,o=index', password='admin', client_strategy=MOCK_SYNC)
+        connection.strategy.add_entry('cn=admin,o=index', {'userPassword': 'admin'})
+        connection.strategy.add_entry('cn=user1,o=index', {'sn': 'Before'})
+        connection.bind()
+        connection.modify('cn=user1,o=index', {'sn': [(MODIFY_REPLACE, ['After'])]})
+        connection.search('o=index', '(sn=before)', search_scope=SUBTREE)
+        self.assertEqual(len(connection.response), 0)
+        connection.search('o=index', '(sn=AFTER)', search_scope=SUBTREE)
+        self.assertEqual(len(connection.response), 1)
+        connection.search('o=index', '(!(sn=after))', search_scope=SUBTREE, attributes=['sn'])
+        self.assertEqual([entry['dn'] for entry in connection.response], ['cn=admin,o=index'])
+        connection.unbind()
+
     # def test_raises_size_limit_exceeded_exception(self):
     #     connection = Connection(self.server, user='cn=user1,ou=test', password='test1', client_strategy=MOCK_SYNC, raise_exceptions=True)
     #     # create fixtures
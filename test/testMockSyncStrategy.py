@@ -26,9 +26,9 @@
 
 import unittest
 
-from ldap3 import Server, Connection, MOCK_SYNC, MODIFY_ADD, MODIFY_REPLACE, MODIFY_DELETE, OFFLINE_EDIR_9_1_4,\
+from ldap3 import Server, Connection, MOCK_SYNC, MODIFY_ADD, MODIFY_REPLACE, MODIFY_DELETE, OFFLINE_EDIR_9_1_4, Reader, ObjectDef, AttrDef,\
     BASE, LEVEL, SUBTREE, AUTO_BIND_NO_TLS, NONE
-from ldap3.core.exceptions import LDAPInvalidCredentialsResult, LDAPNoSuchObjectResult
+from ldap3.core.exceptions import LDAPInvalidCredentialsResult, LDAPNoSuchObjectResult, LDAPInvalidDnError
 from ldap3.protocol.rfc4512 import SchemaInfo, DsaInfo
 from ldap3.protocol.schemas.edir914 import edir_9_1_4_dsa_info, edir_9_1_4_schema
 from test.config import random_id
@@ -1509,3 +1509,67 @@ class Test(unittest.TestCase):
             response.append(resp)
 
         self.assertEqual(len(response), 5)
+
+    def test_search_entries_share_attributes_map(self):
+        self.connection_2.bind()
+        self.connection_2.search('o=lab', '(sn=user*)', search_scope=SUBTREE, attributes=['sn', 'revision'])
+        entries = self.connection_2.entries
+        self.assertTrue(len(entries) > 1)
+        self.assertEqual(entries[1].sn.values, self.connection_2.response[1]['attributes']['sn'])
+        self.assertEqual(entries[1].entry_raw_attributes, self.connection_2.response[1]['raw_attributes'])
+        self.assertFalse(entries[1].entry_raw_attributes['sn'] is self.connection_2.response[1]['raw_attributes']['sn'])
+        self.assertEqual(len(entries[0].entry_cursor._attributes_maps), 1)
+
+    def test_search_dereference_dn_once_per_query(self):
+        self.connection_2.bind()
+        self.connection_2.strategy.add_entry('cn=person1,o=lab', {'objectClass': ['person'], 'cn': 'person1', 'sn': 'person1_sn'})
+        self.connection_2.strategy.add_entry('cn=person2,o=lab', {'objectClass': ['person'], 'cn': 'person2', 'sn': 'person2_sn'})
+        self.connection_2.strategy.add_entry('cn=group1,o=lab', {'objectClass': ['groupOfNames'], 'cn': 'group1', 'member': ['cn=person1,o=lab', 'cn=person2,o=lab']})
+        self.connection_2.strategy.add_entry('cn=group2,o=lab', {'objectClass': ['groupOfNames'], 'cn': 'group2', 'member': ['cn=person1,o=lab']})
+        group = ObjectDef('groupOfNames', self.connection_2)
+        group -= 'member'
+        group += AttrDef('member', dereference_dn=ObjectDef('person', self.connection_2))
+        reader = Reader(self.connection_2, group, 'o=lab')
+        reader.search()
+        self.assertEqual(len(reader.entries), 2)
+        members = dict((entry.cn.value, entry.member.values) for entry in reader.entries)
+        self.assertEqual(sorted(member.entry_dn for member in members['group1']), ['cn=person1,o=lab', 'cn=person2,o=lab'])
+        self.assertTrue(members['group2'][0] in members['group1'])  # same Entry object
+        self.assertEqual(members['group2'][0].sn.value, 'person1_sn')
+
+    def test_search_paged_prefetch(self):
+        self.connection_1.bind()
+        expected = [resp['dn'] for resp in self.connection_1.extend.standard.paged_search('o=lab', '(cn=*)', search_scope=SUBTREE, attributes=['cn', 'revision'], paged_size=2)]
+        response = [resp['dn'] for resp in self.connection_1.extend.standard.paged_search('o=lab', '(cn=*)', search_scope=SUBTREE, attributes=['cn', 'revision'], paged_size=2, prefetch=2)]
+        self.assertEqual(len(response), 5)
+        self.assertEqual(response, expected)
+
+    def test_search_paged_prefetch_closed(self):
+        self.connection_1.bind()
+        generator = self.connection_1.extend.standard.paged_search('o=lab', '(cn=*)', search_scope=SUBTREE, attributes=['cn', 'revision'], paged_size=2, prefetch=1)
+        next(generator)
+        generator.close()
+        self.assertEqual(len(list(self.connection_1.extend.standard.paged_search('o=lab', '(cn=*)', search_scope=SUBTREE, attributes=['cn', 'revision'], paged_size=2, prefetch=1))), 5)
+
+    def test_add_members_to_groups(self):
+        self.connection_3.strategy.add_entry('cn=group1,o=lab', {'objectClass': 'group', 'member': ['CN=user1,ou=test,o=lab']})
+        self.connection_3.strategy.add_entry('cn=group2,o=lab', {'objectClass': 'group'})
+        self.connection_3.bind()
+        self.assertTrue(self.connection_3.extend.microsoft.add_members_to_groups(['cn=user1,ou=test,o=lab', 'cn=user2,ou=test,o=lab'], ['cn=group1,o=lab', 'cn=group2,o=lab']))
+        self.connection_3.search('o=lab', '(objectClass=group)', search_scope=SUBTREE, attributes=['member'])
+        members = dict((resp['dn'], sorted(resp['attributes']['member'])) for resp in self.connection_3.response)
+        self.assertEqual(members['cn=group1,o=lab'], ['CN=user1,ou=test,o=lab', 'cn=user2,ou=test,o=lab'])
+        self.assertEqual(members['cn=group2,o=lab'], ['cn=user1,ou=test,o=lab', 'cn=user2,ou=test,o=lab'])
+        self.assertTrue(self.connection_3.extend.microsoft.remove_members_from_groups(['cn=user2,ou=test,o=lab', 'cn=user3,ou=test,o=lab'], ['cn=group1,o=lab', 'cn=group2,o=lab'], fix=True))
+        self.connection_3.search('o=lab', '(objectClass=group)', search_scope=SUBTREE, attributes=['member'])
+        members = dict((resp['dn'], sorted(resp['attributes']['member'])) for resp in self.connection_3.response)
+        self.assertEqual(members['cn=group1,o=lab'], ['CN=user1,ou=test,o=lab'])
+        self.assertEqual(members['cn=group2,o=lab'], ['cn=user1,ou=test,o=lab'])
+
+    def test_add_members_to_groups_not_found(self):
+        self.connection_3.strategy.add_entry('cn=group1,o=lab', {'objectClass': 'group'})
+        self.connection_3.bind()
+        with self.assertRaises(LDAPInvalidDnError):
+            self.connection_3.extend.microsoft.add_members_to_groups(['cn=user1,ou=test,o=lab'], ['cn=group1,o=lab', 'cn=group9,o=lab'])
+        self.connection_3.search('cn=group1,o=lab', '(objectClass=group)', search_scope=BASE, attributes=['member'])
+        self.assertFalse(self.connection_3.response[0]['attributes'].get('member'))  # no group modified before reading all groups
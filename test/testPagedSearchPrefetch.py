@@ -0,0 +1,85 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+from threading import Thread, Event, current_thread, enumerate as enumerate_threads
+from time import sleep
+
+from ldap3 import Server, Connection, SYNC, BASE, NONE
+from ldap3.core.exceptions import LDAPNoSuchObjectResult
+from test.standInServer import StandInServer
+
+ENTRIES = dict(('cn=user%d,o=test' % index, {'cn': ['user%d' % index]}) for index in range(1, 5))
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer(ENTRIES)
+        self.connection = Connection(Server('127.0.0.1', port=self.server.port, get_info=NONE), client_strategy=SYNC, raise_exceptions=True, auto_bind=True)
+
+    def tearDown(self):
+        self.connection.unbind()
+        self.server.close()
+
+    def assert_prefetch_thread_ended(self):
+        self.assertFalse([thread for thread in enumerate_threads() if thread.name == 'paged search prefetch'])
+
+    def test_size_limit_exceeded_while_prefetching(self):
+        entries = [response['dn'] for response in self.connection.extend.standard.paged_search('o=test', '(objectClass=*)', size_limit=2, paged_size=2, prefetch=2)]
+        self.assertEqual(len(entries), 2)  # the entries received before the size limit, sizeLimitExceeded is not raised
+        self.assertEqual(self.connection.result['description'], 'sizeLimitExceeded')
+        self.assert_prefetch_thread_ended()
+
+    def test_error_raised_while_prefetching(self):
+        generator = self.connection.extend.standard.paged_search('cn=missing,o=test', '(objectClass=*)', BASE, paged_size=2, prefetch=2)
+        self.assertRaises(LDAPNoSuchObjectResult, list, generator)
+        self.assert_prefetch_thread_ended()
+
+    def test_operation_of_other_thread_while_reading_page(self):
+        page_requested = Event()
+
+        class SlowConnection(Connection):
+            def search(self, *args, **kwargs):
+                result = Connection.search(self, *args, **kwargs)
+                if current_thread().name == 'paged search prefetch':
+                    page_requested.set()
+                    sleep(0.1)  # the page is not read yet
+                return result
+
+        self.connection.unbind()
+        self.connection = SlowConnection(Server('127.0.0.1', port=self.server.port, get_info=NONE), client_strategy=SYNC, raise_exceptions=True, auto_bind=True)
+        entries = []
+
+        def consume():
+            entries.extend(response['dn'] for response in self.connection.extend.standard.paged_search('o=test', '(objectClass=*)', paged_size=2, prefetch=2))
+
+        thread = Thread(target=consume)
+        thread.start()
+        page_requested.wait(1)
+        self.connection.search('cn=user1,o=test', '(objectClass=*)', BASE)  # waits for the page to be read
+        self.assertEqual([response['dn'] for response in self.connection.response], ['cn=user1,o=test'])
+        thread.join()
+        self.assertEqual(sorted(entries), sorted(ENTRIES))
+        self.assert_prefetch_thread_ended()
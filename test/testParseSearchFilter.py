@@ -24,8 +24,13 @@
 # If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
+from gc import collect
+from weakref import ref
 
-from ldap3.operation.search import parse_filter, MATCH_EQUAL, MATCH_EXTENSIBLE
+from pyasn1.codec.ber.encoder import encode
+
+from ldap3 import get_config_parameter, set_config_parameter
+from ldap3.operation.search import parse_filter, compile_filter, get_compiled_filter, filter_cache, MATCH_EQUAL, MATCH_EXTENSIBLE
 from ldap3.utils.conv import escape_filter_chars
 from ldap3.protocol.schemas.edir914 import edir_9_1_4_schema, edir_9_1_4_dsa_info
 from ldap3.protocol.rfc4512 import SchemaInfo, DsaInfo
@@ -117,3 +122,47 @@ class Test(unittest.TestCase):
         self.assertEqual(f.elements[0].tag, MATCH_EQUAL)
         self.assertEqual(f.elements[0].assertion['attr'], 'objectClass')
         self.assertEqual(f.elements[0].assertion['value'], b'bad')
+
+    def test_compiled_filter_cache(self):
+        schema = SchemaInfo.from_json(edir_9_1_4_schema)
+        compiled = get_compiled_filter('(&(cn=cached)(sn=filter))', schema, test_auto_escape, test_auto_encode, None, test_check_names)
+        self.assertIs(get_compiled_filter('(&(cn=cached)(sn=filter))', schema, test_auto_escape, test_auto_encode, None, test_check_names), compiled)
+        self.assertIsNot(get_compiled_filter('(&(cn=cached)(sn=filter))', SchemaInfo.from_json(edir_9_1_4_schema), test_auto_escape, test_auto_encode, None, test_check_names), compiled)  # different schema
+        self.assertEqual(schema.compiled_filters_cache.misses, 1)
+        self.assertEqual(schema.compiled_filters_cache.hits, 1)
+        uncompiled = compile_filter(parse_filter('(&(cn=cached)(sn=filter))', schema, test_auto_escape, test_auto_encode, None, test_check_names).elements[0])
+        self.assertEqual(encode(compiled), encode(uncompiled))
+        self.assertEqual(compiled.getName(), 'and')
+
+    def test_compiled_filter_cache_with_custom_validator(self):
+        schema = SchemaInfo.from_json(edir_9_1_4_schema)
+        validator = {'cn': lambda value: True}
+        compiled = get_compiled_filter('(cn=validated)', schema, test_auto_escape, test_auto_encode, validator, test_check_names)
+        self.assertIs(get_compiled_filter('(cn=validated)', schema, test_auto_escape, test_auto_encode, validator, test_check_names), compiled)
+        self.assertIsNot(get_compiled_filter('(cn=validated)', schema, test_auto_escape, test_auto_encode, dict(validator), test_check_names), compiled)  # different validator
+
+    def test_compiled_filter_cache_after_config_change(self):
+        schema = SchemaInfo.from_json(edir_9_1_4_schema)
+        excluded = get_config_parameter('ATTRIBUTES_EXCLUDED_FROM_CHECK')
+        set_config_parameter('ATTRIBUTES_EXCLUDED_FROM_CHECK', excluded + ['unknownAttribute'])
+        try:
+            get_compiled_filter('(unknownAttribute=value)', schema, test_auto_escape, test_auto_encode, None, True)
+        finally:
+            set_config_parameter('ATTRIBUTES_EXCLUDED_FROM_CHECK', excluded)
+        self.assertRaises(LDAPAttributeError, get_compiled_filter, '(unknownAttribute=value)', schema, test_auto_escape, test_auto_encode, None, True)
+
+    def test_compiled_filter_cache_without_schema(self):
+        misses = filter_cache.misses
+        hits = filter_cache.hits
+        compiled = get_compiled_filter('(cn=cached without schema)', None, test_auto_escape, test_auto_encode, None, test_check_names)
+        self.assertIs(get_compiled_filter('(cn=cached without schema)', None, test_auto_escape, test_auto_encode, None, test_check_names), compiled)
+        self.assertEqual(filter_cache.misses, misses + 1)
+        self.assertEqual(filter_cache.hits, hits + 1)
+
+    def test_compiled_filter_cache_releases_schema(self):
+        schema = SchemaInfo.from_json(edir_9_1_4_schema)
+        get_compiled_filter('(cn=released)', schema, test_auto_escape, test_auto_encode, None, test_check_names)
+        schema_reference = ref(schema)
+        del schema
+        collect()
+        self.assertIsNone(schema_reference())
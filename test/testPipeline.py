@@ -0,0 +1,84 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+from threading import Thread
+from time import sleep
+
+from ldap3 import Server, Connection, SYNC, SAFE_SYNC, BASE, NONE
+from test.standInServer import StandInServer
+
+ENTRIES = dict(('cn=user%d,o=test' % index, {'cn': ['user%d' % index]}) for index in range(1, 5))
+
+
+class Test(unittest.TestCase):
+    def connect(self, server, client_strategy=SYNC):
+        self.server = server
+        self.connection = Connection(Server('127.0.0.1', port=server.port, get_info=NONE), client_strategy=client_strategy, auto_bind=True)
+
+    def tearDown(self):
+        self.connection.unbind()
+        self.server.close()
+
+    def test_responses_received_out_of_order(self):
+        self.connect(StandInServer(ENTRIES, batch=len(ENTRIES), reverse=True))
+        with self.connection.pipeline() as pipeline:
+            for dn in sorted(ENTRIES):
+                pipeline.search(dn, '(objectClass=*)', BASE, attributes=['cn'])
+        self.assertEqual(self.server.batches, [4])
+        self.assertEqual([entry[1] for entry in reversed(self.server.requests)], sorted(ENTRIES))  # answered in reverse order
+        for dn, (status, result, response, request) in zip(sorted(ENTRIES), pipeline.results):
+            self.assertTrue(status)
+            self.assertEqual(request['base'], dn)
+            self.assertEqual(response[0]['dn'], dn)
+        self.assertEqual(self.connection.strategy._responses, dict())
+
+    def test_max_outstanding(self):
+        self.connect(StandInServer(ENTRIES, batch=2))
+        with self.connection.pipeline(max_outstanding=2) as pipeline:
+            for dn in sorted(ENTRIES):
+                pipeline.search(dn, '(objectClass=*)', BASE, attributes=['cn'])
+        self.assertEqual(self.server.batches, [2, 2])
+        self.assertEqual([response[0]['dn'] for _, _, response, _ in pipeline.results], sorted(ENTRIES))
+
+    def test_operation_of_other_thread_not_pipelined(self):
+        self.connect(StandInServer(ENTRIES), SAFE_SYNC)
+        results = []
+
+        def pipelined_search():
+            with self.connection.pipeline() as pipeline:
+                pipeline.search('cn=user1,o=test', '(objectClass=*)', BASE)
+            results.extend(pipeline.results)
+
+        with self.connection.connection_lock:  # another thread is performing an operation
+            thread = Thread(target=pipelined_search)
+            thread.start()
+            sleep(0.1)
+            self.assertFalse(self.connection.strategy.pipelining)
+            status, result, response, request = self.connection.search('cn=user2,o=test', '(objectClass=*)', BASE)
+        thread.join()
+        self.assertTrue(status)
+        self.assertEqual(response[0]['dn'], 'cn=user2,o=test')
+        self.assertEqual(results[0][2][0]['dn'], 'cn=user1,o=test')
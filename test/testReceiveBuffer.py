@@ -0,0 +1,68 @@
+"""
+"""
+
+# Created on 2025.03.06
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+import socket
+
+from ldap3.strategy.base import ReceiveBuffer
+
+MESSAGE_1 = b'\x30\x03\x02\x01\x01'
+MESSAGE_2 = b'\x30\x81\x05\x02\x01\x02\x04\x00'
+
+
+class Test(unittest.TestCase):
+    def test_receive_split_messages(self):
+        sender, receiver = socket.socketpair()
+        try:
+            sender.sendall(MESSAGE_1 + MESSAGE_2)
+            buffer = ReceiveBuffer(4)
+            messages = []
+            while len(messages) < 2:
+                self.assertGreater(buffer.receive(receiver, 3), 0)
+                length = buffer.message_size()
+                while length != -1 and len(buffer) >= length:
+                    messages.append(buffer.pop(length))
+                    length = buffer.message_size()
+            self.assertEqual(messages, [MESSAGE_1, MESSAGE_2])
+            self.assertEqual(len(buffer), 0)
+        finally:
+            sender.close()
+            receiver.close()
+
+    def test_receive_closed_socket(self):
+        sender, receiver = socket.socketpair()
+        sender.close()
+        buffer = ReceiveBuffer(16)
+        self.assertEqual(buffer.receive(receiver, 16), 0)
+        receiver.close()
+
+    def test_append_reuses_buffer(self):
+        buffer = ReceiveBuffer(8)
+        buffer.append(MESSAGE_1 + MESSAGE_1[:2])
+        self.assertEqual(buffer.pop(buffer.message_size()), MESSAGE_1)
+        buffer.append(MESSAGE_1[2:])  # unprocessed data is moved at the beginning of the buffer
+        self.assertEqual(len(buffer.buffer), 8)
+        self.assertEqual(buffer.pop(buffer.message_size()), MESSAGE_1)
+        self.assertEqual((buffer.start, buffer.end), (0, 0))
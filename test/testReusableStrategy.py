@@ -0,0 +1,223 @@
+"""
+"""
+
+# Created on 2025.03.04
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import socket
+import unittest
+from threading import Thread, Event
+from time import sleep
+
+from ldap3 import Server, Connection, REUSABLE, get_config_parameter, set_config_parameter
+from ldap3.core.exceptions import LDAPResponseTimeoutError
+from ldap3.strategy.reusable import TERMINATE_REUSABLE
+
+SAMPLES = 50
+
+
+class RecordingEvent(type(Event())):  # threading.Event is a factory function in Python 2
+    """
+    Records the timeouts of the waits and signals when a thread starts waiting
+    """
+    def __init__(self):
+        super(RecordingEvent, self).__init__()
+        self.waits = []
+        self.waiting = Event()
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        self.waiting.set()
+        return super(RecordingEvent, self).wait(timeout)
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        # the pool is not started, responses are handed off to the pool as the worker threads do
+        self.connection = Connection(Server('localhost'), client_strategy=REUSABLE, pool_name='response-latency')
+        self.pool = self.connection.strategy.pool
+
+    def tearDown(self):
+        self.connection.strategy.terminate()
+
+    def test_get_response_woken_by_event(self):
+        for _ in range(SAMPLES):
+            counter = self.pool.next_counter()
+            event = RecordingEvent()
+            self.pool._events[counter] = event
+            thread = Thread(target=self.set_response_when_waiting, args=(counter, event))
+            thread.start()
+            response, result = self.connection.get_response(counter, timeout=30)
+            thread.join()
+            self.assertEqual(result['description'], 'success')
+            # a single wait, ended by the event being set and not by a timeout or a polling interval
+            self.assertEqual(event.waits, [30])
+        self.assertEqual(self.pool._incoming, dict())
+        self.assertEqual(self.pool._events, dict())
+
+    def set_response_when_waiting(self, counter, event):
+        event.waiting.wait(30)
+        self.pool.set_response(counter, ([], {'result': 0, 'description': 'success', 'type': 'searchResDone'}, None))
+
+    def test_get_response_timeout(self):
+        counter = self.pool.next_counter()
+        with self.assertRaises(LDAPResponseTimeoutError):
+            self.connection.get_response(counter, timeout=0.01)
+        self.assertEqual(self.pool._events, dict())
+
+    def test_late_response_dropped(self):
+        counter = self.pool.next_counter()
+        with self.assertRaises(LDAPResponseTimeoutError):
+            self.connection.get_response(counter, timeout=0.01)
+        self.pool.set_response(counter, ([], {'result': 0, 'description': 'success', 'type': 'searchResDone'}, None))
+        self.assertEqual(self.pool._incoming, dict())
+        self.assertEqual(self.pool._events, dict())
+
+
+class TestElasticPool(unittest.TestCase):
+    def setUp(self):
+        # unbind requests are not sent by the workers, so the pool can be exercised without a server
+        self.connection = Connection(Server('localhost'), client_strategy=REUSABLE, pool_name='elastic', pool_size=1, pool_min_size=1, pool_max_size=3)
+        self.pool = self.connection.strategy.pool
+
+    def tearDown(self):
+        self.connection.strategy.terminate()
+
+    def wait_for_workers(self, size):
+        for _ in range(200):
+            if len(self.pool.workers) == size:
+                break
+            sleep(0.01)
+        self.assertEqual(len(self.pool.workers), size)
+
+    def test_pool_sizes(self):
+        self.assertEqual(self.pool.pool_size, 1)
+        self.assertEqual(self.pool.min_size, 1)
+        self.assertEqual(self.pool.max_size, 3)
+        connection = Connection(Server('localhost'), client_strategy=REUSABLE, pool_name='fixed', pool_size=4)
+        self.assertEqual(connection.strategy.pool.min_size, 4)
+        self.assertEqual(connection.strategy.pool.max_size, 4)
+        connection.strategy.terminate()
+
+    def test_pool_resized(self):
+        self.pool.start_pool()
+        for pool_size in [5, 10, 2]:  # sizes of the running pool are taken from the new connection
+            connection = Connection(Server('localhost'), client_strategy=REUSABLE, pool_name='elastic', pool_size=pool_size)
+            pool = connection.strategy.pool
+            self.assertEqual((pool.pool_size, pool.min_size, pool.max_size), (pool_size, pool_size, pool_size))
+            pool.start_pool()
+        connection = Connection(Server('localhost'), client_strategy=REUSABLE, pool_name='elastic', pool_max_size=4)
+        self.assertIs(connection.strategy.pool, pool)
+        self.assertEqual((pool.pool_size, pool.min_size, pool.max_size), (2, 2, 4))
+        connection.strategy.terminate()
+
+    def test_maintenance_thread_only_for_elastic_pool(self):
+        self.pool.start_pool()
+        self.assertIsNotNone(self.pool.maintenance_thread)
+        connection = Connection(Server('localhost'), client_strategy=REUSABLE, pool_name='fixed', pool_size=2)
+        connection.strategy.pool.start_pool()
+        self.assertIsNone(connection.strategy.pool.maintenance_thread)
+        connection.strategy.terminate()
+
+    def test_terminate_signals_not_pending(self):
+        self.pool.start_pool()
+        worker = self.pool.workers[0]
+        with worker.worker_lock:  # the worker takes the first signal and waits for the lock
+            worker.busy = True
+            self.pool.request_queue.put((TERMINATE_REUSABLE, None, None, None, None))
+            self.pool.request_queue.put((TERMINATE_REUSABLE, None, None, None, None))
+            for _ in range(200):
+                if self.pool.request_queue.qsize() == 1:
+                    break
+                sleep(0.01)
+            self.pool.scale_up()
+            self.assertEqual(self.pool.pending_requests, 0)
+            self.assertEqual(len(self.pool.workers), 1)
+        self.wait_for_workers(0)
+        self.pool.request_queue.get_nowait()
+        self.pool.request_queue.task_done()
+
+    def test_scale_up_and_reap(self):
+        self.pool.start_pool()
+        worker = self.pool.workers[0]
+        with worker.worker_lock:  # keeps the first worker busy
+            worker.busy = True
+            for _ in range(6):
+                self.pool.queue_request(self.pool.next_counter(), 'unbindRequest', None, None)
+                self.pool.scale_up()
+            self.assertGreater(len(self.pool.workers), 1)
+            self.assertLessEqual(len(self.pool.workers), 3)
+        self.pool.request_queue.join()
+        self.assertEqual(self.pool.scale_ups, len(self.pool.workers) - 1)
+        self.assertEqual(self.pool.peak_size, len(self.pool.workers))
+        idle_timeout = get_config_parameter('REUSABLE_THREADED_IDLE_TIMEOUT')
+        set_config_parameter('REUSABLE_THREADED_IDLE_TIMEOUT', 0)
+        try:
+            self.pool.reap_idle_workers()
+        finally:
+            set_config_parameter('REUSABLE_THREADED_IDLE_TIMEOUT', idle_timeout)
+        self.assertEqual(self.pool.pending_requests, 0)  # terminate signals are not requests
+        self.pool.request_queue.join()
+        self.wait_for_workers(1)
+        self.assertEqual(self.pool.scale_downs, self.pool.scale_ups)
+
+    def open_worker_connection(self):
+        """
+        Opens the connection of the first worker of a new pool to a local listener, returns the worker and the server side socket
+        """
+        listener = socket.socket()
+        self.addCleanup(listener.close)
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(5)
+        self.connection.strategy.terminate()
+        self.connection = Connection(Server('127.0.0.1', port=listener.getsockname()[1]), client_strategy=REUSABLE, pool_name='keepalive', pool_size=1)
+        self.pool = self.connection.strategy.pool
+        self.pool.start_pool()
+        worker = self.pool.workers[0]
+        with worker.worker_lock:
+            worker.connection.open(read_server_info=False)
+        remote = listener.accept()[0]
+        self.addCleanup(remote.close)
+        return worker, remote
+
+    def test_dead_idle_connection_is_renewed(self):
+        worker, remote = self.open_worker_connection()
+        connection = worker.connection
+        remote.close()  # the server closes the idle connection
+        sleep(0.05)
+        self.pool.check_idle_connections()
+        self.assertEqual(self.pool.renewals, 1)
+        self.assertIsNot(worker.connection, connection)
+        self.assertTrue(connection.closed)
+
+    def test_keepalive_sent_only_to_idle_workers(self):
+        worker, remote = self.open_worker_connection()
+        remote.settimeout(0.1)
+        self.pool.keepalive = 0.01
+        worker.busy = True  # the worker is executing a request
+        sleep(0.02)
+        self.pool.check_idle_connections()
+        self.assertRaises(socket.timeout, remote.recv, 1024)
+        worker.busy = False
+        self.pool.check_idle_connections()
+        self.assertTrue(remote.recv(1024))  # Abandon(0) request
+        self.assertEqual(self.pool.renewals, 0)
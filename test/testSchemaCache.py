@@ -0,0 +1,187 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+from ldap3 import Server, Connection, OFFLINE_EDIR_9_1_4, OFFLINE_SLAPD_2_4, SCHEMA, SchemaInfo, DsaInfo, get_config_parameter, set_config_parameter
+from ldap3.protocol.schemas.edir914 import edir_9_1_4_schema, edir_9_1_4_dsa_info
+from ldap3.protocol.schemas.slapd24 import slapd_2_4_schema
+from ldap3.utils.schemaCache import OFFLINE_SCHEMAS, cache_file_name, load_cached_info, load_offline_info, precompile_offline_schemas,\
+    server_cache_name, has_cached_server_schema, load_server_schema, store_server_schema, clear_server_schemas, schema_timestamps
+from test.standInServer import StandInServer
+
+SUBSCHEMA = {'objectClasses': ["( 2.5.6.0 NAME 'top' ABSTRACT MUST objectClass )"],
+             'attributeTypes': ["( 2.5.4.0 NAME 'objectClass' EQUALITY objectIdentifierMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.38 )"],
+             'createTimestamp': ['20250101000000Z'],
+             'modifyTimestamp': ['20250101000000Z']}
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.cache_directory = get_config_parameter('SCHEMA_CACHE_DIRECTORY')
+        self.directory = mkdtemp()
+        set_config_parameter('SCHEMA_CACHE_DIRECTORY', self.directory)
+
+    def tearDown(self):
+        set_config_parameter('SCHEMA_CACHE_DIRECTORY', self.cache_directory)
+        shutil.rmtree(self.directory)
+        clear_server_schemas()
+
+    def test_offline_schema_is_cached(self):
+        self.assertIsNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+        server = Server('dummy', get_info=OFFLINE_EDIR_9_1_4)
+        self.assertTrue(os.path.isfile(cache_file_name(OFFLINE_EDIR_9_1_4)))
+        cached_server = Server('dummy', get_info=OFFLINE_EDIR_9_1_4)
+        self.assertIsNot(cached_server.schema, server.schema)
+        self.assertEqual(cached_server.schema.to_json(), SchemaInfo.from_json(edir_9_1_4_schema).to_json())
+        self.assertEqual(cached_server.info.to_json(), DsaInfo.from_json(edir_9_1_4_dsa_info).to_json())
+        self.assertEqual(cached_server.schema.attribute_types['cn'].mandatory_in, server.schema.attribute_types['cn'].mandatory_in)
+
+    def test_attribute_helpers_are_not_cached(self):
+        schema_info, _ = load_offline_info(OFFLINE_SLAPD_2_4)
+        schema_info.attribute_helpers_cache['cn'] = lambda value: value  # not pickable
+        schema_info.attribute_names_cache = {'cn': 'cn'}
+        self.assertEqual(schema_info.__getstate__()['attribute_helpers_cache'], dict())
+        self.assertIsNone(schema_info.__getstate__()['attribute_names_cache'])
+
+    def test_precompile_offline_schemas(self):
+        written = precompile_offline_schemas()
+        self.assertEqual(len(written), len(OFFLINE_SCHEMAS))
+        for offline_schema in OFFLINE_SCHEMAS:
+            schema_info, dsa_info = load_cached_info(offline_schema)
+            self.assertTrue(schema_info.is_valid())
+            self.assertIsInstance(dsa_info, DsaInfo)
+
+    def test_cache_signature(self):
+        precompile_offline_schemas()
+        conf_case_insensitive_schema = get_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES')
+        set_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES', not conf_case_insensitive_schema)
+        try:
+            self.assertIsNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+        finally:
+            set_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES', conf_case_insensitive_schema)
+        self.assertIsNotNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+
+    def test_corrupted_cache_file(self):
+        precompile_offline_schemas()
+        with open(cache_file_name(OFFLINE_EDIR_9_1_4), 'wb') as cache_file:
+            cache_file.write(b'not a schema')
+        self.assertIsNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+        server = Server('dummy', get_info=OFFLINE_EDIR_9_1_4)  # the schema is parsed and the cache file rewritten
+        self.assertTrue(server.schema.is_valid())
+        self.assertIsNotNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'ownership of the cache files is checked on POSIX only')
+    def test_cache_file_writable_by_others(self):
+        precompile_offline_schemas()
+        os.chmod(cache_file_name(OFFLINE_EDIR_9_1_4), 0o666)
+        self.assertIsNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+        os.chmod(cache_file_name(OFFLINE_EDIR_9_1_4), 0o600)
+        self.assertIsNotNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'ownership of the cache files is checked on POSIX only')
+    def test_cache_directory_writable_by_others(self):
+        precompile_offline_schemas()
+        os.chmod(self.directory, 0o777)
+        try:
+            self.assertIsNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+        finally:
+            os.chmod(self.directory, 0o700)
+
+    def test_cache_off_by_default(self):
+        self.assertIsNone(self.cache_directory)
+
+    def test_precompile_turns_cache_on(self):
+        directory = os.path.join(self.directory, 'precompiled')
+        set_config_parameter('SCHEMA_CACHE_DIRECTORY', None)
+        written = precompile_offline_schemas(directory)
+        self.assertEqual(get_config_parameter('SCHEMA_CACHE_DIRECTORY'), directory)
+        self.assertEqual(sorted(written), sorted(os.path.join(directory, file_name) for file_name in os.listdir(directory)))
+        self.assertIsNotNone(load_cached_info(OFFLINE_EDIR_9_1_4))
+
+    def test_cache_disabled(self):
+        set_config_parameter('SCHEMA_CACHE_DIRECTORY', None)
+        server = Server('dummy', get_info=OFFLINE_EDIR_9_1_4)
+        self.assertTrue(server.schema.is_valid())
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_server_schema_shared_in_process(self):
+        schema_info = SchemaInfo.from_json(slapd_2_4_schema)
+        timestamps = schema_timestamps(schema_info.raw)
+        name = server_cache_name(Server('ldap.example.com'), 'cn=Subschema')
+        self.assertEqual(name, server_cache_name(Server('LDAP.example.com', port=389), 'CN=subschema'))
+        self.assertNotEqual(name, server_cache_name(Server('ldap.example.com', port=3389), 'cn=Subschema'))
+        self.assertIsNone(load_server_schema(name, timestamps))
+        store_server_schema(name, schema_info)
+        self.assertIs(load_server_schema(name, timestamps), schema_info)
+
+    def test_server_schema_from_cache_file(self):
+        schema_info = SchemaInfo.from_json(slapd_2_4_schema)
+        timestamps = schema_timestamps(schema_info.raw)
+        name = server_cache_name(Server('ldap.example.com'), 'cn=Subschema')
+        store_server_schema(name, schema_info)
+        clear_server_schemas()  # a new process
+        cached_schema_info = load_server_schema(name, timestamps)
+        self.assertIsNot(cached_schema_info, schema_info)
+        self.assertEqual(cached_schema_info.to_json(), schema_info.to_json())
+        self.assertIs(load_server_schema(name, timestamps), cached_schema_info)
+
+    def test_server_schema_changed(self):
+        schema_info = SchemaInfo.from_json(slapd_2_4_schema)
+        name = server_cache_name(Server('ldap.example.com'), 'cn=Subschema')
+        store_server_schema(name, schema_info)
+        create_time_stamp, _ = schema_timestamps(schema_info.raw)
+        self.assertIsNone(load_server_schema(name, (create_time_stamp, [b'20250101000000Z'])))
+        clear_server_schemas()
+        self.assertIsNone(load_server_schema(name, (create_time_stamp, [b'20250101000000Z'])))
+
+    def test_server_schema_without_timestamps(self):
+        schema_info = SchemaInfo.from_json(slapd_2_4_schema)
+        del schema_info.raw['createTimestamp']
+        del schema_info.raw['modifyTimestamp']
+        self.assertIsNone(schema_timestamps(schema_info.raw))
+        name = server_cache_name(Server('ldap.example.com'), 'cn=Subschema')
+        store_server_schema(name, schema_info)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_server_schema_timestamps_read_only_when_cached(self):
+        server = StandInServer({'': {'subschemaSubentry': ['cn=Subschema']}, 'cn=Subschema': SUBSCHEMA})
+        self.addCleanup(server.close)
+        conf_schema_cache_servers = get_config_parameter('SCHEMA_CACHE_SERVERS')
+        set_config_parameter('SCHEMA_CACHE_SERVERS', True)
+        try:
+            self.assertFalse(has_cached_server_schema(server_cache_name(Server('127.0.0.1', port=server.port), 'cn=Subschema')))
+            for _ in range(2):
+                connection = Connection(Server('127.0.0.1', port=server.port, get_info=SCHEMA), auto_bind=True)
+                self.assertTrue(connection.server.schema.is_valid())
+                connection.unbind()
+        finally:
+            set_config_parameter('SCHEMA_CACHE_SERVERS', conf_schema_cache_servers)
+        # first connection: subschemaSubentry and whole schema, second connection: subschemaSubentry and timestamps
+        self.assertEqual(server.requests, [('search', ''), ('search', 'cn=Subschema'), ('search', ''), ('search', 'cn=Subschema')])
+        self.assertTrue(has_cached_server_schema(server_cache_name(Server('127.0.0.1', port=server.port), 'cn=Subschema')))
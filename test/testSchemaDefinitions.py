@@ -0,0 +1,142 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import pickle
+import unittest
+
+from ldap3 import get_config_parameter, set_config_parameter
+from ldap3.core.exceptions import LDAPSchemaError
+from ldap3.protocol.oid import CLASS_STRUCTURAL, ATTRIBUTE_DIRECTORY_OPERATION
+from ldap3.protocol.rfc4512 import SchemaInfo, AttributeTypeInfo, ObjectClassInfo, MatchingRuleInfo, MatchingRuleUseInfo, DitContentRuleInfo, DitStructureRuleInfo, NameFormInfo, LdapSyntaxInfo
+from ldap3.protocol.schemas.ad2012R2 import ad_2012_r2_schema
+from ldap3.protocol.schemas.ds389 import ds389_1_3_3_schema
+from ldap3.protocol.schemas.edir888 import edir_8_8_8_schema
+from ldap3.protocol.schemas.edir914 import edir_9_1_4_schema
+from ldap3.protocol.schemas.slapd24 import slapd_2_4_schema
+from ldap3.operation.search import get_attribute_names
+from ldap3.utils.conv import json_hook
+
+DEFINITION_CLASSES = {'attributeTypes': AttributeTypeInfo,
+                      'objectClasses': ObjectClassInfo,
+                      'matchingRules': MatchingRuleInfo,
+                      'matchingRuleUse': MatchingRuleUseInfo,
+                      'dITContentRules': DitContentRuleInfo,
+                      'dITStructureRules': DitStructureRuleInfo,
+                      'nameForms': NameFormInfo,
+                      'ldapSyntaxes': LdapSyntaxInfo}
+
+
+class Test(unittest.TestCase):
+    def test_same_as_split_definition(self):
+        for schema in [ad_2012_r2_schema, ds389_1_3_3_schema, edir_8_8_8_schema, edir_9_1_4_schema, slapd_2_4_schema]:
+            raw = json.loads(schema, object_hook=json_hook)['raw']
+            for attribute in DEFINITION_CLASSES:
+                for definition in raw.get(attribute, []):
+                    definition = definition.strip()[1:-1]
+                    parsed = DEFINITION_CLASSES[attribute].parse_definition(definition)
+                    if parsed is not None:
+                        self.assertEqual(vars(parsed), vars(DEFINITION_CLASSES[attribute].split_definition(definition)))
+
+    def test_attribute_type(self):
+        definition = AttributeTypeInfo.parse_definition(" 2.5.18.2 NAME ( 'modifyTimestamp' 'modifyTime' ) DESC 'time which object was last modified' EQUALITY generalizedTimeMatch "
+                                                        "SYNTAX 1.3.6.1.4.1.1466.115.121.1.24 SINGLE-VALUE NO-USER-MODIFICATION USAGE directoryOperation X-ORIGIN 'RFC 4512' ")
+        self.assertEqual(definition.oid, '2.5.18.2')
+        self.assertEqual(definition.name, ['modifyTimestamp', 'modifyTime'])
+        self.assertEqual(definition.description, 'time which object was last modified')
+        self.assertEqual(definition.equality, ['generalizedTimeMatch'])
+        self.assertEqual(definition.syntax, ['1.3.6.1.4.1.1466.115.121.1.24'])
+        self.assertTrue(definition.single_value)
+        self.assertTrue(definition.no_user_modification)
+        self.assertFalse(definition.collective)
+        self.assertEqual(definition.usage, ATTRIBUTE_DIRECTORY_OPERATION)
+        self.assertEqual(definition.extensions, [('X-ORIGIN', ['RFC 4512'])])
+
+    def test_object_class(self):
+        definition = ObjectClassInfo.parse_definition(" 2.5.6.6 NAME 'person' DESC 'MUST have a SUP' SUP top STRUCTURAL MUST ( sn $ cn ) MAY ( userPassword $ telephoneNumber ) X-ORIGIN ( 'RFC 4519' 'RFC 2256' ) ")
+        self.assertEqual(definition.name, ['person'])
+        self.assertEqual(definition.description, 'MUST have a SUP')  # keywords in quoted strings are not split
+        self.assertEqual(definition.superior, ['top'])
+        self.assertEqual(definition.kind, CLASS_STRUCTURAL)
+        self.assertEqual(definition.must_contain, ['sn', 'cn'])
+        self.assertEqual(definition.may_contain, ['userPassword', 'telephoneNumber'])
+        self.assertEqual(definition.extensions, [('X-ORIGIN', ['RFC 4519', 'RFC 2256'])])
+
+    def test_not_tokenized_definitions(self):
+        self.assertIsNone(AttributeTypeInfo.parse_definition(" 2.5.4.3 NAME 'cn' DESC 'common  name' "))  # spaces in values are kept by split_definition
+        self.assertIsNone(AttributeTypeInfo.parse_definition(" 2.5.4.3 NAME 'cn "))
+        self.assertIsNone(AttributeTypeInfo.parse_definition(" 2.5.4.3 NAME 'cn' UNKNOWN value "))
+        self.assertIsNone(ObjectClassInfo.parse_definition(" 2.5.6.6 NAME 'person' SYNTAX 1.2.3 "))
+        self.assertEqual(AttributeTypeInfo.split_definition(" 2.5.4.3 NAME 'cn' DESC 'common  name' ").description, 'common  name')
+
+    def test_from_definition(self):
+        definitions = AttributeTypeInfo.from_definition(["( 2.5.4.3 NAME ( 'cn' 'commonName' ) SYNTAX 1.3.6.1.4.1.1466.115.121.1.15{64} )",
+                                                         b"( 2.5.4.4 NAME 'sn' DESC 'surname  with double space' SYNTAX '1.3.6.1.4.1.1466.115.121.1.15' )"])
+        self.assertEqual(definitions['cn'].syntax, '1.3.6.1.4.1.1466.115.121.1.15')
+        self.assertEqual(definitions['cn'].min_length, 64)
+        self.assertIs(definitions['commonName'], definitions['cn'])
+        self.assertEqual(definitions['sn'].syntax, '1.3.6.1.4.1.1466.115.121.1.15')
+        self.assertEqual(definitions['sn'].description, 'surname  with double space')
+
+    def test_lazy_schema_same_as_schema(self):
+        for schema in [ad_2012_r2_schema, slapd_2_4_schema]:
+            schema_info = SchemaInfo.from_json(schema)
+            lazy_schema_info = SchemaInfo(schema_info.schema_entry, json.loads(schema, object_hook=json_hook)['raw'], schema_info.raw, lazy=True)
+            self.assertEqual(get_attribute_names(lazy_schema_info), get_attribute_names(schema_info))
+            for definitions in ['attribute_types', 'object_classes', 'matching_rules', 'ldap_syntaxes']:
+                self.assertEqual(list(getattr(lazy_schema_info, definitions).keys()), list(getattr(schema_info, definitions).keys()))
+                for name in getattr(schema_info, definitions):
+                    self.assertEqual(vars(getattr(lazy_schema_info, definitions)[name]), vars(getattr(schema_info, definitions)[name]))
+
+    def test_lazy_schema_parses_when_looked_up(self):
+        raw = json.loads(slapd_2_4_schema, object_hook=json_hook)['raw']
+        schema_info = SchemaInfo('cn=Subschema', dict(raw), raw, lazy=True)
+        self.assertEqual(len([definition for definition in schema_info.attribute_types.definitions() if isinstance(definition, AttributeTypeInfo)]), 0)
+        schema_info = pickle.loads(pickle.dumps(schema_info, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(len([definition for definition in schema_info.attribute_types.definitions() if isinstance(definition, AttributeTypeInfo)]), 0)
+        attribute_type = schema_info.attribute_types['2.5.4.3']  # oid is an alias of the cn attribute type
+        self.assertIs(schema_info.attribute_types['CommonName'], attribute_type)
+        self.assertEqual(attribute_type.name, ['cn', 'commonName'])
+        self.assertIn('person', attribute_type.mandatory_in)
+        self.assertEqual(len([definition for definition in schema_info.attribute_types.definitions() if isinstance(definition, AttributeTypeInfo)]), 1)
+        self.assertEqual(len(schema_info.attribute_types.values()), len(schema_info.attribute_types))
+        self.assertEqual(len([definition for definition in schema_info.attribute_types.definitions() if isinstance(definition, AttributeTypeInfo)]), len(schema_info.attribute_types))
+
+    def test_lazy_case_sensitive_schema(self):
+        case_insensitive_schema_names = get_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES')
+        set_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES', False)
+        try:
+            definitions = AttributeTypeInfo.from_definition(["( 2.5.4.3 NAME ( 'cn' 'commonName' ) SYNTAX 1.3.6.1.4.1.1466.115.121.1.15{64} )"], lazy=True)
+            definitions = pickle.loads(pickle.dumps(definitions, pickle.HIGHEST_PROTOCOL))
+            self.assertEqual(sorted(definitions.keys()), ['cn', 'commonName'])
+            self.assertIs(definitions['commonName'], definitions['cn'])
+            self.assertEqual(definitions.get('cn').min_length, 64)
+            self.assertIsNone(definitions.get('CN'))
+        finally:
+            set_config_parameter('CASE_INSENSITIVE_SCHEMA_NAMES', case_insensitive_schema_names)
+
+    def test_lazy_malformed_definition(self):
+        with self.assertRaises(LDAPSchemaError):
+            AttributeTypeInfo.from_definition(["( 2.5.4.3 NAME 'cn' )", "2.5.4.4 NAME 'sn'"], lazy=True)
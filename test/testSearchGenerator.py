@@ -0,0 +1,122 @@
+"""
+"""
+
+# Created on 2025.10.18
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+from threading import Thread
+from time import sleep
+
+from ldap3 import Server, Connection, SYNC, SAFE_SYNC, BASE, NONE
+from test.standInServer import StandInServer
+
+ENTRIES = dict(('cn=user%d,o=test' % index, {'cn': ['user%d' % index]}) for index in range(1, 5))
+
+
+class Test(unittest.TestCase):
+    def connect(self, client_strategy=SYNC, message_delay=0):
+        self.server = StandInServer(ENTRIES, message_delay=message_delay)
+        self.connection = Connection(Server('127.0.0.1', port=self.server.port, get_info=NONE), client_strategy=client_strategy, auto_bind=True)
+
+    def tearDown(self):
+        self.connection.unbind()
+        self.server.close()
+
+    def search_user1(self):
+        if self.connection.strategy.thread_safe:
+            status, result, response, request = self.connection.search('cn=user1,o=test', '(objectClass=*)', BASE)
+        else:
+            self.connection.search('cn=user1,o=test', '(objectClass=*)', BASE)
+            result, response = self.connection.result, self.connection.response
+        self.assertEqual(result['description'], 'success')
+        self.assertEqual([entry['dn'] for entry in response], ['cn=user1,o=test'])
+
+    def wait_for_abandon(self, message_id):
+        for _ in range(50):  # the request is recorded by the server thread
+            if ('abandon', message_id) in self.server.requests:
+                return
+            sleep(0.02)
+        self.fail('abandon request not received for message %d' % message_id)
+
+    def assert_no_pending_responses(self):
+        self.assertEqual(self.connection.strategy._responses, dict())
+        self.assertEqual(self.connection.strategy._abandoned, set())
+
+    def test_search_generator(self):
+        self.connect()
+        entries = [response['dn'] for response in self.connection.search_generator('o=test', '(objectClass=*)') if response['type'] == 'searchResEntry']
+        self.assertEqual(sorted(entries), sorted(ENTRIES))
+        self.assertEqual(self.connection.result['description'], 'success')
+        self.assert_no_pending_responses()
+
+    def test_operation_before_next(self):
+        self.connect()
+        generator = self.connection.search_generator('o=test', '(objectClass=*)')
+        self.search_user1()  # receives the entries of the streamed search too, they are kept for the generator
+        self.assertEqual(sorted(response['dn'] for response in generator), sorted(ENTRIES))
+        self.assert_no_pending_responses()
+
+    def test_closed_after_result_received(self):
+        self.connect()
+        generator = self.connection.search_generator('o=test', '(objectClass=*)')
+        next(generator)  # the whole response is received with the first entry
+        generator.close()
+        self.search_user1()
+        self.assertFalse(any(request[0] == 'abandon' for request in self.server.requests))
+        self.assert_no_pending_responses()
+
+    def test_closed_early(self):
+        self.connect(message_delay=0.05)
+        generator = self.connection.search_generator('o=test', '(objectClass=*)')
+        next(generator)
+        message_id = max(self.connection.strategy._responses)
+        generator.close()
+        self.wait_for_abandon(message_id)
+        self.assertEqual(self.connection.strategy._abandoned, set([message_id]))
+        self.search_user1()  # the remaining entries of the abandoned search are discarded
+        self.assert_no_pending_responses()
+
+    def test_dropped_before_next(self):
+        self.connect()
+        generator = self.connection.search_generator('o=test', '(objectClass=*)')
+        message_id = max(self.connection.strategy._responses)
+        del generator
+        self.wait_for_abandon(message_id)
+        self.search_user1()
+        self.assert_no_pending_responses()
+
+    def test_operation_of_other_thread_not_streamed(self):
+        self.connect(SAFE_SYNC)
+        entries = []
+
+        def streamed_search():
+            entries.extend(response['dn'] for response in self.connection.search_generator('o=test', '(objectClass=*)'))
+
+        with self.connection.connection_lock:  # another thread is performing an operation
+            thread = Thread(target=streamed_search)
+            thread.start()
+            sleep(0.1)
+            self.assertFalse(self.connection.strategy.pipelining)
+            self.search_user1()
+        thread.join()
+        self.assertEqual(sorted(entries), sorted(ENTRIES))
@@ -257,3 +257,54 @@ class Test(unittest.TestCase):
                 self.assertEqual(response[0]['attributes']['audio'][0], ldap_bytes)
             else:
                 self.assertEqual(response[0]['raw_attributes']['audio'][0], ldap_bytes)
+
+    def test_search_pipeline(self):
+        if not self.connection.strategy.sync or self.connection.strategy.no_real_dsa or self.connection.strategy.pooled:
+            return
+        with self.connection.pipeline(max_outstanding=2) as pipeline:
+            for i in range(1, 5):
+                pipeline.search(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-' + str(i) + '*)', attributes=[test_name_attr, 'givenName'])
+        self.assertEqual(len(pipeline.results), 4)
+        for status, result, response, request in pipeline.results:
+            self.assertTrue(status)
+            self.assertEqual(result['description'], 'success')
+            self.assertEqual(len(response), 1)
+            self.assertEqual(request['type'], 'searchRequest')
+
+    def test_search_generator(self):
+        if not self.connection.strategy.sync or self.connection.strategy.no_real_dsa or self.connection.strategy.pooled:
+            return
+        entries = [response for response in self.connection.search_generator(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-*)', attributes=[test_name_attr, 'givenName']) if response['type'] == 'searchResEntry']
+        self.assertEqual(len(entries), 4)
+        self.assertEqual(self.connection.result['description'], 'success')
+
+    def test_search_generator_abandon(self):
+        if not self.connection.strategy.sync or self.connection.strategy.no_real_dsa or self.connection.strategy.pooled:
+            return
+        generator = self.connection.search_generator(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-*)', attributes=[test_name_attr, 'givenName'])
+        next(generator)
+        generator.close()
+        status, result, response, request = get_response_values(self.connection.search(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-1)', attributes=[test_name_attr, 'givenName']), self.connection)
+        self.assertEqual(result['description'], 'success')
+        self.assertEqual(len(response), 1)
+
+    def test_search_generator_operation_before_next(self):
+        if not self.connection.strategy.sync or self.connection.strategy.no_real_dsa or self.connection.strategy.pooled:
+            return
+        generator = self.connection.search_generator(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-*)', attributes=[test_name_attr, 'givenName'])
+        status, result, response, request = get_response_values(self.connection.search(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-1)', attributes=[test_name_attr, 'givenName']), self.connection)
+        self.assertEqual(result['description'], 'success')
+        self.assertEqual(len(response), 1)
+        entries = [response for response in generator if response['type'] == 'searchResEntry']
+        self.assertEqual(len(entries), 4)
+        self.assertEqual(self.connection.result['description'], 'success')
+
+    def test_search_generator_dropped_before_next(self):
+        if not self.connection.strategy.sync or self.connection.strategy.no_real_dsa or self.connection.strategy.pooled:
+            return
+        generator = self.connection.search_generator(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-*)', attributes=[test_name_attr, 'givenName'])
+        del generator
+        status, result, response, request = get_response_values(self.connection.search(search_base=test_base, search_filter='(' + test_name_attr + '=' + testcase_id + 'sea-1)', attributes=[test_name_attr, 'givenName']), self.connection)
+        self.assertEqual(result['description'], 'success')
+        self.assertEqual(len(response), 1)
+        self.assertEqual(self.connection.strategy._responses, dict())
@@ -0,0 +1,174 @@
+"""
+"""
+
+# Created on 2025.04.06
+#
+# Author: Giovanni Cannata
+#
+# Copyright 2025 - 2025 Giovanni Cannata
+#
+# This file is part of ldap3.
+#
+# ldap3 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ldap3 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with ldap3 in the COPYING and COPYING.LESSER files.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import socket
+import unittest
+from threading import Event
+from time import sleep
+
+from ldap3 import Server, ServerPool, FIRST, FASTEST, LEAST_OUTSTANDING, get_config_parameter, set_config_parameter
+
+
+def unused_port():
+    temp_socket = socket.socket()
+    temp_socket.bind(('127.0.0.1', 0))
+    port = temp_socket.getsockname()[1]
+    temp_socket.close()
+    return port
+
+
+class SlowServer(Server):
+    """
+    Server that doesn't refuse the connection and doesn't answer, its availability check fails only when released
+    """
+    def __init__(self, *args, **kwargs):
+        Server.__init__(self, *args, **kwargs)
+        self.release = Event()
+
+    def check_availability(self, source_address=None, source_port=None, source_port_list=None):
+        self.release.wait(10)
+        return False
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.listening_socket = socket.socket()
+        self.listening_socket.bind(('127.0.0.1', 0))
+        self.listening_socket.listen(10)
+        self.server_up = Server('127.0.0.1', port=self.listening_socket.getsockname()[1], connect_timeout=1)
+        self.server_down_1 = Server('127.0.0.1', port=unused_port(), connect_timeout=1)
+        self.server_down_2 = Server('127.0.0.1', port=unused_port(), connect_timeout=1)
+
+        self.checked = []
+        self.attempt_delay = get_config_parameter('CHECK_AVAILABILITY_ATTEMPT_DELAY')
+
+    def tearDown(self):
+        self.listening_socket.close()
+        set_config_parameter('CHECK_AVAILABILITY_ATTEMPT_DELAY', self.attempt_delay)
+
+    def record_checks(self, server, on_check=None):
+        check_availability = server.check_availability
+
+        def recorded_check_availability(*args, **kwargs):
+            self.checked.append(server)
+            available = check_availability(*args, **kwargs)
+            if on_check:
+                on_check()
+            return available
+        server.check_availability = recorded_check_availability
+
+    def test_check_availability(self):
+        self.assertTrue(self.server_up.check_availability())
+        self.assertTrue(self.server_up.address_info[0][5])
+        self.assertFalse(self.server_down_1.check_availability())
+        self.assertFalse(self.server_down_1.address_info[0][5])
+
+    def test_pool_first_active_server(self):
+        server_pool = ServerPool([self.server_down_1, self.server_down_2, self.server_up], FIRST, active=1)
+        server_pool.initialize('connection')
+        self.assertIs(server_pool.get_server('connection'), self.server_up)
+        self.assertEqual([server_state.available for server_state in server_pool.pool_states['connection'].server_states], [False, False, True])
+
+    def test_pool_health_check(self):
+        server_pool = ServerPool([self.server_down_1, self.server_up], FIRST, active=1, health_check_interval=0.1)
+        server_pool.initialize('connection')
+        for _ in range(50):
+            if server_pool.health_checker.last_check_time:
+                break
+            sleep(0.1)
+        self.assertEqual([server_state.available for server_state in server_pool.pool_states['connection'].server_states], [False, True])
+        self.server_up.check_availability = None  # get_server must not check servers
+        self.assertIs(server_pool.get_server('connection'), self.server_up)
+        server_pool.stop_health_check()
+        self.assertIsNone(server_pool.health_checker)
+
+    def test_pool_health_check_ends_when_pool_released(self):
+        server_pool = ServerPool([self.server_up], FIRST, active=1, health_check_interval=0.1)
+        health_checker = server_pool.health_checker
+        del server_pool
+        gc.collect()
+        health_checker.join(5)
+        self.assertFalse(health_checker.is_alive())
+
+    def test_pool_fastest(self):
+        server_pool = ServerPool([self.server_down_1, self.server_down_2, self.server_up], FASTEST, active=False)
+        server_pool.initialize('connection')
+        server_states = server_pool.pool_states['connection'].server_states
+        for server_state, response_time in zip(server_states, [0.3, 0.1, 0.2]):
+            server_state.request_completed(server_state.request_started() - response_time)
+        self.assertIs(server_pool.get_server('connection'), self.server_down_2)
+        for _ in range(20):  # the average follows the last response times
+            server_states[1].request_completed(server_states[1].request_started() - 0.5)
+        self.assertTrue(server_states[1].response_time > 0.45)
+        self.assertEqual(server_states[1].completed, 21)
+        self.assertEqual(server_states[1].outstanding, 0)
+        self.assertIs(server_pool.get_server('connection'), self.server_up)
+
+    def test_pool_least_outstanding(self):
+        server_pool = ServerPool([self.server_down_1, self.server_down_2, self.server_up], LEAST_OUTSTANDING, active=False)
+        server_pool.initialize('connection')
+        server_states = server_pool.pool_states['connection'].server_states
+        server_states[0].request_started()
+        server_states[1].request_started()
+        self.assertIs(server_pool.get_server('connection'), self.server_up)
+        server_states[2].request_started()
+        server_states[2].request_started()
+        server_states[1].request_discarded()
+        self.assertIs(server_pool.get_server('connection'), self.server_down_2)
+
+    def test_pool_check_staggered_after_refused_server(self):
+        set_config_parameter('CHECK_AVAILABILITY_ATTEMPT_DELAY', 10)
+        for server in (self.server_down_1, self.server_up, self.server_down_2):
+            self.record_checks(server)
+        server_pool = ServerPool([self.server_down_1, self.server_up, self.server_down_2], FIRST, active=1)
+        server_pool.initialize('connection')
+        self.assertIs(server_pool.get_server('connection'), self.server_up)  # doesn't wait for the attempt delay
+        self.assertEqual(self.checked, [self.server_down_1, self.server_up])  # the last server is not checked
+
+    def test_pool_check_staggered_after_slow_server(self):
+        set_config_parameter('CHECK_AVAILABILITY_ATTEMPT_DELAY', 0.05)
+        server_slow = SlowServer('127.0.0.1', port=unused_port(), connect_timeout=1)
+        self.record_checks(server_slow)
+        self.record_checks(self.server_up, on_check=server_slow.release.set)
+        self.record_checks(self.server_down_2)
+        server_pool = ServerPool([server_slow, self.server_up, self.server_down_2], FIRST, active=1)
+        server_pool.initialize('connection')
+        self.assertIs(server_pool.get_server('connection'), self.server_up)
+        self.assertEqual(self.checked, [server_slow, self.server_up])  # the next server is checked after the attempt delay
+
+    def test_pool_refresh_keeps_server_states(self):
+        server_pool = ServerPool([self.server_down_1, self.server_up], LEAST_OUTSTANDING, active=False)
+        server_pool.initialize('connection')
+        server_state = server_pool.pool_states['connection'].server_states[1]
+        start_time = server_state.request_started()
+        server_pool.add(self.server_down_2)  # refreshes the pool state while the request is in progress
+        server_states = server_pool.pool_states['connection'].server_states
+        self.assertIs(server_states[1], server_state)
+        server_state.request_completed(start_time)
+        self.assertEqual(server_states[1].outstanding, 0)
+        self.assertEqual(server_states[1].completed, 1)
+        server_pool.remove(self.server_down_1)
+        self.assertIs(server_pool.pool_states['connection'].server_states[0], server_state)
@@ -8,6 +8,9 @@ from ldap3.utils.port_validators import check_port, check_port_and_port_list
 
 
 from ldap3.protocol.convert import prepare_filter_for_sending
+from ldap3.protocol.formatters.standard import format_attribute_values, find_attribute_validator
+from ldap3.protocol.rfc4512 import SchemaInfo
+from ldap3.protocol.schemas.edir914 import edir_9_1_4_schema
 
 
 class Test(unittest.TestCase):
@@ -280,3 +283,17 @@ class Test(unittest.TestCase):
         uuid_str = 'db6ffb06-5c7e-432d-a899-7eda79866582'
         validated = prepare_filter_for_sending(validate_uuid_le(uuid_str))
         self.assertEqual(validated, UUID(hex=uuid_str).bytes_le)
+
+    def test_attribute_helpers_cached_in_schema(self):
+        schema = SchemaInfo.from_json(edir_9_1_4_schema)
+        self.assertEqual(format_attribute_values(schema, 'loginGraceLimit', [b'100'], None), 100)
+        self.assertEqual(find_attribute_validator(schema, 'loginGraceLimit', None)('1'), 1)
+        self.assertEqual(len(schema.attribute_helpers_cache), 2)
+        self.assertEqual(format_attribute_values(schema, 'loginGraceLimit', [b'101'], None), 101)
+        self.assertEqual(len(schema.attribute_helpers_cache), 2)
+
+    def test_attribute_helpers_cache_honors_custom_formatter(self):
+        schema = SchemaInfo.from_json(edir_9_1_4_schema)
+        self.assertEqual(format_attribute_values(schema, 'loginGraceLimit', [b'100'], None), 100)
+        self.assertEqual(format_attribute_values(schema, 'loginGraceLimit', [b'100'], {'loginGraceLimit': lambda value: 'custom'}), 'custom')
+        self.assertEqual(format_attribute_values(schema, 'loginGraceLimit', [b'100'], None), 100)